@@ -1,6 +1,7 @@
 import flet as ft
 from flet import icons
 import logging
+import os
 from views.shared import show_login
 from database import DatabaseManager
 
@@ -61,6 +62,12 @@ def main(page: ft.Page):
     page.go(page.route)
 
 if __name__ == "__main__":
+    # Caché de resultados para las lecturas repetidas de los dashboards;
+    # opcional: se activa con DB_QUERY_CACHE_SIZE > 0
+    cache_size = int(os.getenv("DB_QUERY_CACHE_SIZE", "0"))
+    if cache_size > 0:
+        DatabaseManager.enable_cache(cache_size)
+
     ft.app(
         target=main,
         view=ft.AppView.WEB_BROWSER,
@@ -0,0 +1,92 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union, Dict, List, Any, Callable
+from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseManager:
+    """
+    Fachada asíncrona sobre DatabaseManager para manejadores async de Flet
+
+    Las consultas se ejecutan en un ThreadPoolExecutor acotado (DB_ASYNC_WORKERS,
+    por defecto el tamaño máximo del pool) para que una consulta lenta no
+    bloquee el bucle de eventos de la sesión.
+    """
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                max_workers = int(os.getenv("DB_ASYNC_WORKERS", os.getenv("DB_POOL_MAX_SIZE", "20")))
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="sportpro-db"
+                )
+            return cls._executor
+
+    @staticmethod
+    def _call_in_session(session_key: Any, func: Callable, args: tuple, kwargs: dict) -> Any:
+        # La tarea asyncio hace de sesión para la ventana read-your-writes,
+        # ya que sus llamadas pueden caer en hilos distintos del executor
+        if DatabaseManager._session_key.get() is None:
+            DatabaseManager.bind_session(session_key)
+        return func(*args, **kwargs)
+
+    @classmethod
+    async def run(cls, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Ejecuta una función síncrona de acceso a datos en el executor"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(
+            context.run, cls._call_in_session,
+            ("task", id(asyncio.current_task())), func, args, kwargs
+        )
+        return await loop.run_in_executor(cls._get_executor(), call)
+
+    @classmethod
+    async def fetch_one(cls, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """Devuelve la primera fila de una consulta"""
+        return await cls.run(DatabaseManager.execute_query, query, params, fetch_one=True)
+
+    @classmethod
+    async def fetch_all(cls, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Devuelve todas las filas de una consulta"""
+        return await cls.run(DatabaseManager.execute_query, query, params) or []
+
+    @classmethod
+    async def execute(
+        cls,
+        query: str,
+        params: Optional[tuple] = None,
+        commit: bool = True
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+        """Ejecuta una sentencia de escritura (con commit por defecto)"""
+        return await cls.run(DatabaseManager.execute_query, query, params, commit=commit)
+
+    @classmethod
+    async def execute_many(
+        cls,
+        query: str,
+        params_seq: List[tuple],
+        chunk_size: Optional[int] = 1000
+    ) -> Dict[str, Any]:
+        """Versión asíncrona de DatabaseManager.execute_many"""
+        return await cls.run(DatabaseManager.execute_many, query, params_seq, chunk_size)
+
+    @classmethod
+    def shutdown(cls, wait: bool = True) -> None:
+        """Detiene el executor (las consultas en curso terminan si wait=True)"""
+        with cls._executor_lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=wait)
+                cls._executor = None
+                logger.info("Async database executor stopped")
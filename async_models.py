@@ -0,0 +1,266 @@
+from typing import Optional, List, Dict, Any, Tuple
+from async_database import AsyncDatabaseManager
+from models import (
+    User, AthleteProfile, CoachProfile, Workout, WorkoutAssignment, IdentityMap,
+    AthleteDashboardData, CoachDashboardData, PAGE_SIZE, _lazy_values
+)
+
+
+class _AsyncModel:
+    """
+    Envuelve una instancia de models.py y expone sus accesos a la base de
+    datos como corrutinas. Los atributos se leen y escriben en la instancia
+    síncrona, que sigue disponible en `sync`.
+
+    Las columnas diferidas (LazyColumn) que aún no se han cargado no se
+    leen desde el bucle de eventos, porque el descriptor consultaría la
+    base de datos: se obtienen con `await obj.load(attr)`.
+    """
+
+    def __init__(self, instance: Any):
+        object.__setattr__(self, "sync", instance)
+
+    def __getattr__(self, attr: str) -> Any:
+        lazy_columns = getattr(type(self.sync), "_lazy_columns", dict)()
+        if attr in lazy_columns and attr not in _lazy_values(self.sync):
+            raise AttributeError(
+                f"{type(self.sync).__name__}.{attr} is deferred; use 'await obj.load(\"{attr}\")'"
+            )
+        return getattr(self.sync, attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self.sync, attr, value)
+
+    async def load(self, attr: str) -> Any:
+        """Lee un atributo cargando en el executor las columnas diferidas de su listado"""
+        return await AsyncDatabaseManager.run(getattr, self.sync, attr)
+
+    @classmethod
+    def _wrap(cls, instance: Optional[Any]):
+        return cls(instance) if instance is not None else None
+
+
+async def load_deferred(instances: List[Any]) -> None:
+    """Carga en el executor las columnas diferidas de modelos síncronos del mismo tipo"""
+    if instances:
+        await AsyncDatabaseManager.run(type(instances[0]).load_deferred, instances)
+
+
+class AsyncUser(_AsyncModel):
+    @classmethod
+    async def authenticate(cls, email: str, password: str) -> Optional['AsyncUser']:
+        """Autentica un usuario sin bloquear el bucle de eventos"""
+        return cls._wrap(await AsyncDatabaseManager.run(User.authenticate, email, password))
+
+    @classmethod
+    async def login(
+        cls,
+        email: str,
+        password: str,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional[Tuple['AsyncUser', Any]]:
+        """Autentica y carga el perfil en una consulta (ver User.login); el perfil es el síncrono"""
+        result = await AsyncDatabaseManager.run(User.login, email, password, identity_map)
+        return (cls(result[0]), result[1]) if result else None
+
+    @classmethod
+    async def get_by_id(cls, user_id: int, identity_map: Optional[IdentityMap] = None) -> Optional['AsyncUser']:
+        """Obtiene un usuario por su ID"""
+        return cls._wrap(await AsyncDatabaseManager.run(User.get_by_id, user_id, identity_map))
+
+    async def update_last_login(self) -> None:
+        """Actualiza la fecha del último login"""
+        await AsyncDatabaseManager.run(self.sync.update_last_login)
+
+
+class AsyncAthleteProfile(_AsyncModel):
+    @classmethod
+    async def get_by_user_id(
+        cls,
+        user_id: int,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['AsyncAthleteProfile']:
+        """Obtiene el perfil de atleta por ID de usuario"""
+        return cls._wrap(await AsyncDatabaseManager.run(AthleteProfile.get_by_user_id, user_id, identity_map))
+
+    async def update_profile(
+        self,
+        height: Optional[float] = None,
+        weight: Optional[float] = None,
+        sport: Optional[str] = None,
+        resting_hr: Optional[int] = None,
+        max_hr: Optional[int] = None
+    ) -> bool:
+        """Actualiza los datos del perfil del atleta"""
+        return await AsyncDatabaseManager.run(
+            self.sync.update_profile,
+            height=height, weight=weight, sport=sport, resting_hr=resting_hr, max_hr=max_hr
+        )
+
+    async def get_workouts(self, status: Optional[str] = None) -> List[WorkoutAssignment]:
+        """Obtiene las asignaciones del atleta, con su entrenamiento en `workout`"""
+        return await AsyncDatabaseManager.run(self.sync.get_workouts, status)
+
+    async def get_workouts_page(
+        self,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Tuple[List[WorkoutAssignment], Optional[str]]:
+        """Obtiene una página de asignaciones (ver AthleteProfile.get_workouts_page)"""
+        return await AsyncDatabaseManager.run(self.sync.get_workouts_page, limit, cursor, status)
+
+
+class AsyncCoachProfile(_AsyncModel):
+    @classmethod
+    async def get_by_user_id(
+        cls,
+        user_id: int,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['AsyncCoachProfile']:
+        """Obtiene el perfil de entrenador por ID de usuario"""
+        return cls._wrap(await AsyncDatabaseManager.run(CoachProfile.get_by_user_id, user_id, identity_map))
+
+    async def get_assigned_athletes(self) -> List[AthleteProfile]:
+        """Obtiene los atletas asignados a este entrenador"""
+        return await AsyncDatabaseManager.run(self.sync.get_assigned_athletes)
+
+    async def get_assigned_athletes_page(
+        self,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[AthleteProfile], Optional[str]]:
+        """Obtiene una página de atletas asignados (ver CoachProfile.get_assigned_athletes_page)"""
+        return await AsyncDatabaseManager.run(self.sync.get_assigned_athletes_page, limit, cursor)
+
+    async def create_workout(
+        self,
+        title: str,
+        description: str,
+        estimated_duration: int,
+        difficulty: str
+    ) -> Optional['AsyncWorkout']:
+        """Crea un nuevo entrenamiento"""
+        return AsyncWorkout._wrap(await AsyncDatabaseManager.run(
+            self.sync.create_workout, title, description, estimated_duration, difficulty
+        ))
+
+    async def get_created_workouts(self) -> List[Workout]:
+        """Obtiene los entrenamientos creados por este entrenador"""
+        return await AsyncDatabaseManager.run(self.sync.get_created_workouts)
+
+    async def get_created_workouts_page(
+        self,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Workout], Optional[str]]:
+        """Obtiene una página de entrenamientos creados (ver CoachProfile.get_created_workouts_page)"""
+        return await AsyncDatabaseManager.run(self.sync.get_created_workouts_page, limit, cursor)
+
+
+class AsyncWorkout(_AsyncModel):
+    @classmethod
+    async def create(
+        cls,
+        coach_id: int,
+        title: str,
+        description: str,
+        estimated_duration: int,
+        difficulty: str
+    ) -> Optional['AsyncWorkout']:
+        """Crea un nuevo entrenamiento"""
+        return cls._wrap(await AsyncDatabaseManager.run(
+            Workout.create, coach_id, title, description, estimated_duration, difficulty
+        ))
+
+    @classmethod
+    async def get_by_id(cls, workout_id: int, identity_map: Optional[IdentityMap] = None) -> Optional['AsyncWorkout']:
+        """Obtiene un entrenamiento por su ID con sus ejercicios"""
+        return cls._wrap(await AsyncDatabaseManager.run(Workout.get_by_id, workout_id, identity_map))
+
+    async def assign_to_athlete(self, athlete_id: int, identity_map: Optional[IdentityMap] = None) -> bool:
+        """Asigna este entrenamiento a un atleta"""
+        return await AsyncDatabaseManager.run(self.sync.assign_to_athlete, athlete_id, identity_map)
+
+    async def assign_to_athletes(
+        self,
+        athlete_ids: List[int],
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional[Dict[str, List[int]]]:
+        """Asigna este entrenamiento a varios atletas en una sola transacción"""
+        return await AsyncDatabaseManager.run(
+            self.sync.assign_to_athletes, athlete_ids, identity_map=identity_map
+        )
+
+    async def update(
+        self,
+        title: Optional[str] = None,
+        estimated_duration: Optional[int] = None,
+        difficulty: Optional[str] = None,
+        identity_map: Optional[IdentityMap] = None
+    ) -> bool:
+        """Actualiza la cabecera del entrenamiento (ver Workout.update)"""
+        return await AsyncDatabaseManager.run(
+            self.sync.update, title, estimated_duration, difficulty, identity_map
+        )
+
+    async def add_exercise(self, exercise_id: int, **kwargs: Any) -> bool:
+        """Añade un ejercicio al entrenamiento (mismos argumentos que Workout.add_exercise)"""
+        return await AsyncDatabaseManager.run(self.sync.add_exercise, exercise_id, **kwargs)
+
+    async def set_exercises(
+        self,
+        exercises: List[Dict[str, Any]],
+        merge: bool = False,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional[Dict[str, int]]:
+        """Fija la lista ordenada de ejercicios (ver Workout.set_exercises)"""
+        return await AsyncDatabaseManager.run(self.sync.set_exercises, exercises, merge, identity_map)
+
+
+class AsyncWorkoutAssignment(_AsyncModel):
+    @classmethod
+    async def get_by_id(
+        cls,
+        assignment_id: int,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['AsyncWorkoutAssignment']:
+        """Obtiene una asignación por su ID"""
+        return cls._wrap(await AsyncDatabaseManager.run(WorkoutAssignment.get_by_id, assignment_id, identity_map))
+
+    async def update_status(self, new_status: str, identity_map: Optional[IdentityMap] = None) -> bool:
+        """Actualiza el estado de la asignación"""
+        return await AsyncDatabaseManager.run(self.sync.update_status, new_status, identity_map)
+
+    async def complete(
+        self,
+        feedback: Optional[str] = None,
+        rating: Optional[int] = None,
+        identity_map: Optional[IdentityMap] = None
+    ) -> bool:
+        """Marca la asignación como completada"""
+        return await AsyncDatabaseManager.run(self.sync.complete, feedback, rating, identity_map)
+
+
+class AsyncAthleteDashboardData(_AsyncModel):
+    @classmethod
+    async def load(
+        cls,
+        user_id: int,
+        limit: int = PAGE_SIZE,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['AsyncAthleteDashboardData']:
+        """Carga el dashboard del atleta en un viaje (ver AthleteDashboardData.load)"""
+        return cls._wrap(await AsyncDatabaseManager.run(AthleteDashboardData.load, user_id, limit, identity_map))
+
+
+class AsyncCoachDashboardData(_AsyncModel):
+    @classmethod
+    async def load(
+        cls,
+        user_id: int,
+        limit: int = PAGE_SIZE,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['AsyncCoachDashboardData']:
+        """Carga el dashboard del entrenador en un viaje (ver CoachDashboardData.load)"""
+        return cls._wrap(await AsyncDatabaseManager.run(CoachDashboardData.load, user_id, limit, identity_map))
@@ -0,0 +1,331 @@
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import itertools
+import logging
+from functools import lru_cache
+from typing import Optional, List, Any
+import mysql.connector
+from mysql.connector import errors
+
+logger = logging.getLogger(__name__)
+
+
+class MySQLBackend:
+    """Backend por defecto: servidor MySQL a través de mysql.connector"""
+    name = "mysql"
+    supports_replicas = True
+    supports_multi_statements = True
+
+    def connect(self, **config: Any) -> Any:
+        return mysql.connector.connect(**config)
+
+    def close(self) -> None:
+        pass
+
+
+# Esquema mínimo que asumen models.py y las vistas, en dialecto SQLite.
+# Los tipos DATE/TIMESTAMP activan los conversores de sqlite3 para que las
+# fechas lleguen como date/datetime igual que con MySQL.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    id_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL UNIQUE,
+    contrasena_hash TEXT NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('atleta', 'entrenador', 'administrador')),
+    fecha_registro TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    ultimo_login TIMESTAMP,
+    activo BOOLEAN NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS perfiles_entrenadores (
+    id_entrenador INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_usuario INTEGER NOT NULL UNIQUE REFERENCES usuarios (id_usuario),
+    nombre_completo TEXT NOT NULL,
+    fecha_nacimiento DATE,
+    especialidad TEXT,
+    experiencia TEXT
+);
+
+CREATE TABLE IF NOT EXISTS perfiles_atletas (
+    id_atleta INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_usuario INTEGER NOT NULL UNIQUE REFERENCES usuarios (id_usuario),
+    nombre_completo TEXT NOT NULL,
+    fecha_nacimiento DATE,
+    altura REAL,
+    peso REAL,
+    deporte TEXT,
+    frecuencia_cardiaca_maxima INTEGER,
+    frecuencia_cardiaca_minima INTEGER,
+    id_entrenador INTEGER REFERENCES perfiles_entrenadores (id_entrenador)
+);
+
+CREATE TABLE IF NOT EXISTS ejercicios (
+    id_ejercicio INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    descripcion TEXT,
+    tipo TEXT,
+    instrucciones TEXT,
+    video_url TEXT
+);
+
+CREATE TABLE IF NOT EXISTS entrenamientos (
+    id_entrenamiento INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_entrenador INTEGER NOT NULL REFERENCES perfiles_entrenadores (id_entrenador),
+    titulo TEXT NOT NULL,
+    descripcion TEXT,
+    duracion_estimada INTEGER,
+    nivel_dificultad TEXT CHECK (nivel_dificultad IN ('principiante', 'intermedio', 'avanzado')),
+    fecha_creacion TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    asignaciones INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS entrenamiento_ejercicios (
+    id_entrenamiento_ejercicio INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_entrenamiento INTEGER NOT NULL REFERENCES entrenamientos (id_entrenamiento),
+    id_ejercicio INTEGER NOT NULL REFERENCES ejercicios (id_ejercicio),
+    series INTEGER,
+    repeticiones INTEGER,
+    duracion INTEGER,
+    orden INTEGER NOT NULL DEFAULT 1,
+    descanso INTEGER,
+    notas TEXT
+);
+
+CREATE TABLE IF NOT EXISTS asignaciones_atletas (
+    id_asignacion INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_atleta INTEGER NOT NULL REFERENCES perfiles_atletas (id_atleta),
+    id_entrenamiento INTEGER NOT NULL REFERENCES entrenamientos (id_entrenamiento),
+    fecha_asignacion TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    fecha_completado TIMESTAMP,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    feedback TEXT,
+    calificacion INTEGER,
+    UNIQUE (id_atleta, id_entrenamiento)
+);
+"""
+
+_TRANSLATIONS = [
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+    (re.compile(r"\bLAST_INSERT_ID\(\)", re.IGNORECASE), "last_insert_rowid()"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE), r"excluded.\1"),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE), ""),
+]
+
+
+# Literales de cadena y nombres entre comillas, que no se traducen
+_QUOTED = re.compile(r"""('(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`)""")
+
+
+@lru_cache(maxsize=512)
+def translate_to_sqlite(query: str) -> str:
+    """Traduce el dialecto MySQL usado en el proyecto a SQLite (fuera de los literales)"""
+    parts = _QUOTED.split(query)
+    for i in range(0, len(parts), 2):
+        for pattern, replacement in _TRANSLATIONS:
+            parts[i] = pattern.sub(replacement, parts[i])
+    return "".join(parts)
+
+
+def _map_error(error: sqlite3.Error) -> errors.Error:
+    """Convierte errores de sqlite3 en los de mysql.connector que captura el código"""
+    if isinstance(error, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=str(error))
+    if isinstance(error, sqlite3.OperationalError):
+        return errors.OperationalError(msg=str(error))
+    if isinstance(error, sqlite3.ProgrammingError):
+        return errors.ProgrammingError(msg=str(error))
+    return errors.DatabaseError(msg=str(error))
+
+
+class SQLiteCursor:
+    """Cursor sqlite3 con la interfaz de los cursores de mysql.connector"""
+
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    def __enter__(self) -> 'SQLiteCursor':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def column_names(self) -> tuple:
+        return tuple(d[0] for d in self._cursor.description or ())
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    def _row(self, row: Optional[tuple]) -> Any:
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip(self.column_names, row))
+
+    def execute(self, query: str, params: Optional[tuple] = None, multi: bool = False) -> None:
+        try:
+            self._cursor.execute(translate_to_sqlite(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+
+    def executemany(self, query: str, params_seq: List[tuple]) -> None:
+        try:
+            self._cursor.executemany(translate_to_sqlite(query), [tuple(p) for p in params_seq])
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+
+    def fetchone(self) -> Any:
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self) -> List[Any]:
+        rows = self._cursor.fetchall()
+        if not self._dictionary:
+            return rows
+        columns = self.column_names
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Conexión sqlite3 con la parte de la interfaz de MySQLConnection que usa el proyecto"""
+
+    def __init__(self, cnx: sqlite3.Connection):
+        self._cnx = cnx
+        self.autocommit = False
+
+    def cursor(
+        self,
+        buffered: Optional[bool] = None,
+        dictionary: Optional[bool] = None,
+        prepared: Optional[bool] = None
+    ) -> SQLiteCursor:
+        # sqlite3 ya cachea las sentencias compiladas por conexión
+        return SQLiteCursor(self._cnx.cursor(), dictionary=bool(dictionary))
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._cnx.in_transaction
+
+    def start_transaction(self) -> None:
+        if self._cnx.in_transaction:
+            raise errors.ProgrammingError(msg="Transaction already in progress")
+        # Toma el bloqueo de escritura al empezar, como los SELECT ... FOR UPDATE
+        # de InnoDB: una transacción diferida que lee y luego escribe fallaría
+        # con SQLITE_BUSY en lugar de esperar
+        try:
+            self._cnx.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+
+    def commit(self) -> None:
+        try:
+            self._cnx.commit()
+        except sqlite3.Error as e:
+            raise _map_error(e) from e
+
+    def rollback(self) -> None:
+        self._cnx.rollback()
+
+    def reset_session(self) -> None:
+        self._cnx.rollback()
+
+    def is_connected(self) -> bool:
+        try:
+            self._cnx.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self) -> None:
+        self._cnx.close()
+
+
+class SQLiteBackend:
+    """
+    Backend embebido sobre sqlite3 para pruebas de rendimiento sin servidor MySQL
+
+    Crea el esquema que asumen los modelos y traduce los marcadores %s y las
+    funciones MySQL usadas por el proyecto. Sin path (ni DB_SQLITE_PATH) usa
+    un fichero temporal en modo WAL que se borra al cerrar el backend: los
+    lectores no bloquean al escritor y los escritores concurrentes esperan
+    hasta DB_SQLITE_TIMEOUT segundos.
+
+    Con path=':memory:' las conexiones comparten una base en memoria
+    (cache=shared) que vive mientras exista el backend. Ese modo bloquea
+    por tabla y devuelve SQLITE_LOCKED sin respetar el timeout, así que no
+    sirve para pruebas de carga con varios hilos.
+    """
+    name = "sqlite"
+    supports_replicas = False
+    supports_multi_statements = False
+    _memory_ids = itertools.count()
+
+    def __init__(self, path: Optional[str] = None):
+        path = path or os.getenv("DB_SQLITE_PATH")
+        self._uri = path == ":memory:"
+        self._temporary = path is None
+        if self._uri:
+            path = f"file:sportpro_{os.getpid()}_{next(self._memory_ids)}?mode=memory&cache=shared"
+        elif self._temporary:
+            fd, path = tempfile.mkstemp(prefix="sportpro_", suffix=".sqlite3")
+            os.close(fd)
+        self.path = path
+        self._lock = threading.Lock()
+        # Conexión ancla: mantiene viva la base en memoria y crea el esquema
+        self._anchor = self._open()
+        self._anchor.executescript(SQLITE_SCHEMA)
+        self._anchor.commit()
+
+    def _open(self) -> sqlite3.Connection:
+        cnx = sqlite3.connect(
+            self.path,
+            uri=self._uri,
+            timeout=float(os.getenv("DB_SQLITE_TIMEOUT", "10")),
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False
+        )
+        cnx.execute("PRAGMA foreign_keys = ON")
+        if not self._uri:
+            cnx.execute("PRAGMA journal_mode = WAL")
+        return cnx
+
+    def connect(self, **config: Any) -> SQLiteConnection:
+        return SQLiteConnection(self._open())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._anchor is not None:
+                self._anchor.close()
+                self._anchor = None
+                if self._temporary:
+                    for suffix in ("", "-wal", "-shm"):
+                        try:
+                            os.remove(self.path + suffix)
+                        except FileNotFoundError:
+                            pass
+
+
+def backend_from_env() -> Any:
+    """Crea el backend indicado por DB_BACKEND ('mysql' por defecto o 'sqlite')"""
+    name = os.getenv("DB_BACKEND", "mysql").lower()
+    if name == "sqlite":
+        return SQLiteBackend()
+    if name != "mysql":
+        raise ValueError(f"Unknown DB_BACKEND: {name}")
+    return MySQLBackend()
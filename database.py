@@ -1,50 +1,1182 @@
 import mysql.connector
-from mysql.connector import Error, pooling
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+import atexit
 import bcrypt
+import contextvars
+import hashlib
+import itertools
+import multiprocessing
 import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from collections import OrderedDict, deque
 from dotenv import load_dotenv
 import logging
-from typing import Optional, Union, Dict, List, Any
+from backends import MySQLBackend, backend_from_env
+from typing import Optional, Union, Dict, List, Any, Iterator, Tuple, FrozenSet
 
 # Cargar variables de entorno
 load_dotenv()
 logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f"{__name__}.slow")
+
+
+class PreparedStatementCache:
+    """
+    Cursores preparados de una conexión indexados por el texto SQL (LRU)
+
+    Cada entrada mantiene una sentencia preparada en el servidor; se reutiliza
+    entre préstamos de la misma conexión y se libera al expulsarla o al
+    reiniciar la sesión.
+    """
+
+    def __init__(self, cnx: Any, max_size: int = 64):
+        self._cnx = cnx
+        self.max_size = max_size
+        self._cursors = OrderedDict()  # (sql, dictionary) -> (cursor, sql canónico)
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def execute(self, query: str, params: Optional[tuple] = None, dictionary: bool = True) -> Any:
+        """Ejecuta la consulta con su cursor preparado y lo devuelve"""
+        key = (query, dictionary)
+        entry = self._cursors.get(key)
+        if entry is None:
+            cursor = self._cnx.cursor(prepared=True, dictionary=dictionary)
+            # El conector solo reutiliza la sentencia si recibe el mismo objeto str
+            entry = self._cursors[key] = (cursor, query)
+            while len(self._cursors) > self.max_size:
+                _, (evicted, _) = self._cursors.popitem(last=False)
+                self._close_cursor(evicted)
+        else:
+            self._cursors.move_to_end(key)
+
+        cursor, canonical_query = entry
+        try:
+            cursor.execute(canonical_query, params or ())
+        except Error:
+            self.evict(query, dictionary)
+            raise
+        return cursor
+
+    def evict(self, query: str, dictionary: bool = True) -> None:
+        """Libera la sentencia preparada de una consulta"""
+        entry = self._cursors.pop((query, dictionary), None)
+        if entry is not None:
+            self._close_cursor(entry[0])
+
+    def clear(self) -> None:
+        """Libera todas las sentencias preparadas de la conexión"""
+        while self._cursors:
+            _, (cursor, _) = self._cursors.popitem()
+            self._close_cursor(cursor)
+
+    @staticmethod
+    def _close_cursor(cursor: Any) -> None:
+        try:
+            cursor.close()
+        except Exception as e:
+            logger.debug(f"Error closing prepared statement: {e}")
+
+
+class RowSet(list):
+    """Filas de un resultado como tuplas, con los nombres de columna en `columns`"""
+    __slots__ = ("columns",)
+
+    def __init__(self, rows: List[tuple] = (), columns: Tuple[str, ...] = ()):
+        super().__init__(rows)
+        self.columns = tuple(columns)
+
+
+class PooledConnection:
+    """Conexión prestada por ElasticConnectionPool; close() la devuelve al pool"""
+
+    def __init__(self, pool: 'ElasticConnectionPool', cnx: Any):
+        self._pool = pool
+        self._cnx = cnx
+
+    def __enter__(self) -> 'PooledConnection':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._cnx, attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        # Los atributos públicos (p. ej. autocommit) se aplican a la conexión real
+        if attr.startswith('_'):
+            object.__setattr__(self, attr, value)
+        else:
+            setattr(self._cnx, attr, value)
+
+    def close(self) -> None:
+        """No cierra la conexión: la devuelve al pool"""
+        if self._cnx is not None:
+            cnx, self._cnx = self._cnx, None
+            self._pool.release(cnx)
+
+    def discard(self) -> None:
+        """Cierra la conexión real en lugar de devolverla al pool"""
+        if self._cnx is not None:
+            cnx, self._cnx = self._cnx, None
+            self._pool.discard(cnx)
+
+    @property
+    def statements(self) -> PreparedStatementCache:
+        """Caché de sentencias preparadas de la conexión real"""
+        return self._pool.statement_cache(self._cnx)
+
+
+class ElasticConnectionPool:
+    """
+    Pool de conexiones que crece bajo demanda hasta max_size y se reduce
+    hasta min_size cuando las conexiones quedan ociosas.
+
+    Si no hay conexiones libres y el pool está al máximo, get_connection
+    espera hasta `timeout` segundos antes de lanzar PoolError.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 2,
+        max_size: int = 20,
+        timeout: float = 10.0,
+        max_idle_time: float = 300.0,
+        validate_after: float = 5.0,
+        reset_session: bool = True,
+        statement_cache_size: int = 64,
+        backend: Optional[Any] = None,
+        **cnx_config: Any
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool bounds: min={min_size}, max={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle_time = max_idle_time
+        self.validate_after = validate_after
+        self.reset_session = reset_session
+        self.statement_cache_size = statement_cache_size
+        self.backend = backend or MySQLBackend()
+        self._cnx_config = cnx_config
+        self._statement_caches: Dict[int, PreparedStatementCache] = {}
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conexión, instante en que quedó libre)
+        self._size = 0
+        self._checked_out = 0
+        self._waiting = 0
+        self._timeouts = 0
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self) -> Any:
+        return self.backend.connect(**self._cnx_config)
+
+    def _close_quietly(self, cnx: Any) -> None:
+        self._statement_caches.pop(id(cnx), None)
+        try:
+            cnx.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+    def statement_cache(self, cnx: Any) -> PreparedStatementCache:
+        """Caché de sentencias preparadas asociada a una conexión del pool"""
+        cache = self._statement_caches.get(id(cnx))
+        if cache is None:
+            cache = self._statement_caches[id(cnx)] = PreparedStatementCache(
+                cnx, self.statement_cache_size
+            )
+        return cache
+
+    def _is_usable(self, cnx: Any, idle_since: float) -> bool:
+        """Comprueba la conexión si ha estado ociosa más de validate_after segundos"""
+        if time.monotonic() - idle_since < self.validate_after:
+            return True
+        try:
+            return cnx.is_connected()
+        except Exception:
+            return False
+
+    def _prune_idle(self) -> List[Any]:
+        """Retira las conexiones ociosas sobrantes (llamar con el lock tomado)"""
+        expired = []
+        now = time.monotonic()
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0][1] > self.max_idle_time
+        ):
+            cnx, _ = self._idle.popleft()
+            self._size -= 1
+            expired.append(cnx)
+        return expired
+
+    def get_connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Obtiene una conexión, esperando como máximo `timeout` segundos"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            cnx = None
+            idle_since = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolError("Connection pool is closed")
+                    if self._idle:
+                        # LIFO: la conexión usada más recientemente es la más fiable
+                        cnx, idle_since = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolError(
+                            f"Timed out after {timeout}s waiting for a connection "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                self._checked_out += 1
+
+            # Validación y apertura fuera del lock para no bloquear al resto
+            if cnx is not None:
+                if self._is_usable(cnx, idle_since):
+                    return PooledConnection(self, cnx)
+                logger.warning("Discarding stale pooled connection")
+                self.discard(cnx)
+                continue
+
+            try:
+                return PooledConnection(self, self._connect())
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._checked_out -= 1
+                    self._cond.notify()
+                raise
+
+    def release(self, cnx: Any) -> None:
+        """Devuelve una conexión al pool limpiando el estado de la sesión"""
+        healthy = not self._closed
+        if healthy:
+            try:
+                if self.reset_session:
+                    # El reinicio de sesión destruye las sentencias preparadas
+                    statements = self._statement_caches.pop(id(cnx), None)
+                    if statements is not None:
+                        statements.clear()
+                    cnx.reset_session()
+                elif cnx.in_transaction:
+                    cnx.rollback()
+            except Error as e:
+                logger.warning(f"Discarding connection that failed to reset: {e}")
+                healthy = False
+
+        with self._cond:
+            self._checked_out -= 1
+            if healthy:
+                self._idle.append((cnx, time.monotonic()))
+                to_close = []
+            else:
+                self._size -= 1
+                to_close = [cnx]
+            to_close.extend(self._prune_idle())
+            self._cond.notify()
+
+        for expired in to_close:
+            self._close_quietly(expired)
+
+    def discard(self, cnx: Any) -> None:
+        """Cierra una conexión prestada y libera su hueco en el pool"""
+        with self._cond:
+            self._checked_out -= 1
+            self._size -= 1
+            self._cond.notify()
+        self._close_quietly(cnx)
+
+    def close_all(self) -> None:
+        """Cierra las conexiones ociosas; las prestadas se cierran al devolverse"""
+        with self._cond:
+            self._closed = True
+            idle = [cnx for cnx, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for cnx in idle:
+            self._close_quietly(cnx)
+
+    def stats(self) -> Dict[str, int]:
+        """Devuelve contadores del estado actual del pool"""
+        with self._cond:
+            return {
+                "size": self._size,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checked_out": self._checked_out,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "timeouts": self._timeouts,
+                "prepared_statements": sum(len(c) for c in self._statement_caches.values()),
+            }
+
+
+class QueryCache:
+    """
+    Caché LRU de resultados de consultas con TTL por entrada
+
+    Cada entrada queda etiquetada con las tablas que lee la consulta; una
+    escritura sobre cualquiera de esas tablas invalida las entradas afectadas.
+    """
+    _MISSING = object()
+    _TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE)\s+`?(\w+)`?', re.IGNORECASE)
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # clave -> (expira, tablas, valor)
+        self._keys_by_table: Dict[str, set] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Colapsa espacios para que el formato del SQL no afecte a la clave"""
+        return " ".join(query.split())
+
+    @classmethod
+    def tables(cls, query: str) -> FrozenSet[str]:
+        """Tablas referenciadas por una sentencia"""
+        return frozenset(name.lower() for name in cls._TABLE_PATTERN.findall(query))
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        # Copias superficiales para que el llamador no altere lo cacheado
+        if isinstance(value, RowSet):
+            return RowSet(value, value.columns)  # las tuplas son inmutables
+        if isinstance(value, list):
+            return [dict(row) for row in value]
+        if isinstance(value, dict):
+            return dict(value)
+        return value
+
+    def generation(self, tables: FrozenSet[str]) -> Tuple[int, ...]:
+        """Versión actual de las tablas; se compara al guardar para evitar datos viejos"""
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in sorted(tables))
+
+    def get(self, key: tuple) -> Any:
+        """Devuelve el valor cacheado o QueryCache._MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return self._MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._copy(entry[2])
+
+    def put(
+        self,
+        key: tuple,
+        value: Any,
+        ttl: float,
+        tables: FrozenSet[str],
+        generation: Tuple[int, ...]
+    ) -> None:
+        """Guarda un resultado salvo que sus tablas se hayan escrito mientras se leía"""
+        with self._lock:
+            if generation != tuple(self._generations.get(table, 0) for table in sorted(tables)):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, tables, self._copy(value))
+            for table in tables:
+                self._keys_by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: tuple) -> None:
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+    def invalidate_tables(self, tables: FrozenSet[str]) -> None:
+        """Elimina las entradas que leen alguna de las tablas indicadas"""
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._keys_by_table.get(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+class QueryStats:
+    """
+    Métricas de latencia por huella de consulta
+
+    Cada huella acumula llamadas, tiempo total y máximo, filas, espera por
+    conexión y un histograma de latencias. Las consultas que superan
+    slow_query_ms se escriben en el log 'database.slow' sin sus parámetros.
+    """
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+    _LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+(?:\.\d+)?\b")
+
+    def __init__(self, slow_query_ms: float = 200.0):
+        self.slow_query_ms = slow_query_ms
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fingerprint(cls, query: str) -> Tuple[str, str]:
+        """Devuelve (huella estable, texto normalizado) de una consulta"""
+        normalized = cls._LITERAL_PATTERN.sub("?", QueryCache.normalize(query))
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12], normalized
+
+    @staticmethod
+    def redact(params: Optional[tuple]) -> str:
+        """Sustituye los valores de los parámetros por su tipo"""
+        if not params:
+            return "()"
+        return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+
+    def record(
+        self,
+        query: str,
+        elapsed: float,
+        rows: int = 0,
+        wait: float = 0.0,
+        params: Optional[tuple] = None
+    ) -> None:
+        """Registra una ejecución (tiempos en segundos)"""
+        fingerprint, normalized = self.fingerprint(query)
+        elapsed_ms = elapsed * 1000
+        wait_ms = wait * 1000
+        bucket = next(
+            (i for i, limit in enumerate(self.BUCKETS_MS) if elapsed_ms <= limit),
+            len(self.BUCKETS_MS)
+        )
+
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                entry = self._entries[fingerprint] = {
+                    "fingerprint": fingerprint,
+                    "query": normalized[:300],
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "wait_ms": 0.0,
+                    "histogram": [0] * (len(self.BUCKETS_MS) + 1),
+                }
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["rows"] += max(rows, 0)
+            entry["wait_ms"] += wait_ms
+            entry["histogram"][bucket] += 1
+
+        if elapsed_ms >= self.slow_query_ms:
+            slow_query_logger.warning(
+                f"Slow query [{fingerprint}] {elapsed_ms:.1f} ms "
+                f"(rows={rows}, wait={wait_ms:.1f} ms): {normalized[:300]} "
+                f"params={self.redact(params)}"
+            )
+
+    def snapshot(self, top_n: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """Devuelve las consultas con más tiempo total acumulado"""
+        labels = [f"<={limit}ms" for limit in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e["total_ms"], reverse=True)
+            result = []
+            for entry in entries[:top_n]:
+                result.append({
+                    **entry,
+                    "avg_ms": entry["total_ms"] / entry["calls"],
+                    "histogram": dict(zip(labels, entry["histogram"])),
+                })
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _bcrypt_hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _bcrypt_check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """
+    Ejecuta bcrypt en un pool de procesos dedicado
+
+    bcrypt retiene el GIL durante todo el cálculo, así que en el hilo de un
+    manejador de Flet detiene al resto de sesiones del proceso; aquí el hilo
+    solo espera el resultado. Como mucho max_pending operaciones se envían
+    al pool a la vez y el resto espera turno: esa cola y las latencias se
+    exponen en stats() para dimensionar workers. Con workers=0 se calcula
+    en el propio hilo.
+    """
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self, rounds: int = 12, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.rounds = rounds
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or max(self.workers, 1) * 2
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._max_queued = 0
+        self._in_flight = 0
+        self._calls = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._wait_ms = 0.0
+        self._histogram = [0] * (len(self.BUCKETS_MS) + 1)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                # fork copiaría los hilos y locks del proceso de Flet (pools,
+                # cola write-behind); los workers arrancan limpios
+                start_method = (
+                    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                )
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(start_method)
+                )
+                logger.info(f"Password hashing pool started ({self.workers} workers, rounds={self.rounds})")
+            return self._executor
+
+    def _run(self, func, *args: Any) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        self._slots.acquire()
+        wait = time.perf_counter() - started
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return func(*args)
+            return executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            bucket = next(
+                (i for i, limit in enumerate(self.BUCKETS_MS) if elapsed_ms <= limit),
+                len(self.BUCKETS_MS)
+            )
+            with self._lock:
+                self._in_flight -= 1
+                self._calls += 1
+                self._total_ms += elapsed_ms
+                self._max_ms = max(self._max_ms, elapsed_ms)
+                self._wait_ms += wait * 1000
+                self._histogram[bucket] += 1
+
+    def hash(self, password: str) -> str:
+        """Genera un hash bcrypt con el coste configurado"""
+        return self._run(_bcrypt_hash, password.encode('utf-8'), self.rounds).decode('utf-8')
+
+    def verify(self, hashed_password: str, password: str) -> bool:
+        """Comprueba una contraseña contra su hash"""
+        return self._run(_bcrypt_check, password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True si el hash se generó con un coste distinto del configurado ($2b$<coste>$...)"""
+        try:
+            return int(hashed_password.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Devuelve la cola, las operaciones en curso y las latencias (ms, incluida la espera)"""
+        labels = [f"<={limit}ms" for limit in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "queued": self._queued,
+                "max_queued": self._max_queued,
+                "in_flight": self._in_flight,
+                "calls": self._calls,
+                "avg_ms": self._total_ms / self._calls if self._calls else 0.0,
+                "max_ms": self._max_ms,
+                "avg_wait_ms": self._wait_ms / self._calls if self._calls else 0.0,
+                "histogram": dict(zip(labels, self._histogram)),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Detiene los procesos del pool (se vuelven a crear si hacen falta)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+            logger.info("Password hashing pool stopped")
+
+
+class Transaction:
+    """
+    Unidad de trabajo sobre una única conexión (ver DatabaseManager.transaction)
+
+    Las tablas escritas se acumulan y la caché de resultados se invalida al
+    hacer commit, cuando los cambios ya son visibles para otras sesiones.
+    """
+
+    def __init__(self, manager: type, conn: Any):
+        self._manager = manager
+        self.conn = conn
+        self.written_tables: set = set()
+
+    def _run(self, query: str, params: Optional[tuple], handler):
+        started = time.perf_counter()
+        rows = 0
+        cursor = self.conn.cursor(dictionary=True)
+        try:
+            cursor.execute(query, params or ())
+            if not self._manager._is_read_query(query):
+                self.written_tables |= QueryCache.tables(query)
+            result, rows = handler(cursor)
+            return result
+        except Error as e:
+            logger.error(f"Database error in transaction: {e}")
+            raise
+        finally:
+            cursor.close()
+            self._manager._query_stats.record(query, time.perf_counter() - started, rows, params=params)
+
+    def execute(self, query: str, params: Optional[tuple] = None) -> int:
+        """Ejecuta una sentencia y devuelve el número de filas afectadas"""
+        return self._run(query, params, lambda cursor: (cursor.rowcount, cursor.rowcount))
+
+    def insert(self, query: str, params: Optional[tuple] = None) -> int:
+        """Ejecuta un INSERT y devuelve el id autoincremental generado"""
+        return self._run(query, params, lambda cursor: (cursor.lastrowid, cursor.rowcount))
+
+    def fetch(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        one: bool = False
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+        """Ejecuta una consulta y devuelve una fila (one=True) o todas"""
+        def handler(cursor):
+            if one:
+                row = cursor.fetchone()
+                # Descarta filas sobrantes para dejar la conexión utilizable
+                cursor.fetchall()
+                return row, 1 if row else 0
+            rows = cursor.fetchall()
+            return rows, len(rows)
+        return self._run(query, params, handler)
+
+    def execute_many(
+        self,
+        query: str,
+        params_seq: List[tuple],
+        chunk_size: Optional[int] = 1000
+    ) -> Dict[str, Any]:
+        """executemany dentro de la transacción (ver DatabaseManager.execute_many)"""
+        self.written_tables |= QueryCache.tables(query)
+        return self._manager.execute_many(query, params_seq, chunk_size, conn=self.conn)
+
+
+class WriteBehindQueue:
+    """
+    Cola de actualizaciones no críticas que se escriben en segundo plano
+
+    Cada actualización se identifica por (tabla, columna clave, id de fila).
+    Las repetidas sobre la misma fila se combinan: en `values` gana el último
+    valor y en `increments` se suman. Un hilo vacía la cola cada `interval`
+    segundos, o antes si se alcanzan max_pending filas. Cada forma de
+    sentencia (tabla y columnas) se escribe con un único UPDATE por bloque
+    de rows_per_statement filas:
+
+        UPDATE t SET c = CASE k WHEN %s THEN %s ... END WHERE k IN (...)
+
+    executemany solo agrupa los INSERT ... VALUES; con UPDATE enviaría una
+    sentencia por fila. Un error al escribir se registra y el lote se
+    descarta: solo debe usarse para datos que se pueden perder.
+    """
+    _IDENTIFIER = re.compile(r"^\w+$")
+    rows_per_statement = 500
+
+    def __init__(self, manager: type, interval: float = 2.0, max_pending: int = 500):
+        self._manager = manager
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[str, str, Any], Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._queued = 0
+        self._written = 0
+        self._batches = 0
+        self._errors = 0
+        self._closed = False
+
+    def put(
+        self,
+        table: str,
+        key_column: str,
+        key: Any,
+        values: Optional[Dict[str, Any]] = None,
+        increments: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Encola la actualización de una fila sin esperar a que se escriba"""
+        values, increments = values or {}, increments or {}
+        for identifier in (table, key_column, *values, *increments):
+            if not self._IDENTIFIER.match(identifier):
+                raise ValueError(f"Invalid identifier for write-behind update: {identifier!r}")
+
+        with self._lock:
+            current = self._pending.get((table, key_column, key))
+            if current is None:
+                self._pending[(table, key_column, key)] = (dict(values), dict(increments))
+            else:
+                current[0].update(values)
+                for column, amount in increments.items():
+                    current[1][column] = current[1].get(column, 0) + amount
+            self._queued += 1
+            full = len(self._pending) >= self.max_pending
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sportpro-write-behind", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        if full:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Escribe ya todo lo pendiente y devuelve el número de filas enviadas"""
+        with self._flush_lock:
+            if self._closed:
+                return 0
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            # Filas agrupadas por tabla y conjunto de columnas
+            batches: Dict[tuple, List[tuple]] = {}
+            for (table, key_column, key), (values, increments) in pending.items():
+                shape = (table, key_column, tuple(sorted(values)), tuple(sorted(increments)))
+                batches.setdefault(shape, []).append(
+                    (key, *(values[column] for column in shape[2]), *(increments[column] for column in shape[3]))
+                )
+
+            written = 0
+            for shape, rows in batches.items():
+                for start in range(0, len(rows), self.rows_per_statement):
+                    chunk = rows[start:start + self.rows_per_statement]
+                    query, params = self._batch_update(*shape, chunk)
+                    try:
+                        self._manager.execute_query(query, params, commit=True)
+                        written += len(chunk)
+                        with self._lock:
+                            self._batches += 1
+                    except Exception as e:
+                        logger.warning(f"Error writing {len(chunk)} deferred updates to {shape[0]}: {e}")
+                        with self._lock:
+                            self._errors += 1
+            with self._lock:
+                self._written += written
+            return written
+
+    @staticmethod
+    def _batch_update(
+        table: str,
+        key_column: str,
+        set_columns: Tuple[str, ...],
+        increment_columns: Tuple[str, ...],
+        rows: List[tuple]
+    ) -> Tuple[str, tuple]:
+        """UPDATE de varias filas en una sentencia; cada fila es (clave, valores..., incrementos...)"""
+        cases = f"CASE {key_column} {' '.join(['WHEN %s THEN %s'] * len(rows))} END"
+        assignments = [f"{column} = {cases}" for column in set_columns] + [
+            f"{column} = {column} + {cases}" for column in increment_columns
+        ]
+        params = [
+            param
+            for position in range(1, 1 + len(set_columns) + len(increment_columns))
+            for row in rows
+            for param in (row[0], row[position])
+        ]
+        query = (
+            f"UPDATE {table} SET {', '.join(assignments)} "
+            f"WHERE {key_column} IN ({', '.join(['%s'] * len(rows))})"
+        )
+        return query, (*params, *(row[0] for row in rows))
+
+    def close(self, flush: bool = True) -> None:
+        """
+        Escribe lo pendiente (si flush) y desactiva la cola: el hilo termina y
+        el flush registrado en atexit deja de ejecutarse, así que no reabre
+        el pool al salir del intérprete.
+        """
+        if flush:
+            self.flush()
+        with self._flush_lock:
+            self._closed = True
+        with self._lock:
+            dropped, self._pending = len(self._pending), {}
+        if dropped:
+            logger.warning(f"Write-behind queue closed with {dropped} unwritten updates")
+        atexit.unregister(self.flush)
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Devuelve filas pendientes, actualizaciones recibidas, filas escritas, lotes y errores"""
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "queued": self._queued,
+                "written": self._written,
+                "batches": self._batches,
+                "errors": self._errors,
+            }
+
 
 class DatabaseManager:
     _connection_pool = None
+    _pool_lock = threading.Lock()
+
+    # Backend de almacenamiento (MySQL por defecto; ver backends.py)
+    _backend = None
+
+    # Réplicas de lectura: pools propios, rotación round-robin y vuelta al
+    # primario mientras una réplica está marcada como caída
+    _replica_pools: List[ElasticConnectionPool] = []
+    _replica_down_until: Dict[int, float] = {}
+    _replica_counter = itertools.count()
+    _replica_retry_after = float(os.getenv("DB_REPLICA_RETRY_AFTER", "30"))
+
+    # Ventana read-your-writes: tras escribir, la misma sesión lee del primario
+    _read_your_writes_window = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "2"))
+    _last_write: Dict[Any, float] = {}
+    _session_key = contextvars.ContextVar("db_session_key", default=None)
+
+    # Caché de resultados opcional (ver enable_cache)
+    _query_cache: Optional[QueryCache] = None
+
+    # Sentencias preparadas reutilizadas entre préstamos (DB_PREPARED_STATEMENTS=1);
+    # requiere que el pool no reinicie la sesión al devolver cada conexión
+    _prepared_statements = os.getenv("DB_PREPARED_STATEMENTS", "0") == "1"
+
+    # Latencias por consulta y log de consultas lentas
+    _query_stats = QueryStats(float(os.getenv("DB_SLOW_QUERY_MS", "200")))
+
+    # Cola de actualizaciones no críticas (queue_update), creada al primer uso
+    _write_behind: Optional[WriteBehindQueue] = None
+    _write_behind_lock = threading.Lock()
+
+    # bcrypt fuera del hilo de la sesión (BCRYPT_WORKERS=0 lo calcula en el hilo)
+    _password_hasher = PasswordHasher(
+        rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+        workers=int(os.getenv("BCRYPT_WORKERS")) if os.getenv("BCRYPT_WORKERS") else None,
+        max_pending=int(os.getenv("BCRYPT_MAX_PENDING", "0")) or None
+    )
+
+    @staticmethod
+    def _connection_config() -> Dict[str, Any]:
+        """Parámetros de conexión al primario leídos del entorno"""
+        return {
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": int(os.getenv("DB_PORT", "3306")),
+            "user": os.getenv("DB_USER", "root"),
+            "password": os.getenv("DB_PASSWORD", ""),
+            "database": os.getenv("DB_NAME", "aplicacion_deportiva"),
+        }
+
+    @staticmethod
+    def _replicas_from_env() -> List[Dict[str, Any]]:
+        """Lee DB_REPLICAS con el formato 'host[:puerto],host[:puerto]'"""
+        replicas = []
+        for endpoint in filter(None, (e.strip() for e in os.getenv("DB_REPLICAS", "").split(","))):
+            host, _, port = endpoint.partition(":")
+            replica = {"host": host}
+            if port:
+                replica["port"] = int(port)
+            replicas.append(replica)
+        return replicas
     
     @classmethod
-    def initialize_pool(cls):
-        """Inicializa el pool de conexiones a la base de datos"""
-        if cls._connection_pool is None:
+    def initialize_pool(
+        cls,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        replicas: Optional[List[Dict[str, Any]]] = None,
+        backend: Optional[Any] = None
+    ):
+        """
+        Inicializa el pool de conexiones a la base de datos
+
+        Los límites se leen de DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE y
+        DB_POOL_TIMEOUT salvo que se indiquen explícitamente. Cada réplica
+        (dict con host, port, user... que sobrescribe la configuración del
+        primario, o DB_REPLICAS) recibe su propio pool para consultas de lectura.
+        El backend (MySQLBackend, SQLiteBackend) se toma de DB_BACKEND si no se indica.
+        """
+        with cls._pool_lock:
+            if cls._connection_pool is not None:
+                return
+            if backend is not None:
+                cls._backend = backend
+            elif cls._backend is None:
+                cls._backend = backend_from_env()
+            backend = cls._backend
+            pool_options = {
+                "max_size": max_size if max_size is not None else int(os.getenv("DB_POOL_MAX_SIZE", "20")),
+                "timeout": timeout if timeout is not None else float(os.getenv("DB_POOL_TIMEOUT", "10")),
+                "max_idle_time": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+                "validate_after": float(os.getenv("DB_POOL_VALIDATE_AFTER", "5")),
+                "reset_session": not cls._prepared_statements,
+                "statement_cache_size": int(os.getenv("DB_PREPARED_CACHE_SIZE", "64")),
+                "backend": backend,
+            }
+            config = cls._connection_config() if isinstance(backend, MySQLBackend) else {}
+            if not backend.supports_replicas:
+                replicas = []
             try:
-                cls._connection_pool = pooling.MySQLConnectionPool(
-                    pool_name="sportpro_pool",
-                    pool_size=5,
-                    host=os.getenv("DB_HOST", "localhost"),
-                    user=os.getenv("DB_USER", "root"),
-                    password=os.getenv("DB_PASSWORD", ""),
-                    database=os.getenv("DB_NAME", "aplicacion_deportiva"),
-                    pool_reset_session=True
+                cls._connection_pool = ElasticConnectionPool(
+                    min_size=min_size if min_size is not None else int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                    **pool_options,
+                    **config
+                )
+                # Las réplicas abren conexiones bajo demanda para no impedir el
+                # arranque si alguna no está disponible
+                cls._replica_pools = [
+                    ElasticConnectionPool(min_size=0, **pool_options, **{**config, **replica})
+                    for replica in (replicas if replicas is not None else cls._replicas_from_env())
+                ]
+                cls._replica_down_until = {}
+                logger.info(
+                    f"Database connection pool created successfully "
+                    f"({len(cls._replica_pools)} read replicas)"
                 )
-                logger.info("Database connection pool created successfully")
             except Error as e:
                 logger.error(f"Error creating database connection pool: {e}")
                 raise
-    
+
+    @classmethod
+    def bind_session(cls, session_key: Any) -> None:
+        """Asocia el contexto actual a una sesión para la ventana read-your-writes"""
+        cls._session_key.set(session_key)
+
+    @classmethod
+    @contextmanager
+    def session_scope(cls, session_key: Any):
+        """Igual que bind_session pero restaurando la sesión anterior al salir"""
+        token = cls._session_key.set(session_key)
+        try:
+            yield
+        finally:
+            cls._session_key.reset(token)
+
+    @classmethod
+    def _current_session(cls) -> Any:
+        # Las vistas usan session_scope(page.session_id) (with_page_session); fuera de ellas
+        # (scripts, migraciones) el hilo hace de sesión
+        session_key = cls._session_key.get()
+        return session_key if session_key is not None else threading.get_ident()
+
+    @classmethod
+    def _mark_write(cls) -> None:
+        """Registra una escritura de la sesión actual"""
+        if not cls._replica_pools:
+            return
+        now = time.monotonic()
+        cls._last_write[cls._current_session()] = now
+        if len(cls._last_write) > 1024:
+            for key, written_at in list(cls._last_write.items()):
+                if now - written_at > cls._read_your_writes_window:
+                    cls._last_write.pop(key, None)
+
+    @classmethod
+    def _after_write(cls, query: str, conn: Optional[Any] = None) -> None:
+        """
+        Registra la escritura e invalida las entradas de caché de sus tablas
+
+        Con la conexión del llamador (start_transaction) aún no hay commit:
+        las tablas se anotan en la conexión y se invalidan en
+        commit_transaction, porque antes otra sesión podría volver a llenar
+        la caché con las filas anteriores.
+        """
+        tables = QueryCache.tables(query)
+        if conn is not None:
+            conn._written_tables = getattr(conn, "_written_tables", frozenset()) | tables
+        else:
+            cls._invalidate_tables(tables)
+
+    @classmethod
+    def _invalidate_tables(cls, tables) -> None:
+        cls._mark_write()
+        if cls._query_cache is not None and tables:
+            cls._query_cache.invalidate_tables(frozenset(tables))
+
+    @classmethod
+    def enable_cache(cls, max_entries: int = 1024) -> None:
+        """Activa la caché de resultados para las consultas que indiquen cache_ttl"""
+        if cls._query_cache is None:
+            cls._query_cache = QueryCache(max_entries)
+            logger.info(f"Query result cache enabled ({max_entries} entries)")
+
+    @classmethod
+    def disable_cache(cls) -> None:
+        """Desactiva y vacía la caché de resultados"""
+        cls._query_cache = None
+
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, int]:
+        """Devuelve aciertos, fallos, invalidaciones y tamaño de la caché"""
+        return cls._query_cache.stats() if cls._query_cache is not None else {}
+
+    @classmethod
+    def get_query_stats(cls, top_n: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """Devuelve las top_n consultas por tiempo total (None = todas)"""
+        return cls._query_stats.snapshot(top_n)
+
+    @classmethod
+    def reset_query_stats(cls) -> None:
+        """Reinicia las métricas de consultas"""
+        cls._query_stats.reset()
+
+    @classmethod
+    def set_slow_query_threshold(cls, threshold_ms: float) -> None:
+        """Cambia el umbral (ms) a partir del cual una consulta se considera lenta"""
+        cls._query_stats.slow_query_ms = threshold_ms
+
+    @classmethod
+    def _recently_wrote(cls) -> bool:
+        written_at = cls._last_write.get(cls._current_session())
+        return written_at is not None and time.monotonic() - written_at < cls._read_your_writes_window
+
     @staticmethod
-    def fetch_one(query: str, params: tuple) -> dict:
-        with DatabaseManager.get_connection() as conn:
-            with conn.cursor(dictionary=True) as cursor:
-                cursor.execute(query, params)
-                return cursor.fetchone()
+    def _is_read_query(query: str) -> bool:
+        """True si la consulta es de solo lectura y puede ir a una réplica"""
+        normalized = query.lstrip().upper()
+        if not normalized.startswith(('SELECT', 'SHOW', 'DESCRIBE', 'EXPLAIN')):
+            return False
+        # Bloqueos y funciones ligadas a la conexión deben ir al primario
+        return not any(
+            marker in normalized
+            for marker in ('FOR UPDATE', 'LOCK IN SHARE MODE', 'FOR SHARE', 'LAST_INSERT_ID')
+        )
+
+    @classmethod
+    def get_read_connection(cls):
+        """
+        Obtiene una conexión para lectura
+
+        Rota entre las réplicas sanas sin esperar por ellas; si no hay réplicas,
+        todas están caídas u ocupadas, o la sesión acaba de escribir, usa el primario.
+        """
+        if cls._connection_pool is None:
+            cls.initialize_pool()
+
+        replica_count = len(cls._replica_pools)
+        if replica_count and not cls._recently_wrote():
+            start = next(cls._replica_counter)
+            now = time.monotonic()
+            for offset in range(replica_count):
+                index = (start + offset) % replica_count
+                if cls._replica_down_until.get(index, 0) > now:
+                    continue
+                try:
+                    return cls._replica_pools[index].get_connection(timeout=0)
+                except PoolError:
+                    continue
+                except Error as e:
+                    logger.warning(f"Read replica {index} unavailable, routing to primary: {e}")
+                    cls._replica_down_until[index] = now + cls._replica_retry_after
+
+        return cls.get_connection()
+    
+    @classmethod
+    def fetch_one(cls, query: str, params: tuple, cache_ttl: Optional[float] = None) -> dict:
+        """Devuelve la primera fila de una consulta (enrutada como execute_query)"""
+        return cls.execute_query(query, params, fetch_one=True, cache_ttl=cache_ttl)
         
     @classmethod
-    def get_connection(cls):
-        """Obtiene una conexión del pool"""
+    def get_connection(cls, timeout: Optional[float] = None):
+        """Obtiene una conexión del pool, esperando si está agotado"""
         if cls._connection_pool is None:
             cls.initialize_pool()
-        return cls._connection_pool.get_connection()
+        return cls._connection_pool.get_connection(timeout)
+
+    @classmethod
+    def get_pool_stats(cls) -> Dict[str, Any]:
+        """Devuelve los contadores del pool (prestadas, ociosas, en espera, timeouts)"""
+        if cls._connection_pool is None:
+            return {}
+        stats = cls._connection_pool.stats()
+        if cls._replica_pools:
+            now = time.monotonic()
+            stats["replicas"] = [
+                {**pool.stats(), "healthy": cls._replica_down_until.get(index, 0) <= now}
+                for index, pool in enumerate(cls._replica_pools)
+            ]
+        return stats
     
     @classmethod
     def execute_query(
@@ -53,7 +1185,10 @@ class DatabaseManager:
         params: Optional[tuple] = None,
         fetch_one: bool = False,
         commit: bool = False,
-        conn: Optional[Any] = None  # Nueva opción para conexión existente
+        conn: Optional[Any] = None,  # Nueva opción para conexión existente
+        cache_ttl: Optional[float] = None,
+        prepared: bool = False,
+        dictionary: bool = True
     ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Ejecuta una consulta SQL y devuelve los resultados
@@ -64,32 +1199,82 @@ class DatabaseManager:
             fetch_one: Si True, devuelve solo un registro
             commit: Si True, hace commit de la transacción
             conn: Conexión existente (opcional). Si no se proporciona, se crea una nueva.
+            cache_ttl: Segundos que el resultado puede servirse desde la caché
+                (solo lecturas fuera de transacción y con la caché activada)
+            prepared: Si True y DB_PREPARED_STATEMENTS está activo, usa una
+                sentencia preparada cacheada en la conexión del pool
+            dictionary: Si False, las filas son tuplas y los SELECT devuelven
+                un RowSet con los nombres de columna (ver fetch_rows)
             
         Returns:
             Resultados de la consulta (dict, list o None)
         """
+        is_read = not commit and cls._is_read_query(query)
+        cache = cls._query_cache
+        if cache is not None and cache_ttl and is_read and conn is None:
+            cache_key = (QueryCache.normalize(query), tuple(params or ()), fetch_one, dictionary)
+            cached = cache.get(cache_key)
+            if cached is not QueryCache._MISSING:
+                return cached
+            tables = QueryCache.tables(query)
+            generation = cache.generation(tables)
+            # La caché se comparte entre sesiones: se llena siempre desde el
+            # primario para no guardar una fila atrasada de una réplica que
+            # otra sesión acaba de sobrescribir
+            conn = cls.get_connection()
+            try:
+                result = cls.execute_query(
+                    query, params, fetch_one=fetch_one, conn=conn, prepared=prepared, dictionary=dictionary
+                )
+            finally:
+                conn.close()
+            cache.put(cache_key, result, cache_ttl, tables, generation)
+            return result
+
         cursor = None
+        owns_cursor = True  # Los cursores preparados pertenecen a la caché de la conexión
         should_close_conn = False  # Determina si debemos cerrar la conexión al final
+        started = time.perf_counter()
+        wait = 0.0
+        rows = 0
     
         try:
             # Si no se proporciona una conexión, obtenemos una nueva
             if conn is None:
-                conn = cls.get_connection()
+                conn = cls.get_read_connection() if is_read else cls.get_connection()
                 should_close_conn = True
+                wait = time.perf_counter() - started
         
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute(query, params or ())
+            if prepared and cls._prepared_statements and isinstance(conn, PooledConnection):
+                owns_cursor = False
+                cursor = conn.statements.execute(query, params, dictionary)
+            else:
+                cursor = conn.cursor(dictionary=dictionary)
+                cursor.execute(query, params or ())
         
             # Solo hacemos commit si se solicita EXPLÍCITAMENTE y es una conexión nueva
             if commit and should_close_conn:
                 conn.commit()
+
+            if not is_read:
+                cls._after_write(query, None if should_close_conn else conn)
         
             # Si es una consulta de selección, retornamos resultados
             if fetch_one:
-                return cursor.fetchone()
+                result = cursor.fetchone()
+                rows = 1 if result else 0
+                if not owns_cursor:
+                    # El cursor se reutiliza: no puede quedar resultado pendiente
+                    cursor.fetchall()
+                return result
             elif query.strip().upper().startswith(('SELECT', 'SHOW', 'DESCRIBE')):
-                return cursor.fetchall()
+                result = cursor.fetchall()
+                if not dictionary:
+                    result = RowSet(result, cursor.column_names)
+                rows = len(result)
+                return result
         
+            rows = cursor.rowcount
             return None
         
         except Error as e:
@@ -98,57 +1283,341 @@ class DatabaseManager:
                 conn.rollback()
             raise
         finally:
-            if cursor:
+            if cursor and owns_cursor:
                 cursor.close()
+            cls._query_stats.record(query, time.perf_counter() - started, rows, wait, params)
             # Solo cerramos la conexión si la creamos nosotros
             if should_close_conn and conn:
                 conn.close()
     
+    @classmethod
+    def fetch_rows(
+        cls,
+        query: str,
+        params: Optional[tuple] = None,
+        cache_ttl: Optional[float] = None,
+        prepared: bool = False
+    ) -> RowSet:
+        """
+        Ejecuta un SELECT y devuelve las filas como tuplas en un RowSet
+
+        Evita crear un dict por fila; los modelos lo convierten en objetos
+        resolviendo la posición de cada columna una sola vez (from_rows).
+        """
+        return cls.execute_query(
+            query, params, cache_ttl=cache_ttl, prepared=prepared, dictionary=False
+        )
+
+    @classmethod
+    def fetch_row_sets(cls, statements: List[Tuple[str, Optional[tuple]]]) -> List[RowSet]:
+        """
+        Ejecuta varios SELECT en un solo viaje y devuelve un RowSet por sentencia
+
+        Con MySQL se envían juntos como multi-statement; los backends que no
+        lo admiten (SQLite) los ejecutan uno tras otro sobre la misma conexión.
+
+        Args:
+            statements: Lista de tuplas (consulta, parámetros)
+        """
+        query = ";\n".join(statement.strip().rstrip(";") for statement, _ in statements)
+        params = tuple(value for _, values in statements for value in (values or ()))
+        started = time.perf_counter()
+        rows = 0
+        conn = cls.get_read_connection()
+        wait = time.perf_counter() - started
+        cursor = conn.cursor()
+        try:
+            if getattr(cls._backend, "supports_multi_statements", False):
+                results = [
+                    RowSet(result.fetchall(), result.column_names)
+                    for result in cursor.execute(query, params, multi=True)
+                    if result.with_rows
+                ]
+            else:
+                results = []
+                for statement, values in statements:
+                    cursor.execute(statement, values or ())
+                    results.append(RowSet(cursor.fetchall(), cursor.column_names))
+            rows = sum(len(result) for result in results)
+            return results
+        except Error as e:
+            logger.error(f"Database error: {e}")
+            raise
+        finally:
+            cursor.close()
+            cls._query_stats.record(query, time.perf_counter() - started, rows, wait, params)
+            conn.close()
+
+    @classmethod
+    def execute_many(
+        cls,
+        query: str,
+        params_seq: List[tuple],
+        chunk_size: Optional[int] = 1000,
+        conn: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta la misma sentencia para muchos juegos de parámetros con executemany
+
+        Todo el lote se ejecuta con una sola conexión y un único commit; si
+        cualquier bloque falla se revierte el lote completo.
+
+        Args:
+            query: Sentencia SQL (INSERT/UPDATE/DELETE)
+            params_seq: Secuencia de tuplas de parámetros
+            chunk_size: Filas por llamada a executemany (None = todo de una vez)
+            conn: Conexión existente (opcional). Si se proporciona no se hace commit.
+
+        Returns:
+            Diccionario con 'rows' (filas enviadas), 'affected' (total de filas
+            afectadas) y 'chunks' (filas afectadas por cada bloque)
+        """
+        params_seq = list(params_seq)
+        result = {"rows": len(params_seq), "affected": 0, "chunks": []}
+        if not params_seq:
+            return result
+
+        step = chunk_size or len(params_seq)
+        cursor = None
+        should_close_conn = False
+        started = time.perf_counter()
+        wait = 0.0
+
+        try:
+            if conn is None:
+                conn = cls.get_connection()
+                should_close_conn = True
+                wait = time.perf_counter() - started
+
+            cursor = conn.cursor()
+            for start in range(0, len(params_seq), step):
+                cursor.executemany(query, params_seq[start:start + step])
+                affected = max(cursor.rowcount, 0)
+                result["chunks"].append(affected)
+                result["affected"] += affected
+
+            if should_close_conn:
+                conn.commit()
+            cls._after_write(query, None if should_close_conn else conn)
+            return result
+
+        except Error as e:
+            logger.error(f"Database error in batch ({len(params_seq)} rows): {e}")
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            cls._query_stats.record(query, time.perf_counter() - started, result["affected"], wait)
+            if should_close_conn and conn:
+                conn.close()
+
+    @classmethod
+    def stream(
+        cls,
+        query: str,
+        params: Optional[tuple] = None,
+        batch_size: int = 500,
+        dictionary: bool = True,
+        batches: bool = False
+    ) -> Iterator[Union[Dict[str, Any], tuple, List[Any]]]:
+        """
+        Recorre el resultado de una consulta sin cargarlo entero en memoria
+
+        Usa un cursor sin buffer y lee las filas en bloques de batch_size. La
+        conexión queda ocupada hasta que el iterador se agota o se cierra, por
+        lo que conviene consumirlo por completo o usar contextlib.closing.
+
+        Args:
+            query: Consulta SQL
+            params: Parámetros para la consulta
+            batch_size: Filas leídas del servidor en cada fetchmany
+            dictionary: Si True, filas como dict; si False, como tuplas
+            batches: Si True, produce listas de filas en lugar de filas sueltas
+        """
+        started = time.perf_counter()
+        conn = cls.get_read_connection() if cls._is_read_query(query) else cls.get_connection()
+        wait = time.perf_counter() - started
+        cursor = None
+        exhausted = False
+        row_count = 0
+
+        try:
+            cursor = conn.cursor(buffered=False, dictionary=dictionary)
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    exhausted = True
+                    break
+                row_count += len(rows)
+                if batches:
+                    yield rows
+                else:
+                    yield from rows
+        except Error as e:
+            logger.error(f"Database error while streaming: {e}")
+            raise
+        finally:
+            # El tiempo incluye el consumo por parte del llamador
+            cls._query_stats.record(query, time.perf_counter() - started, row_count, wait, params)
+            if exhausted:
+                cursor.close()
+                conn.close()
+            else:
+                # Con filas pendientes en el socket es más barato descartar la
+                # conexión que leer el resto del resultado
+                conn.discard()
+
     @classmethod
     def hash_password(cls, password: str) -> str:
-        """Genera un hash seguro de la contraseña"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        """Genera un hash seguro de la contraseña (coste BCRYPT_ROUNDS, en el pool de procesos)"""
+        return cls._password_hasher.hash(password)
     
     @classmethod
     def verify_password(cls, hashed_password: str, user_password: str) -> bool:
         """Verifica si la contraseña coincide con el hash"""
-        return bcrypt.checkpw(user_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return cls._password_hasher.verify(hashed_password, user_password)
+
+    @classmethod
+    def password_needs_rehash(cls, hashed_password: str) -> bool:
+        """True si el hash no usa el coste configurado en BCRYPT_ROUNDS"""
+        return cls._password_hasher.needs_rehash(hashed_password)
+
+    @classmethod
+    def get_password_hasher_stats(cls) -> Dict[str, Any]:
+        """Devuelve la cola y las latencias del pool de bcrypt"""
+        return cls._password_hasher.stats()
     
+    @classmethod
+    def queue_update(
+        cls,
+        table: str,
+        key_column: str,
+        key: Any,
+        values: Optional[Dict[str, Any]] = None,
+        increments: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Encola un UPDATE no crítico de una fila (ver WriteBehindQueue)
+
+        Ejemplo:
+            DatabaseManager.queue_update("usuarios", "id_usuario", user_id,
+                                         values={"ultimo_login": datetime.now()})
+        """
+        with cls._write_behind_lock:
+            if cls._write_behind is None:
+                cls._write_behind = WriteBehindQueue(
+                    cls,
+                    interval=float(os.getenv("DB_WRITE_BEHIND_INTERVAL", "2")),
+                    max_pending=int(os.getenv("DB_WRITE_BEHIND_MAX_PENDING", "500"))
+                )
+        cls._write_behind.put(table, key_column, key, values, increments)
+
+    @classmethod
+    def flush_writes(cls) -> int:
+        """Escribe ya las actualizaciones encoladas con queue_update"""
+        return cls._write_behind.flush() if cls._write_behind is not None else 0
+
+    @classmethod
+    def get_write_behind_stats(cls) -> Dict[str, int]:
+        """Devuelve los contadores de la cola write-behind"""
+        return cls._write_behind.stats() if cls._write_behind is not None else {}
+
     @classmethod
     def close_pool(cls):
-        """Cierra todas las conexiones del pool"""
-        if cls._connection_pool:
-            cls._connection_pool.close_all()
-            logger.info("Database connection pool closed")
+        """Cierra todas las conexiones del pool (tras escribir lo encolado con queue_update)"""
+        with cls._write_behind_lock:
+            write_behind, cls._write_behind = cls._write_behind, None
+        if write_behind is not None:
+            write_behind.close(flush=cls._connection_pool is not None)
+        with cls._pool_lock:
+            if cls._connection_pool:
+                cls._connection_pool.close_all()
+                cls._connection_pool = None
+                for replica_pool in cls._replica_pools:
+                    replica_pool.close_all()
+                cls._replica_pools = []
+                logger.info("Database connection pool closed")
+            if cls._backend is not None:
+                cls._backend.close()
+                cls._backend = None
+        cls._password_hasher.shutdown()
+
+    @classmethod
+    @contextmanager
+    def transaction(cls):
+        """
+        Unidad de trabajo sobre una única conexión del primario
+
+        Uso:
+            with DatabaseManager.transaction() as tx:
+                new_id = tx.insert("INSERT ...", params)
+                row = tx.fetch("SELECT ...", (new_id,), one=True)
+
+        Hace commit al salir del bloque y rollback si se produce una excepción.
+        """
+        started = time.perf_counter()
+        conn = cls.get_connection()
+        tx = Transaction(cls, conn)
+        try:
+            conn.start_transaction()
+            elapsed = time.perf_counter() - started
+            cls._query_stats.record("START TRANSACTION", elapsed, wait=elapsed)
+            yield tx
+
+            commit_started = time.perf_counter()
+            conn.commit()
+            cls._query_stats.record("COMMIT", time.perf_counter() - commit_started)
+            cls._invalidate_tables(tx.written_tables)
+        except BaseException:
+            rollback_started = time.perf_counter()
+            try:
+                conn.rollback()
+            except Error as e:
+                logger.error(f"Error rolling back transaction: {e}")
+            cls._query_stats.record("ROLLBACK", time.perf_counter() - rollback_started)
+            raise
+        finally:
+            conn.close()
 
    #Nuevos metodos
     @classmethod
     def start_transaction(cls):
         """Inicia una transacción explícita"""
+        started = time.perf_counter()
         conn = cls.get_connection()
         conn.autocommit = False  # Desactiva el autocommit
+        elapsed = time.perf_counter() - started
+        cls._query_stats.record("START TRANSACTION", elapsed, wait=elapsed)
         return conn
 
     @classmethod
     def commit_transaction(cls, conn):
         """Confirma una transacción"""
+        started = time.perf_counter()
         try:
             conn.commit()
+            cls._invalidate_tables(getattr(conn, "_written_tables", frozenset()))
         except Error as e:
             logger.error(f"Error committing transaction: {e}")
             raise
         finally:
+            cls._query_stats.record("COMMIT", time.perf_counter() - started)
             conn.close()
 
     @classmethod
     def rollback_transaction(cls, conn):
         """Revierte una transacción"""
+        started = time.perf_counter()
         try:
             conn.rollback()
         except Error as e:
             logger.error(f"Error rolling back transaction: {e}")
             raise
         finally:
+            cls._query_stats.record("ROLLBACK", time.perf_counter() - started)
             conn.close()
 
 # Funciones de compatibilidad
@@ -158,4 +1627,5 @@ def init_db():
 
 def close_db(conn):
     if conn:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
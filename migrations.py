@@ -0,0 +1,365 @@
+import sys
+import logging
+from typing import Optional, Dict, List, Tuple
+from backends import SQLITE_SCHEMA
+from database import DatabaseManager
+from models import User, AthleteProfile, AthleteDashboardData, CoachProfile, CoachDashboardData, Workout
+
+logger = logging.getLogger(__name__)
+
+
+# Esquema de las tablas que usan models.py y las vistas (dialecto MySQL).
+# Las claves foráneas crean su propio índice en InnoDB.
+MYSQL_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id_usuario INT AUTO_INCREMENT PRIMARY KEY,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        contrasena_hash VARCHAR(255) NOT NULL,
+        tipo ENUM('atleta', 'entrenador', 'administrador') NOT NULL,
+        fecha_registro TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        ultimo_login TIMESTAMP NULL,
+        activo BOOLEAN NOT NULL DEFAULT TRUE
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS perfiles_entrenadores (
+        id_entrenador INT AUTO_INCREMENT PRIMARY KEY,
+        id_usuario INT NOT NULL UNIQUE,
+        nombre_completo VARCHAR(255) NOT NULL,
+        fecha_nacimiento DATE,
+        especialidad VARCHAR(255),
+        experiencia TEXT,
+        FOREIGN KEY (id_usuario) REFERENCES usuarios (id_usuario)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS perfiles_atletas (
+        id_atleta INT AUTO_INCREMENT PRIMARY KEY,
+        id_usuario INT NOT NULL UNIQUE,
+        nombre_completo VARCHAR(255) NOT NULL,
+        fecha_nacimiento DATE,
+        altura DECIMAL(5, 2),
+        peso DECIMAL(5, 2),
+        deporte VARCHAR(100),
+        frecuencia_cardiaca_maxima INT,
+        frecuencia_cardiaca_minima INT,
+        id_entrenador INT NULL,
+        FOREIGN KEY (id_usuario) REFERENCES usuarios (id_usuario),
+        FOREIGN KEY (id_entrenador) REFERENCES perfiles_entrenadores (id_entrenador)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ejercicios (
+        id_ejercicio INT AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(255) NOT NULL,
+        descripcion TEXT,
+        tipo VARCHAR(100),
+        instrucciones TEXT,
+        video_url VARCHAR(500)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS entrenamientos (
+        id_entrenamiento INT AUTO_INCREMENT PRIMARY KEY,
+        id_entrenador INT NOT NULL,
+        titulo VARCHAR(255) NOT NULL,
+        descripcion TEXT,
+        duracion_estimada INT,
+        nivel_dificultad ENUM('principiante', 'intermedio', 'avanzado'),
+        fecha_creacion TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (id_entrenador) REFERENCES perfiles_entrenadores (id_entrenador)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS entrenamiento_ejercicios (
+        id_entrenamiento_ejercicio INT AUTO_INCREMENT PRIMARY KEY,
+        id_entrenamiento INT NOT NULL,
+        id_ejercicio INT NOT NULL,
+        series INT,
+        repeticiones INT,
+        duracion INT,
+        orden INT NOT NULL DEFAULT 1,
+        descanso INT,
+        notas TEXT,
+        FOREIGN KEY (id_entrenamiento) REFERENCES entrenamientos (id_entrenamiento),
+        FOREIGN KEY (id_ejercicio) REFERENCES ejercicios (id_ejercicio)
+    ) ENGINE=InnoDB
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS asignaciones_atletas (
+        id_asignacion INT AUTO_INCREMENT PRIMARY KEY,
+        id_atleta INT NOT NULL,
+        id_entrenamiento INT NOT NULL,
+        fecha_asignacion TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        fecha_completado TIMESTAMP NULL,
+        estado VARCHAR(20) NOT NULL DEFAULT 'pendiente',
+        feedback TEXT,
+        calificacion INT,
+        UNIQUE KEY uq_asignacion_atleta_entrenamiento (id_atleta, id_entrenamiento),
+        FOREIGN KEY (id_atleta) REFERENCES perfiles_atletas (id_atleta),
+        FOREIGN KEY (id_entrenamiento) REFERENCES entrenamientos (id_entrenamiento)
+    ) ENGINE=InnoDB
+    """,
+]
+
+# Índices de las consultas frecuentes. Las claves primarias van implícitas
+# al final de cada índice (InnoDB y rowid de SQLite), lo que cubre el
+# desempate por id de la paginación por cursor.
+HOT_PATH_INDEXES = [
+    # User.authenticate
+    "CREATE INDEX idx_usuarios_email_activo ON usuarios (email, activo)",
+    # AthleteProfile.get_workouts(status=...)
+    "CREATE INDEX idx_asignaciones_atleta_estado_fecha "
+    "ON asignaciones_atletas (id_atleta, estado, fecha_asignacion)",
+    # AthleteProfile.get_workouts / get_workouts_page sin filtro de estado
+    "CREATE INDEX idx_asignaciones_atleta_fecha "
+    "ON asignaciones_atletas (id_atleta, fecha_asignacion)",
+    # CoachProfile.get_assigned_athletes
+    "CREATE INDEX idx_perfiles_atletas_entrenador ON perfiles_atletas (id_entrenador)",
+    # CoachProfile.get_created_workouts
+    "CREATE INDEX idx_entrenamientos_entrenador_fecha "
+    "ON entrenamientos (id_entrenador, fecha_creacion)",
+    # Workout.get_by_id (ejercicios en orden)
+    "CREATE INDEX idx_entrenamiento_ejercicios_orden "
+    "ON entrenamiento_ejercicios (id_entrenamiento, orden)",
+]
+
+# SQLite no indexa las claves foráneas: el recuento de asignaciones de
+# get_created_workouts necesita buscar por id_entrenamiento
+SQLITE_FOREIGN_KEY_INDEXES = [
+    "CREATE INDEX idx_asignaciones_entrenamiento ON asignaciones_atletas (id_entrenamiento)",
+]
+
+# Recalcula el contador de asignaciones de cada entrenamiento
+BACKFILL_ASSIGNMENT_COUNTS = """
+UPDATE entrenamientos SET asignaciones = (
+    SELECT COUNT(*) FROM asignaciones_atletas aa
+    WHERE aa.id_entrenamiento = entrenamientos.id_entrenamiento
+)
+"""
+
+# (versión, descripción, sentencias por dialecto). Nunca se edita una
+# migración ya publicada: los cambios van en una versión nueva.
+MIGRATIONS: List[Tuple[int, str, Dict[str, List[str]]]] = [
+    (1, "Tablas base", {
+        "mysql": MYSQL_SCHEMA,
+        "sqlite": [s for s in SQLITE_SCHEMA.split(";") if s.strip()],
+    }),
+    (2, "Índices de las consultas frecuentes", {
+        "mysql": HOT_PATH_INDEXES,
+        "sqlite": HOT_PATH_INDEXES + SQLITE_FOREIGN_KEY_INDEXES,
+    }),
+    # El backend SQLite crea las tablas con el esquema actual al conectar,
+    # así que allí la columna ya existe y solo hace falta el recálculo
+    (3, "Contador de asignaciones en entrenamientos", {
+        "mysql": [
+            "ALTER TABLE entrenamientos ADD COLUMN asignaciones INT NOT NULL DEFAULT 0",
+            BACKFILL_ASSIGNMENT_COUNTS,
+        ],
+        "sqlite": [BACKFILL_ASSIGNMENT_COUNTS],
+    }),
+]
+
+MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    descripcion VARCHAR(255) NOT NULL,
+    fecha_aplicacion TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Consultas frecuentes con parámetros de ejemplo para revisar su plan.
+# Las plantillas se toman de models.py para que no se desincronicen.
+HOT_QUERIES: List[Tuple[str, str, tuple]] = [
+    (
+        "User.authenticate",
+        User._AUTHENTICATE_QUERY,
+        ("athlete@example.com",)
+    ),
+    (
+        "User.login",
+        User._LOGIN_QUERY,
+        ("athlete@example.com",)
+    ),
+    (
+        "AthleteProfile.get_workouts",
+        AthleteProfile._WORKOUTS_QUERY.format(filters="", limit=""),
+        (1,)
+    ),
+    (
+        "AthleteProfile.get_workouts(status)",
+        AthleteProfile._WORKOUTS_QUERY.format(filters="AND aa.estado = %s", limit=""),
+        (1, "pendiente")
+    ),
+    (
+        "AthleteProfile.get_workouts_page",
+        AthleteProfile._WORKOUTS_QUERY.format(
+            filters="AND (aa.fecha_asignacion < %s "
+                    "OR (aa.fecha_asignacion = %s AND aa.id_asignacion < %s))",
+            limit="LIMIT %s"
+        ),
+        (1, "2030-01-01 00:00:00", "2030-01-01 00:00:00", 1, 21)
+    ),
+    (
+        "AthleteDashboardData",
+        AthleteDashboardData.QUERY,
+        (1, 21, 1)
+    ),
+    (
+        "CoachProfile.get_assigned_athletes",
+        CoachProfile._ATHLETES_QUERY.format(coach="%s", filters="", limit=""),
+        (1,)
+    ),
+    (
+        "CoachProfile.get_created_workouts",
+        CoachProfile._CREATED_WORKOUTS_QUERY.format(coach="%s", filters="", limit=""),
+        (1,)
+    ),
+    (
+        "CoachDashboardData (atletas)",
+        CoachDashboardData._ATHLETES_QUERY,
+        (1, 21)
+    ),
+    (
+        "CoachDashboardData (entrenamientos)",
+        CoachDashboardData._WORKOUTS_QUERY,
+        (1, 21)
+    ),
+    (
+        "CoachDashboardData (ejercicios)",
+        CoachDashboardData._EXERCISES_QUERY,
+        (1, 20)
+    ),
+    (
+        "Workout.get_many (ejercicios)",
+        Workout._EXERCISES_QUERY.format(ids="%s, %s"),
+        (1, 2)
+    ),
+]
+
+
+def _dialect() -> str:
+    """Dialecto SQL del backend configurado ('mysql' o 'sqlite')"""
+    if DatabaseManager._backend is None:
+        DatabaseManager.initialize_pool()
+    return DatabaseManager._backend.name
+
+
+def applied_versions() -> List[int]:
+    """Versiones ya aplicadas, creando la tabla de control si no existe"""
+    conn = DatabaseManager.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(MIGRATIONS_TABLE)
+        cursor.execute("SELECT version FROM schema_migrations ORDER BY version")
+        versions = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        conn.commit()
+        return versions
+    finally:
+        conn.close()
+
+
+def migrate(target: Optional[int] = None) -> List[int]:
+    """
+    Aplica en orden las migraciones pendientes hasta `target` (todas por defecto)
+
+    MySQL confirma implícitamente cada sentencia DDL, así que cada versión
+    se registra en schema_migrations justo después de aplicarse: si una
+    falla, las anteriores quedan registradas y se puede reanudar.
+
+    Returns:
+        Lista de versiones aplicadas en esta llamada
+    """
+    dialect = _dialect()
+    done = set(applied_versions())
+    applied = []
+
+    for version, description, statements in MIGRATIONS:
+        if version in done or (target is not None and version > target):
+            continue
+        conn = DatabaseManager.get_connection()
+        try:
+            cursor = conn.cursor()
+            for statement in statements[dialect]:
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, descripcion) VALUES (%s, %s)",
+                (version, description)
+            )
+            cursor.close()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error applying migration {version} ({description}): {e}")
+            raise
+        finally:
+            conn.close()
+        applied.append(version)
+        logger.info(f"Applied migration {version}: {description}")
+
+    return applied
+
+
+def _full_scans(cursor, dialect: str, query: str, params: tuple) -> List[str]:
+    """Tablas que el plan de la consulta recorre completas"""
+    if dialect == "sqlite":
+        cursor.execute("EXPLAIN QUERY PLAN " + query, params)
+        # detail: 'SCAN aa' frente a 'SEARCH aa USING INDEX ...'. Recorrer una
+        # tabla derivada ya acotada (MATERIALIZE/CO-ROUTINE) no es un problema
+        details = [row[-1] for row in cursor.fetchall()]
+        derived = {
+            detail.split()[1] for detail in details
+            if detail.startswith(("MATERIALIZE ", "CO-ROUTINE "))
+        }
+        return [
+            detail for detail in details
+            if detail.startswith("SCAN ") and " USING " not in detail
+            and not detail.startswith("SCAN CONSTANT")
+            and detail.split()[1] not in derived
+        ]
+
+    cursor.execute("EXPLAIN " + query, params)
+    columns = cursor.column_names
+    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    return [
+        f"{row['table']} (type=ALL)" for row in rows
+        if row.get("type") == "ALL" and not str(row.get("table", "")).startswith("<derived")
+    ]
+
+
+def check_query_plans() -> Dict[str, List[str]]:
+    """
+    Ejecuta EXPLAIN sobre cada consulta de HOT_QUERIES
+
+    Con tablas casi vacías MySQL puede preferir un recorrido completo aunque
+    exista el índice; conviene lanzarlo contra una base con datos reales.
+
+    Returns:
+        Diccionario {consulta: tablas recorridas completas}, vacío si todo usa índices
+    """
+    dialect = _dialect()
+    problems = {}
+    conn = DatabaseManager.get_connection()
+    try:
+        cursor = conn.cursor()
+        for name, query, params in HOT_QUERIES:
+            scans = _full_scans(cursor, dialect, query, params)
+            if scans:
+                problems[name] = scans
+                logger.warning(f"Full table scan in {name}: {', '.join(scans)}")
+        cursor.close()
+    finally:
+        conn.close()
+    return problems
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        migrate()
+        if "--check" in sys.argv[1:] and check_query_plans():
+            sys.exit(1)
+    finally:
+        DatabaseManager.close_pool()
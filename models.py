@@ -1,11 +1,305 @@
 from datetime import date, datetime
-from typing import Optional, List, Dict, Union, Any
-from database import DatabaseManager
+from typing import Optional, List, Dict, Union, Any, Tuple, Callable
+from database import DatabaseManager, RowSet, Transaction
+from operator import itemgetter
+import base64
+import json
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
-class User:
+# Segundos que las lecturas del dashboard pueden servirse desde la caché de
+# DatabaseManager; las escrituras sobre sus tablas las invalidan antes
+CACHE_TTL = 30
+
+# Filas por página en los listados paginados por keyset
+PAGE_SIZE = 20
+
+
+def encode_page_cursor(*values: Any) -> str:
+    """Codifica la clave de la última fila de una página como token opaco"""
+    payload = [
+        {"dt": v.isoformat()} if isinstance(v, datetime)
+        else {"d": v.isoformat()} if isinstance(v, date)
+        else v
+        for v in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_page_cursor(token: str) -> List[Any]:
+    """Recupera la clave codificada por encode_page_cursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page cursor: {token!r}") from e
+    return [
+        datetime.fromisoformat(v["dt"]) if isinstance(v, dict) and "dt" in v
+        else date.fromisoformat(v["d"]) if isinstance(v, dict) and "d" in v
+        else v
+        for v in payload
+    ]
+
+
+def _split_page(rows: List[Any], limit: int, key) -> Tuple[List[Any], Optional[str]]:
+    """Recorta la fila extra pedida para saber si hay más y genera el token siguiente"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_page_cursor(*key(rows[-1]))
+
+
+# Valor que reciben los constructores para las columnas pesadas no leídas
+_DEFERRED = object()
+
+
+def _lazy_values(instance: Any) -> Dict[str, Any]:
+    """Valores ya cargados de las columnas diferidas de una instancia"""
+    try:
+        return instance._lazy
+    except AttributeError:
+        instance._lazy = {}
+        return instance._lazy
+
+
+class LazyColumn:
+    """
+    Atributo respaldado por una columna pesada (TEXT) que las consultas del
+    modelo no leen por defecto. El primer acceso carga las columnas diferidas
+    de todas las instancias del mismo listado con una única consulta.
+    """
+
+    def __init__(self, column: str):
+        self.column = column
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        values = _lazy_values(instance)
+        if self.name not in values:
+            owner.load_deferred(getattr(instance, '_batch', None) or [instance])
+        return values[self.name]
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        values = _lazy_values(instance)
+        if value is _DEFERRED:
+            values.pop(self.name, None)
+        else:
+            values[self.name] = value
+
+
+class _Model:
+    """
+    Base de los modelos: atributos en __slots__ y construcción en bloque
+
+    FIELDS indica, en el orden de los argumentos del constructor, la columna
+    de la que sale cada uno (None si no procede de una columna). Las columnas
+    que falten en el resultado llegan como None, o diferidas si son LazyColumn.
+    """
+    __slots__ = ()
+    FIELDS: Tuple[Optional[str], ...] = ()
+
+    @classmethod
+    def _lazy_columns(cls) -> Dict[str, LazyColumn]:
+        return {
+            name: attr
+            for klass in reversed(cls.__mro__)
+            for name, attr in vars(klass).items()
+            if isinstance(attr, LazyColumn)
+        }
+
+    @classmethod
+    def _missing_value(cls, column: Optional[str]) -> Any:
+        lazy = {attr.column for attr in cls._lazy_columns().values()}
+        return _DEFERRED if column in lazy else None
+
+    @classmethod
+    def from_row(cls, data: Dict[str, Any]):
+        """Construye una instancia a partir de una fila en dict"""
+        return cls(*(
+            data[column] if column in data else cls._missing_value(column)
+            for column in cls.FIELDS
+        ))
+
+    @classmethod
+    def from_rows(cls, rows: RowSet) -> List[Any]:
+        """
+        Construye una instancia por fila de un RowSet (DatabaseManager.fetch_rows)
+
+        La posición de cada columna se resuelve una vez por resultado; cada fila
+        se convierte con un itemgetter en los argumentos del constructor.
+        """
+        index = {column: i for i, column in enumerate(rows.columns)}
+        positions, padding = [], []
+        for column in cls.FIELDS:
+            if column in index:
+                positions.append(index[column])
+            else:
+                positions.append(len(rows.columns) + len(padding))
+                padding.append(cls._missing_value(column))
+        getter = itemgetter(*positions)
+        padding = tuple(padding)
+
+        if padding:
+            return [cls(*getter(tuple(row) + padding)) for row in rows]
+        return [cls(*getter(row)) for row in rows]
+
+
+class _LazyModel(_Model):
+    """Base de los modelos con columnas LazyColumn (tabla y clave en _table/_primary_key)"""
+    __slots__ = ("_lazy", "_batch")
+    _table: str
+    _primary_key: str
+
+    @classmethod
+    def from_rows(cls, rows: RowSet) -> List[Any]:
+        return cls.defer_together(super().from_rows(rows))
+
+    @classmethod
+    def load_deferred(cls, instances: List[Any], chunk_size: int = 500) -> None:
+        """Carga en bloque las columnas diferidas que falten en `instances`"""
+        lazy = cls._lazy_columns()
+        pending = [
+            i for i in instances
+            if any(name not in _lazy_values(i) for name in lazy)
+        ]
+        if not pending:
+            return
+
+        columns = ", ".join(attr.column for attr in lazy.values())
+        ids = list({i.id for i in pending})
+        rows_by_id = {}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            query = (
+                f"SELECT {cls._primary_key}, {columns} FROM {cls._table} "
+                f"WHERE {cls._primary_key} IN ({', '.join(['%s'] * len(chunk))})"
+            )
+            for row in DatabaseManager.execute_query(query, tuple(chunk)) or []:
+                rows_by_id[row[cls._primary_key]] = row
+
+        for instance in pending:
+            row = rows_by_id.get(instance.id, {})
+            values = _lazy_values(instance)
+            for name, attr in lazy.items():
+                values.setdefault(name, row.get(attr.column))
+
+    @staticmethod
+    def defer_together(instances: List[Any]) -> List[Any]:
+        """Agrupa un listado para que el primer acceso diferido lo cargue entero"""
+        for instance in instances:
+            instance._batch = instances
+        return instances
+
+
+class IdentityMap:
+    """
+    Objetos de modelo cargados durante una sesión de la aplicación, uno por
+    (clase, clave). Los get_by_* que lo reciben devuelven el mismo objeto en
+    llamadas sucesivas, y los métodos que escriben (update_profile,
+    update_status, complete) actualizan ese objeto, así que la sesión ve sus
+    propias escrituras sin volver a leer la fila. Los que reciben el identity
+    map (assign_to_athletes, set_exercises, update_status, complete) además
+    descartan la entrada, por si el objeto cargado no era el del mapa.
+    """
+
+    def __init__(self):
+        self._objects: Dict[Tuple[type, Any], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cls: type, key: Any) -> Optional[Any]:
+        with self._lock:
+            return self._objects.get((cls, key))
+
+    def add(self, obj: Any, *aliases: Any) -> Any:
+        """Registra obj por su id y por claves alternativas (p. ej. ('user', id_usuario))"""
+        with self._lock:
+            for key in (obj.id,) + aliases:
+                self._objects[(type(obj), key)] = obj
+        return obj
+
+    def remove(self, obj: Any) -> None:
+        with self._lock:
+            for key in [k for k, v in self._objects.items() if v is obj]:
+                del self._objects[key]
+
+    def discard(self, cls: type, key: Any) -> None:
+        """Olvida el objeto registrado como (cls, key), con todas sus claves; el siguiente get_by_* lo relee"""
+        obj = self.get(cls, key)
+        if obj is not None:
+            self.remove(obj)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._objects.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len({id(v) for v in self._objects.values()})
+
+
+class DataLoader:
+    """
+    Agrupa las cargas por clave pedidas durante el render de una vista
+
+    Las claves anunciadas con prime() se acumulan; el primer load() resuelve
+    todas las pendientes con una sola llamada a batch_fn(claves), que
+    devuelve {clave: objeto}. Los resultados (también los no encontrados) se
+    recuerdan durante la vida del loader.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Dict[Any, Any]]):
+        self._batch_fn = batch_fn
+        self._queue: Dict[Any, None] = {}
+        self._results: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+
+    def prime(self, keys: List[Any]) -> 'DataLoader':
+        """Anuncia claves que se van a pedir para resolverlas en el mismo lote"""
+        with self._lock:
+            for key in keys:
+                if key not in self._results:
+                    self._queue[key] = None
+        return self
+
+    def load(self, key: Any) -> Optional[Any]:
+        """Devuelve el objeto de key, resolviendo a la vez las claves pendientes"""
+        with self._lock:
+            if key not in self._results:
+                self._queue[key] = None
+                self._dispatch()
+            return self._results.get(key)
+
+    def load_many(self, keys: List[Any]) -> List[Optional[Any]]:
+        self.prime(keys)
+        return [self.load(key) for key in keys]
+
+    def _dispatch(self) -> None:
+        keys = list(self._queue)
+        self._queue.clear()
+        results = self._batch_fn(keys) if keys else {}
+        for key in keys:
+            self._results[key] = results.get(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queue.clear()
+            self._results.clear()
+
+
+class User(_Model):
+    __slots__ = ("id", "email", "type", "registration_date", "last_login", "is_active")
+    FIELDS = ("id_usuario", "email", "tipo", "fecha_registro", "ultimo_login", "activo")
+    # Columnas que necesita el modelo; el hash solo se lee al autenticar
+    COLUMNS = ", ".join(FIELDS)
+    _AUTHENTICATE_QUERY = (
+        f"SELECT {COLUMNS}, contrasena_hash FROM usuarios WHERE email = %s AND activo = TRUE"
+    )
+
     def __init__(
         self,
         user_id: int,
@@ -20,50 +314,223 @@ class User:
         self.type = user_type
         self.registration_date = registration_date
         self.last_login = last_login
-        self.is_active = is_active
+        self.is_active = bool(is_active)
     
     @classmethod
     def authenticate(cls, email: str, password: str) -> Optional['User']:
         """Autentica un usuario y devuelve el objeto User si es válido"""
-        query = "SELECT * FROM usuarios WHERE email = %s AND activo = TRUE"
-        user_data = DatabaseManager.execute_query(query, (email,), fetch_one=True)
+        user_data = DatabaseManager.execute_query(
+            cls._AUTHENTICATE_QUERY, (email,), fetch_one=True, prepared=True
+        )
         
-        if user_data and DatabaseManager.verify_password(
-            user_data['contrasena_hash'], password
-        ):
-            return cls(
-                user_id=user_data['id_usuario'],
-                email=user_data['email'],
-                user_type=user_data['tipo'],
-                registration_date=user_data['fecha_registro'],
-                last_login=user_data['ultimo_login'],
-                is_active=bool(user_data['activo'])
-            )
+        if user_data and cls._check_password(user_data['id_usuario'], user_data['contrasena_hash'], password):
+            return cls.from_row(user_data)
         return None
+
+    # Usuario y su perfil de atleta (a_*) o entrenador (c_*) en una fila
+    _LOGIN_QUERY = """
+        SELECT 
+            u.id_usuario,
+            u.email,
+            u.tipo,
+            u.fecha_registro,
+            u.ultimo_login,
+            u.activo,
+            u.contrasena_hash,
+            pa.id_atleta AS a_id_atleta,
+            pa.id_usuario AS a_id_usuario,
+            pa.nombre_completo AS a_nombre_completo,
+            pa.fecha_nacimiento AS a_fecha_nacimiento,
+            pa.altura AS a_altura,
+            pa.peso AS a_peso,
+            pa.deporte AS a_deporte,
+            pa.frecuencia_cardiaca_maxima AS a_frecuencia_cardiaca_maxima,
+            pa.frecuencia_cardiaca_minima AS a_frecuencia_cardiaca_minima,
+            pa.id_entrenador AS a_id_entrenador,
+            u.email AS a_email,
+            pe.id_entrenador AS c_id_entrenador,
+            pe.id_usuario AS c_id_usuario,
+            pe.nombre_completo AS c_nombre_completo,
+            pe.fecha_nacimiento AS c_fecha_nacimiento,
+            pe.especialidad AS c_especialidad
+        FROM 
+            usuarios u
+        LEFT JOIN 
+            perfiles_atletas pa ON pa.id_usuario = u.id_usuario
+        LEFT JOIN 
+            perfiles_entrenadores pe ON pe.id_usuario = u.id_usuario
+        WHERE 
+            u.email = %s AND u.activo = TRUE
+        """
+
+    @classmethod
+    def login(
+        cls,
+        email: str,
+        password: str,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional[Tuple['User', Union['AthleteProfile', 'CoachProfile', None]]]:
+        """
+        Autentica al usuario y carga su perfil con una sola consulta
+
+        El último login se anota en una cola write-behind en lugar de hacer
+        su propio UPDATE y commit. Con identity_map, usuario y perfil quedan
+        en él para que el dashboard no los vuelva a pedir.
+
+        Returns:
+            (usuario, perfil de atleta o entrenador o None) o None si las
+            credenciales no son válidas
+        """
+        rows = DatabaseManager.fetch_rows(cls._LOGIN_QUERY, (email,), prepared=True)
+        if not rows:
+            return None
+        hashed_password = rows[0][rows.columns.index('contrasena_hash')]
+        user = cls.from_rows(rows)[0]
+        if not cls._check_password(user.id, hashed_password, password):
+            return None
+
+        user.update_last_login()
+        profile = None
+        if user.type == 'atleta' and rows[0][rows.columns.index('a_id_atleta')] is not None:
+            profile = AthleteProfile.from_rows(_prefixed(rows, "a_"))[0]
+        elif user.type == 'entrenador' and rows[0][rows.columns.index('c_id_entrenador')] is not None:
+            profile = CoachProfile.from_rows(_prefixed(rows, "c_"))[0]
+
+        if identity_map is not None:
+            user = identity_map.add(user)
+            if profile is not None:
+                profile = identity_map.add(profile, ('user', user.id))
+        return user, profile
+
+    @classmethod
+    def _check_password(cls, user_id: int, hashed_password: str, password: str) -> bool:
+        """Verifica la contraseña y, si el hash usa otro coste, lo regenera en segundo plano"""
+        if not DatabaseManager.verify_password(hashed_password, password):
+            return False
+        if DatabaseManager.password_needs_rehash(hashed_password):
+            cls._rehash_in_background(user_id, password, hashed_password)
+        return True
+
+    @staticmethod
+    def _rehash_in_background(user_id: int, password: str, old_hash: str) -> threading.Thread:
+        """
+        Regenera el hash con el coste actual sin retrasar el login
+
+        Solo se sustituye si el hash no ha cambiado entretanto (p. ej. por un
+        cambio de contraseña).
+        """
+        def rehash():
+            try:
+                DatabaseManager.execute_query(
+                    "UPDATE usuarios SET contrasena_hash = %s "
+                    "WHERE id_usuario = %s AND contrasena_hash = %s",
+                    (DatabaseManager.hash_password(password), user_id, old_hash),
+                    commit=True
+                )
+                logger.info(f"Rehashed password for user {user_id}")
+            except Exception as e:
+                logger.warning(f"Error rehashing password for user {user_id}: {e}")
+
+        thread = threading.Thread(target=rehash, name="sportpro-rehash", daemon=True)
+        thread.start()
+        return thread
+    
+    @classmethod
+    def register(
+        cls,
+        email: str,
+        password: str,
+        user_type: str,
+        profile: Dict[str, Any]
+    ) -> int:
+        """
+        Registra un usuario y su perfil en una única transacción
+
+        Args:
+            email: Email del usuario
+            password: Contraseña en claro (se guarda su hash)
+            user_type: 'atleta' o 'entrenador'
+            profile: Datos del perfil. Atleta: full_name, birth_date, height,
+                weight, sport, max_hr, resting_hr, coach_id. Entrenador:
+                full_name, birth_date, specialty, experience.
+
+        Returns:
+            ID del usuario creado
+        """
+        # El hash se calcula antes de tomar la conexión para no retenerla
+        hashed_pw = DatabaseManager.hash_password(password)
+        
+        with DatabaseManager.transaction() as tx:
+            user_id = tx.insert(
+                """
+                INSERT INTO usuarios (email, contrasena_hash, tipo, activo) 
+                VALUES (%s, %s, %s, 1)
+                """,
+                (email, hashed_pw, user_type)
+            )
+            
+            if user_type == "atleta":
+                tx.execute(
+                    """
+                    INSERT INTO perfiles_atletas 
+                    (id_usuario, nombre_completo, fecha_nacimiento, altura, peso, deporte, 
+                    frecuencia_cardiaca_maxima, frecuencia_cardiaca_minima, id_entrenador) 
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (
+                        user_id, profile['full_name'], profile['birth_date'],
+                        profile['height'], profile['weight'], profile['sport'],
+                        profile['max_hr'], profile['resting_hr'], profile.get('coach_id')
+                    )
+                )
+            elif user_type == "entrenador":
+                tx.execute(
+                    """
+                    INSERT INTO perfiles_entrenadores 
+                    (id_usuario, nombre_completo, fecha_nacimiento, especialidad, experiencia) 
+                    VALUES (%s, %s, %s, %s, %s)
+                    """,
+                    (
+                        user_id, profile['full_name'], profile['birth_date'],
+                        profile['specialty'], profile['experience']
+                    )
+                )
+        
+        return user_id
     
     def update_last_login(self):
-        """Actualiza la fecha del último login"""
-        query = "UPDATE usuarios SET ultimo_login = NOW() WHERE id_usuario = %s"
-        DatabaseManager.execute_query(query, (self.id,), commit=True)
+        """Anota la fecha del último login (se escribe en lote en segundo plano)"""
+        self.last_login = datetime.now()
+        DatabaseManager.queue_update("usuarios", "id_usuario", self.id, values={"ultimo_login": self.last_login})
     
     @classmethod
-    def get_by_id(cls, user_id: int) -> Optional['User']:
-        """Obtiene un usuario por su ID"""
-        query = "SELECT * FROM usuarios WHERE id_usuario = %s"
+    def get_by_id(cls, user_id: int, identity_map: Optional[IdentityMap] = None) -> Optional['User']:
+        """Obtiene un usuario por su ID (del identity map de la sesión si se indica)"""
+        if identity_map is not None:
+            user = identity_map.get(cls, user_id)
+            if user is not None:
+                return user
+        
+        query = f"SELECT {cls.COLUMNS} FROM usuarios WHERE id_usuario = %s"
         user_data = DatabaseManager.execute_query(query, (user_id,), fetch_one=True)
         
         if user_data:
-            return cls(
-                user_id=user_data['id_usuario'],
-                email=user_data['email'],
-                user_type=user_data['tipo'],
-                registration_date=user_data['fecha_registro'],
-                last_login=user_data['ultimo_login'],
-                is_active=bool(user_data['activo'])
-            )
+            user = cls.from_row(user_data)
+            return identity_map.add(user) if identity_map is not None else user
         return None
 
-class AthleteProfile:
+class AthleteProfile(_Model):
+    __slots__ = (
+        "id", "user_id", "full_name", "birth_date", "height", "weight", "sport",
+        "max_hr", "resting_hr", "coach_id", "email"
+    )
+    FIELDS = (
+        "id_atleta", "id_usuario", "nombre_completo", "fecha_nacimiento", "altura", "peso",
+        "deporte", "frecuencia_cardiaca_maxima", "frecuencia_cardiaca_minima", "id_entrenador",
+        "email"
+    )
+    COLUMNS = ", ".join(FIELDS[:-1])
+
     def __init__(
         self,
         athlete_id: int,
@@ -75,7 +542,8 @@ class AthleteProfile:
         sport: str,
         max_hr: Optional[int] = None,
         resting_hr: Optional[int] = None,
-        coach_id: Optional[int] = None
+        coach_id: Optional[int] = None,
+        email: Optional[str] = None
     ):
         self.id = athlete_id
         self.user_id = user_id
@@ -87,6 +555,7 @@ class AthleteProfile:
         self.max_hr = max_hr
         self.resting_hr = resting_hr
         self.coach_id = coach_id
+        self.email = email
     
     @property
     def age(self) -> int:
@@ -97,27 +566,28 @@ class AthleteProfile:
         )
     
     @classmethod
-    def get_by_user_id(cls, user_id: int) -> Optional['AthleteProfile']:
-        """Obtiene el perfil de atleta por ID de usuario"""
-        query = """
-        SELECT * FROM perfiles_atletas 
+    def get_by_user_id(
+        cls,
+        user_id: int,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['AthleteProfile']:
+        """Obtiene el perfil de atleta por ID de usuario (del identity map de la sesión si se indica)"""
+        if identity_map is not None:
+            profile = identity_map.get(cls, ('user', user_id))
+            if profile is not None:
+                return profile
+        
+        query = f"""
+        SELECT {cls.COLUMNS} FROM perfiles_atletas 
         WHERE id_usuario = %s
         """
-        data = DatabaseManager.execute_query(query, (user_id,), fetch_one=True)
+        data = DatabaseManager.execute_query(query, (user_id,), fetch_one=True, cache_ttl=CACHE_TTL)
         
         if data:
-            return cls(
-                athlete_id=data['id_atleta'],
-                user_id=data['id_usuario'],
-                full_name=data['nombre_completo'],
-                birth_date=data['fecha_nacimiento'],
-                height=data['altura'],
-                weight=data['peso'],
-                sport=data['deporte'],
-                max_hr=data['frecuencia_cardiaca_maxima'],
-                resting_hr=data['frecuencia_cardiaca_minima'],
-                coach_id=data['id_entrenador']
-            )
+            profile = cls.from_row(data)
+            if identity_map is not None:
+                identity_map.add(profile, ('user', user_id))
+            return profile
         return None
     
     def update_profile(
@@ -125,13 +595,15 @@ class AthleteProfile:
         height: Optional[float] = None,
         weight: Optional[float] = None,
         sport: Optional[str] = None,
-        resting_hr: Optional[int] = None
+        resting_hr: Optional[int] = None,
+        max_hr: Optional[int] = None
     ) -> bool:
         """Actualiza los datos del perfil del atleta"""
         try:
             query = """
             UPDATE perfiles_atletas 
-            SET altura = %s, peso = %s, deporte = %s, frecuencia_cardiaca_minima = %s
+            SET altura = %s, peso = %s, deporte = %s, frecuencia_cardiaca_minima = %s,
+                frecuencia_cardiaca_maxima = %s
             WHERE id_atleta = %s
             """
             params = (
@@ -139,6 +611,7 @@ class AthleteProfile:
                 weight if weight is not None else self.weight,
                 sport if sport is not None else self.sport,
                 resting_hr if resting_hr is not None else self.resting_hr,
+                max_hr if max_hr is not None else self.max_hr,
                 self.id
             )
             DatabaseManager.execute_query(query, params, commit=True)
@@ -152,27 +625,30 @@ class AthleteProfile:
                 self.sport = sport
             if resting_hr is not None:
                 self.resting_hr = resting_hr
+            if max_hr is not None:
+                self.max_hr = max_hr
             
             return True
         except Exception as e:
             logger.error(f"Error updating athlete profile: {e}")
             return False
     
-    def get_workouts(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Obtiene los entrenamientos asignados al atleta"""
-        query = """
+    # Cada fila da una WorkoutAssignment y su Workout (ver _assignments_from_rows);
+    # descripción y feedback se cargan en bloque si se consultan
+    _WORKOUTS_QUERY = """
         SELECT 
             aa.id_asignacion,
-            e.id_entrenamiento,
-            e.titulo,
-            e.descripcion,
-            e.duracion_estimada,
-            e.nivel_dificultad,
+            aa.id_entrenamiento,
+            aa.id_atleta,
             aa.fecha_asignacion,
             aa.fecha_completado,
             aa.estado,
-            aa.feedback,
             aa.calificacion,
+            e.id_entrenador,
+            e.titulo,
+            e.duracion_estimada,
+            e.nivel_dificultad,
+            e.fecha_creacion,
             pe.nombre_completo AS nombre_entrenador
         FROM 
             asignaciones_atletas aa
@@ -182,15 +658,67 @@ class AthleteProfile:
             perfiles_entrenadores pe ON e.id_entrenador = pe.id_entrenador
         WHERE 
             aa.id_atleta = %s
-            {}
+            {filters}
         ORDER BY 
-            aa.fecha_asignacion DESC
-        """.format("AND aa.estado = %s" if status else "")
-        
+            aa.fecha_asignacion DESC, aa.id_asignacion DESC
+        {limit}
+        """
+
+    def get_workouts(self, status: Optional[str] = None) -> List['WorkoutAssignment']:
+        """Obtiene las asignaciones del atleta, con su entrenamiento en `workout`"""
+        query = self._WORKOUTS_QUERY.format(
+            filters="AND aa.estado = %s" if status else "",
+            limit=""
+        )
         params = (self.id,) if not status else (self.id, status)
-        return DatabaseManager.execute_query(query, params)
+        rows = DatabaseManager.fetch_rows(query, params, cache_ttl=CACHE_TTL, prepared=True)
+        return WorkoutAssignment._assignments_from_rows(rows)
+
+    def get_workouts_page(
+        self,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Tuple[List['WorkoutAssignment'], Optional[str]]:
+        """
+        Obtiene una página de asignaciones, de la más reciente a la más antigua
+
+        Returns:
+            (filas, token de la página siguiente o None si no hay más)
+        """
+        filters = []
+        params = [self.id]
+        if status:
+            filters.append("AND aa.estado = %s")
+            params.append(status)
+        if cursor:
+            assigned_at, assignment_id = decode_page_cursor(cursor)
+            filters.append(
+                "AND (aa.fecha_asignacion < %s "
+                "OR (aa.fecha_asignacion = %s AND aa.id_asignacion < %s))"
+            )
+            params.extend([assigned_at, assigned_at, assignment_id])
+        params.append(limit + 1)
+
+        query = self._WORKOUTS_QUERY.format(filters=" ".join(filters), limit="LIMIT %s")
+        rows = DatabaseManager.fetch_rows(query, tuple(params), cache_ttl=CACHE_TTL, prepared=True)
+        return _split_page(
+            WorkoutAssignment._assignments_from_rows(rows),
+            limit,
+            lambda a: (a.assignment_date, a.id)
+        )
+
+class CoachProfile(_LazyModel):
+    __slots__ = ("id", "user_id", "full_name", "birth_date", "specialty")
+    _table = "perfiles_entrenadores"
+    _primary_key = "id_entrenador"
+    FIELDS = (
+        "id_entrenador", "id_usuario", "nombre_completo", "fecha_nacimiento",
+        "especialidad", "experiencia"
+    )
+    COLUMNS = ", ".join(FIELDS[:-1])
+    experience = LazyColumn("experiencia")
 
-class CoachProfile:
     def __init__(
         self,
         coach_id: int,
@@ -216,30 +744,34 @@ class CoachProfile:
         )
     
     @classmethod
-    def get_by_user_id(cls, user_id: int) -> Optional['CoachProfile']:
-        """Obtiene el perfil de entrenador por ID de usuario"""
-        query = """
-        SELECT * FROM perfiles_entrenadores 
+    def get_by_user_id(
+        cls,
+        user_id: int,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['CoachProfile']:
+        """Obtiene el perfil de entrenador por ID de usuario (del identity map de la sesión si se indica)"""
+        if identity_map is not None:
+            profile = identity_map.get(cls, ('user', user_id))
+            if profile is not None:
+                return profile
+        
+        query = f"""
+        SELECT {cls.COLUMNS} FROM perfiles_entrenadores 
         WHERE id_usuario = %s
         """
         data = DatabaseManager.execute_query(query, (user_id,), fetch_one=True)
         
         if data:
-            return cls(
-                coach_id=data['id_entrenador'],
-                user_id=data['id_usuario'],
-                full_name=data['nombre_completo'],
-                birth_date=data['fecha_nacimiento'],
-                specialty=data['especialidad'],
-                experience=data['experiencia']
-            )
+            profile = cls.from_row(data)
+            if identity_map is not None:
+                identity_map.add(profile, ('user', user_id))
+            return profile
         return None
     
-    def get_assigned_athletes(self) -> List[Dict[str, Any]]:
-        """Obtiene los atletas asignados a este entrenador"""
-        query = """
+    _ATHLETES_QUERY = """
         SELECT 
             pa.id_atleta,
+            pa.id_usuario,
             pa.nombre_completo,
             pa.fecha_nacimiento,
             pa.altura,
@@ -247,15 +779,47 @@ class CoachProfile:
             pa.deporte,
             pa.frecuencia_cardiaca_maxima,
             pa.frecuencia_cardiaca_minima,
+            pa.id_entrenador,
             u.email
         FROM 
             perfiles_atletas pa
         JOIN 
             usuarios u ON pa.id_usuario = u.id_usuario
         WHERE 
-            pa.id_entrenador = %s AND u.activo = TRUE
+            pa.id_entrenador = {coach} AND u.activo = TRUE
+            {filters}
+        ORDER BY 
+            pa.id_atleta
+        {limit}
+        """
+
+    def get_assigned_athletes(self) -> List[AthleteProfile]:
+        """Obtiene los atletas asignados a este entrenador (con su email)"""
+        query = self._ATHLETES_QUERY.format(coach="%s", filters="", limit="")
+        return AthleteProfile.from_rows(DatabaseManager.fetch_rows(query, (self.id,)))
+
+    def get_assigned_athletes_page(
+        self,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[AthleteProfile], Optional[str]]:
         """
-        return DatabaseManager.execute_query(query, (self.id,))
+        Obtiene una página de atletas asignados, ordenados por id
+
+        Returns:
+            (filas, token de la página siguiente o None si no hay más)
+        """
+        params = [self.id]
+        filters = ""
+        if cursor:
+            (last_athlete_id,) = decode_page_cursor(cursor)
+            filters = "AND pa.id_atleta > %s"
+            params.append(last_athlete_id)
+        params.append(limit + 1)
+
+        query = self._ATHLETES_QUERY.format(coach="%s", filters=filters, limit="LIMIT %s")
+        athletes = AthleteProfile.from_rows(DatabaseManager.fetch_rows(query, tuple(params)))
+        return _split_page(athletes, limit, lambda a: (a.id,))
     
     def create_workout(
         self,
@@ -267,26 +831,67 @@ class CoachProfile:
         """Crea un nuevo entrenamiento"""
         return Workout.create(self.id, title, description, estimated_duration, difficulty)
     
-    def get_created_workouts(self) -> List[Dict[str, Any]]:
-        """Obtiene los entrenamientos creados por este entrenador"""
-        query = """
+    # El número de asignaciones es el contador de entrenamientos, que
+    # mantienen las escrituras de asignaciones (ver Workout.bump_assignment_count)
+    _CREATED_WORKOUTS_QUERY = """
         SELECT 
-            e.*,
-            COUNT(aa.id_asignacion) AS asignaciones
+            e.id_entrenamiento,
+            e.id_entrenador,
+            e.titulo,
+            e.duracion_estimada,
+            e.nivel_dificultad,
+            e.fecha_creacion,
+            e.asignaciones
         FROM 
             entrenamientos e
-        LEFT JOIN 
-            asignaciones_atletas aa ON e.id_entrenamiento = aa.id_entrenamiento
         WHERE 
-            e.id_entrenador = %s
-        GROUP BY 
-            e.id_entrenamiento
+            e.id_entrenador = {coach}
+            {filters}
         ORDER BY 
-            e.fecha_creacion DESC
+            e.fecha_creacion DESC, e.id_entrenamiento DESC
+        {limit}
         """
-        return DatabaseManager.execute_query(query, (self.id,))
 
-class Exercise:
+    def get_created_workouts(self) -> List['Workout']:
+        """Obtiene los entrenamientos creados por este entrenador, con su número de asignaciones"""
+        query = self._CREATED_WORKOUTS_QUERY.format(coach="%s", filters="", limit="")
+        return Workout.from_rows(DatabaseManager.fetch_rows(query, (self.id,), prepared=True))
+
+    def get_created_workouts_page(
+        self,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List['Workout'], Optional[str]]:
+        """
+        Obtiene una página de entrenamientos creados, del más reciente al más antiguo
+
+        Returns:
+            (filas, token de la página siguiente o None si no hay más)
+        """
+        params = [self.id]
+        filters = ""
+        if cursor:
+            created_at, workout_id = decode_page_cursor(cursor)
+            filters = (
+                "AND (e.fecha_creacion < %s "
+                "OR (e.fecha_creacion = %s AND e.id_entrenamiento < %s))"
+            )
+            params.extend([created_at, created_at, workout_id])
+        params.append(limit + 1)
+
+        query = self._CREATED_WORKOUTS_QUERY.format(coach="%s", filters=filters, limit="LIMIT %s")
+        workouts = Workout.from_rows(DatabaseManager.fetch_rows(query, tuple(params), prepared=True))
+        return _split_page(workouts, limit, lambda w: (w.creation_date, w.id))
+
+class Exercise(_LazyModel):
+    __slots__ = ("id", "name", "type", "video_url")
+    _table = "ejercicios"
+    _primary_key = "id_ejercicio"
+    FIELDS = ("id_ejercicio", "nombre", "descripcion", "tipo", "instrucciones", "video_url")
+    COLUMNS = "id_ejercicio, nombre, tipo, video_url"
+    description = LazyColumn("descripcion")
+    instructions = LazyColumn("instrucciones")
+
     def __init__(
         self,
         exercise_id: int,
@@ -304,9 +909,9 @@ class Exercise:
         self.video_url = video_url
     
     @classmethod
-    def get_all(cls, exercise_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_all(cls, exercise_type: Optional[str] = None) -> List['Exercise']:
         """Obtiene todos los ejercicios, opcionalmente filtrados por tipo"""
-        query = "SELECT * FROM ejercicios"
+        query = f"SELECT {cls.COLUMNS} FROM ejercicios"
         params = None
         
         if exercise_type:
@@ -314,26 +919,41 @@ class Exercise:
             params = (exercise_type,)
         
         query += " ORDER BY nombre"
-        return DatabaseManager.execute_query(query, params)
+        return cls.from_rows(DatabaseManager.fetch_rows(query, params))
     
     @classmethod
-    def get_by_id(cls, exercise_id: int) -> Optional['Exercise']:
-        """Obtiene un ejercicio por su ID"""
-        query = "SELECT * FROM ejercicios WHERE id_ejercicio = %s"
+    def get_by_id(cls, exercise_id: int, identity_map: Optional[IdentityMap] = None) -> Optional['Exercise']:
+        """Obtiene un ejercicio por su ID (del identity map de la sesión si se indica)"""
+        if identity_map is not None:
+            exercise = identity_map.get(cls, exercise_id)
+            if exercise is not None:
+                return exercise
+        
+        query = f"SELECT {cls.COLUMNS} FROM ejercicios WHERE id_ejercicio = %s"
         data = DatabaseManager.execute_query(query, (exercise_id,), fetch_one=True)
         
         if data:
-            return cls(
-                exercise_id=data['id_ejercicio'],
-                name=data['nombre'],
-                description=data['descripcion'],
-                exercise_type=data['tipo'],
-                instructions=data['instrucciones'],
-                video_url=data['video_url']
-            )
+            exercise = cls.from_row(data)
+            return identity_map.add(exercise) if identity_map is not None else exercise
         return None
 
-class Workout:
+class Workout(_LazyModel):
+    __slots__ = (
+        "id", "coach_id", "title", "estimated_duration", "difficulty", "creation_date",
+        "exercises", "assignment_count", "coach_name"
+    )
+    _table = "entrenamientos"
+    _primary_key = "id_entrenamiento"
+    FIELDS = (
+        "id_entrenamiento", "id_entrenador", "titulo", "descripcion", "duracion_estimada",
+        "nivel_dificultad", "fecha_creacion", None, "asignaciones", "nombre_entrenador"
+    )
+    COLUMNS = (
+        "id_entrenamiento, id_entrenador, titulo, duracion_estimada, nivel_dificultad, "
+        "fecha_creacion, asignaciones"
+    )
+    description = LazyColumn("descripcion")
+
     def __init__(
         self,
         workout_id: int,
@@ -343,7 +963,9 @@ class Workout:
         estimated_duration: int,
         difficulty: str,
         creation_date: datetime,
-        exercises: Optional[List[Dict[str, Any]]] = None
+        exercises: Optional[List[Dict[str, Any]]] = None,
+        assignment_count: Optional[int] = None,
+        coach_name: Optional[str] = None
     ):
         self.id = workout_id
         self.coach_id = coach_id
@@ -353,6 +975,8 @@ class Workout:
         self.difficulty = difficulty
         self.creation_date = creation_date
         self.exercises = exercises or []
+        self.assignment_count = assignment_count
+        self.coach_name = coach_name
     
     @classmethod
     def create(
@@ -370,40 +994,38 @@ class Workout:
         VALUES (%s, %s, %s, %s, %s)
         """
         try:
-            DatabaseManager.execute_query(
-                query,
-                (coach_id, title, description, estimated_duration, difficulty),
-                commit=True
-            )
-            
-            # Obtener el ID del entrenamiento recién creado
-            query = "SELECT LAST_INSERT_ID() AS id"
-            result = DatabaseManager.execute_query(query, fetch_one=True)
+            # Una sola conexión y un solo commit; un entrenamiento nuevo no
+            # tiene ejercicios, así que basta con releer la cabecera
+            with DatabaseManager.transaction() as tx:
+                workout_id = tx.insert(
+                    query,
+                    (coach_id, title, description, estimated_duration, difficulty)
+                )
+                data = tx.fetch(
+                    f"SELECT {cls.COLUMNS} FROM entrenamientos WHERE id_entrenamiento = %s",
+                    (workout_id,),
+                    one=True
+                )
             
-            if result:
-                return cls.get_by_id(result['id'])
+            if data:
+                return cls.from_row({**data, 'descripcion': description})
             return None
         except Exception as e:
             logger.error(f"Error creating workout: {e}")
             return None
     
-    @classmethod
-    def get_by_id(cls, workout_id: int) -> Optional['Workout']:
-        """Obtiene un entrenamiento por su ID con sus ejercicios"""
-        # Obtener datos básicos del entrenamiento
-        query = """
-        SELECT * FROM entrenamientos 
-        WHERE id_entrenamiento = %s
-        """
-        data = DatabaseManager.execute_query(query, (workout_id,), fetch_one=True)
-        
-        if not data:
-            return None
-        
-        # Obtener ejercicios asociados
-        exercises_query = """
+    # Ejercicios de varios entrenamientos en una consulta ({ids}: marcadores del IN)
+    _EXERCISES_QUERY = """
         SELECT 
-            ee.*,
+            ee.id_entrenamiento_ejercicio,
+            ee.id_entrenamiento,
+            ee.id_ejercicio,
+            ee.series,
+            ee.repeticiones,
+            ee.duracion,
+            ee.orden,
+            ee.descanso,
+            ee.notas,
             e.nombre AS nombre_ejercicio,
             e.descripcion AS descripcion_ejercicio,
             e.tipo AS tipo_ejercicio
@@ -412,25 +1034,122 @@ class Workout:
         JOIN 
             ejercicios e ON ee.id_ejercicio = e.id_ejercicio
         WHERE 
-            ee.id_entrenamiento = %s
+            ee.id_entrenamiento IN ({ids})
         ORDER BY 
-            ee.orden
+            ee.id_entrenamiento, ee.orden
         """
-        exercises = DatabaseManager.execute_query(exercises_query, (workout_id,))
-        
-        return cls(
-            workout_id=data['id_entrenamiento'],
-            coach_id=data['id_entrenador'],
-            title=data['titulo'],
-            description=data['descripcion'],
-            estimated_duration=data['duracion_estimada'],
-            difficulty=data['nivel_dificultad'],
-            creation_date=data['fecha_creacion'],
-            exercises=exercises
-        )
+
+    @classmethod
+    def get_by_id(cls, workout_id: int, identity_map: Optional[IdentityMap] = None) -> Optional['Workout']:
+        """Obtiene un entrenamiento por su ID con sus ejercicios (del identity map de la sesión si se indica)"""
+        workouts = cls.get_many([workout_id], identity_map=identity_map)
+        return workouts[0] if workouts else None
+
+    @classmethod
+    def get_many(
+        cls,
+        workout_ids: List[int],
+        with_exercises: bool = True,
+        identity_map: Optional[IdentityMap] = None,
+        chunk_size: int = 500
+    ) -> List['Workout']:
+        """
+        Obtiene varios entrenamientos con una consulta para las cabeceras y otra
+        para todos sus ejercicios (por bloques de chunk_size ids)
+
+        Los leídos con with_exercises=False no se guardan en el identity map,
+        que solo contiene entrenamientos completos.
+
+        Returns:
+            Entrenamientos en el orden de workout_ids (se omiten los inexistentes)
+        """
+        found: Dict[int, Workout] = {}
+        pending = []
+        for workout_id in dict.fromkeys(workout_ids):
+            workout = identity_map.get(cls, workout_id) if identity_map is not None else None
+            if workout is not None:
+                found[workout_id] = workout
+            else:
+                pending.append(workout_id)
+
+        loaded = []
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            query = (
+                f"SELECT {cls.COLUMNS} FROM entrenamientos "
+                f"WHERE id_entrenamiento IN ({', '.join(['%s'] * len(chunk))})"
+            )
+            loaded.extend(cls.from_rows(DatabaseManager.fetch_rows(query, tuple(chunk))))
+
+        if with_exercises:
+            cls.attach_exercises(loaded, chunk_size)
+        for workout in loaded:
+            found[workout.id] = identity_map.add(workout) if identity_map is not None and with_exercises else workout
+
+        return [found[workout_id] for workout_id in workout_ids if workout_id in found]
+
+    @classmethod
+    def attach_exercises(cls, workouts: List['Workout'], chunk_size: int = 500) -> List['Workout']:
+        """Carga los ejercicios de todos los entrenamientos con consultas IN y los asigna en memoria"""
+        ids = list(dict.fromkeys(workout.id for workout in workouts))
+        exercises = []
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            query = cls._EXERCISES_QUERY.format(ids=", ".join(["%s"] * len(chunk)))
+            exercises.extend(DatabaseManager.execute_query(query, tuple(chunk)) or [])
+        return cls._group_exercises(workouts, exercises)
+
+    @staticmethod
+    def _group_exercises(workouts: List['Workout'], exercises: List[Dict[str, Any]]) -> List['Workout']:
+        """Reparte filas de _EXERCISES_QUERY (ya ordenadas) entre sus entrenamientos"""
+        by_id: Dict[int, List[Dict[str, Any]]] = {workout.id: [] for workout in workouts}
+        for exercise in exercises:
+            by_id[exercise['id_entrenamiento']].append(exercise)
+
+        for workout in workouts:
+            workout.exercises = by_id[workout.id]
+        return workouts
+
+    @classmethod
+    def loader(cls, with_exercises: bool = True, identity_map: Optional[IdentityMap] = None) -> 'DataLoader':
+        """DataLoader de entrenamientos por ID para el render de una vista"""
+        return DataLoader(lambda ids: {
+            workout.id: workout
+            for workout in cls.get_many(ids, with_exercises=with_exercises, identity_map=identity_map)
+        })
     
-    def assign_to_athlete(self, athlete_id: int) -> bool:
+    @staticmethod
+    def bump_assignment_count(tx: Transaction, workout_id: int, inserted: int) -> None:
+        """Suma las asignaciones nuevas al contador del entrenamiento dentro de la transacción"""
+        if inserted:
+            tx.execute(
+                "UPDATE entrenamientos SET asignaciones = asignaciones + %s WHERE id_entrenamiento = %s",
+                (inserted, workout_id)
+            )
+
+    def assign_to_athlete(self, athlete_id: int, identity_map: Optional[IdentityMap] = None) -> bool:
         """Asigna este entrenamiento a un atleta"""
+        return self.assign_to_athletes([athlete_id], identity_map=identity_map) is not None
+
+    def assign_to_athletes(
+        self,
+        athlete_ids: List[int],
+        chunk_size: int = 500,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional[Dict[str, List[int]]]:
+        """
+        Asigna este entrenamiento a varios atletas en una sola transacción
+
+        Bloquea las asignaciones ya existentes, inserta todas con un
+        executemany (reasignar reinicia el estado a 'pendiente') y suma al
+        contador solo las nuevas. Si algo falla no queda ninguna asignada.
+        Con identity_map se descarta el entrenamiento cacheado en la sesión.
+
+        Returns:
+            Diccionario con 'inserted' (atletas asignados ahora) y 'existing'
+            (ya lo tenían asignado), o None si hubo un error
+        """
+        ids = list(dict.fromkeys(athlete_ids))
         query = """
         INSERT INTO asignaciones_atletas 
         (id_atleta, id_entrenamiento, estado)
@@ -438,16 +1157,63 @@ class Workout:
         ON DUPLICATE KEY UPDATE estado = 'pendiente'
         """
         try:
-            DatabaseManager.execute_query(
-                query,
-                (athlete_id, self.id),
-                commit=True
+            existing = set()
+            with DatabaseManager.transaction() as tx:
+                for start in range(0, len(ids), chunk_size):
+                    chunk = ids[start:start + chunk_size]
+                    rows = tx.fetch(
+                        "SELECT id_atleta FROM asignaciones_atletas "
+                        f"WHERE id_entrenamiento = %s AND id_atleta IN ({', '.join(['%s'] * len(chunk))}) "
+                        "FOR UPDATE",
+                        (self.id, *chunk)
+                    )
+                    existing.update(row['id_atleta'] for row in rows)
+                if ids:
+                    tx.execute_many(query, [(athlete_id, self.id) for athlete_id in ids], chunk_size)
+                inserted = [athlete_id for athlete_id in ids if athlete_id not in existing]
+                self.bump_assignment_count(tx, self.id, len(inserted))
+
+            if self.assignment_count is not None:
+                self.assignment_count += len(inserted)
+            if identity_map is not None:
+                identity_map.discard(Workout, self.id)
+            return {
+                'inserted': inserted,
+                'existing': [athlete_id for athlete_id in ids if athlete_id in existing]
+            }
+        except Exception as e:
+            logger.error(f"Error assigning workout to athletes: {e}")
+            return None
+    
+    def update(
+        self,
+        title: Optional[str] = None,
+        estimated_duration: Optional[int] = None,
+        difficulty: Optional[str] = None,
+        identity_map: Optional[IdentityMap] = None
+    ) -> bool:
+        """Actualiza la cabecera del entrenamiento (y lo descarta del identity map si se indica)"""
+        query = """
+        UPDATE entrenamientos
+        SET titulo = %s, duracion_estimada = %s, nivel_dificultad = %s
+        WHERE id_entrenamiento = %s
+        """
+        try:
+            params = (
+                title if title is not None else self.title,
+                estimated_duration if estimated_duration is not None else self.estimated_duration,
+                difficulty if difficulty is not None else self.difficulty,
+                self.id
             )
+            DatabaseManager.execute_query(query, params, commit=True)
+            self.title, self.estimated_duration, self.difficulty = params[:3]
+            if identity_map is not None:
+                identity_map.discard(Workout, self.id)
             return True
         except Exception as e:
-            logger.error(f"Error assigning workout to athlete: {e}")
+            logger.error(f"Error updating workout: {e}")
             return False
-    
+
     def add_exercise(
         self,
         exercise_id: int,
@@ -475,7 +1241,120 @@ class Workout:
             logger.error(f"Error adding exercise to workout: {e}")
             return False
 
-class WorkoutAssignment:
+    # Columnas de entrenamiento_ejercicios que fija set_exercises, en el
+    # orden de las claves de cada ejercicio (las mismas que add_exercise)
+    _EXERCISE_FIELDS = (
+        ("id_ejercicio", "exercise_id"),
+        ("series", "sets"),
+        ("repeticiones", "reps"),
+        ("duracion", "duration"),
+        ("descanso", "rest"),
+        ("notas", "notes"),
+    )
+
+    def set_exercises(
+        self,
+        exercises: List[Dict[str, Any]],
+        merge: bool = False,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Fija la lista ordenada de ejercicios del entrenamiento en una transacción
+
+        Cada ejercicio es un diccionario con las claves de add_exercise
+        (exercise_id, sets, reps, duration, rest, notes); su posición en la
+        lista da el orden (1..n). Con merge=True se conservan los ejercicios
+        actuales: los que vuelven a aparecer se actualizan en su sitio y los
+        nuevos se añaden al final.
+
+        Solo se escribe la diferencia con las filas actuales, emparejadas por
+        posición: UPDATE de las que cambian, un executemany para las nuevas y
+        un DELETE para las sobrantes. Después `exercises` queda recargado y,
+        con identity_map, se descarta el entrenamiento cacheado en la sesión.
+
+        Returns:
+            Diccionario con 'inserted', 'updated' y 'deleted', o None si hubo un error
+        """
+        columns = [column for column, _ in self._EXERCISE_FIELDS]
+        try:
+            with DatabaseManager.transaction() as tx:
+                current = tx.fetch(
+                    f"SELECT id_entrenamiento_ejercicio, orden, {', '.join(columns)} "
+                    "FROM entrenamiento_ejercicios WHERE id_entrenamiento = %s "
+                    "ORDER BY orden, id_entrenamiento_ejercicio FOR UPDATE",
+                    (self.id,)
+                )
+                wanted = [
+                    tuple(exercise.get(key) for _, key in self._EXERCISE_FIELDS)
+                    for exercise in exercises
+                ]
+                if merge:
+                    merged = [tuple(row[column] for column in columns) for row in current]
+                    positions = {values[0]: i for i, values in enumerate(merged)}
+                    for values in wanted:
+                        if values[0] in positions:
+                            merged[positions[values[0]]] = values
+                        else:
+                            positions[values[0]] = len(merged)
+                            merged.append(values)
+                    wanted = merged
+
+                updates = []
+                for order, (row, values) in enumerate(zip(current, wanted), start=1):
+                    if row['orden'] != order or tuple(row[column] for column in columns) != values:
+                        updates.append((*values, order, row['id_entrenamiento_ejercicio']))
+                if updates:
+                    tx.execute_many(
+                        f"UPDATE entrenamiento_ejercicios SET {', '.join(f'{c} = %s' for c in columns)}, "
+                        "orden = %s WHERE id_entrenamiento_ejercicio = %s",
+                        updates
+                    )
+
+                inserts = [
+                    (self.id, *values, order)
+                    for order, values in enumerate(wanted, start=1)
+                    if order > len(current)
+                ]
+                if inserts:
+                    tx.execute_many(
+                        f"INSERT INTO entrenamiento_ejercicios (id_entrenamiento, {', '.join(columns)}, orden) "
+                        f"VALUES ({', '.join(['%s'] * (len(columns) + 2))})",
+                        inserts
+                    )
+
+                surplus = [row['id_entrenamiento_ejercicio'] for row in current[len(wanted):]]
+                if surplus:
+                    tx.execute(
+                        "DELETE FROM entrenamiento_ejercicios "
+                        f"WHERE id_entrenamiento_ejercicio IN ({', '.join(['%s'] * len(surplus))})",
+                        tuple(surplus)
+                    )
+
+                self.exercises = tx.fetch(self._EXERCISES_QUERY.format(ids="%s"), (self.id,))
+            if identity_map is not None:
+                identity_map.discard(Workout, self.id)
+            return {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(surplus)}
+        except Exception as e:
+            logger.error(f"Error setting workout exercises: {e}")
+            return None
+
+class WorkoutAssignment(_LazyModel):
+    __slots__ = (
+        "id", "workout_id", "athlete_id", "assignment_date", "status",
+        "completion_date", "rating", "workout"
+    )
+    _table = "asignaciones_atletas"
+    _primary_key = "id_asignacion"
+    FIELDS = (
+        "id_asignacion", "id_entrenamiento", "id_atleta", "fecha_asignacion", "estado",
+        "fecha_completado", "feedback", "calificacion", None
+    )
+    COLUMNS = (
+        "id_asignacion, id_entrenamiento, id_atleta, fecha_asignacion, "
+        "estado, fecha_completado, calificacion"
+    )
+    feedback = LazyColumn("feedback")
+
     def __init__(
         self,
         assignment_id: int,
@@ -485,7 +1364,8 @@ class WorkoutAssignment:
         status: str,
         completion_date: Optional[datetime] = None,
         feedback: Optional[str] = None,
-        rating: Optional[int] = None
+        rating: Optional[int] = None,
+        workout: Optional['Workout'] = None
     ):
         self.id = assignment_id
         self.workout_id = workout_id
@@ -495,31 +1375,41 @@ class WorkoutAssignment:
         self.completion_date = completion_date
         self.feedback = feedback
         self.rating = rating
+        self.workout = workout
     
     @classmethod
-    def get_by_id(cls, assignment_id: int) -> Optional['WorkoutAssignment']:
-        """Obtiene una asignación por su ID"""
-        query = """
-        SELECT * FROM asignaciones_atletas 
+    def get_by_id(
+        cls,
+        assignment_id: int,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['WorkoutAssignment']:
+        """Obtiene una asignación por su ID (del identity map de la sesión si se indica)"""
+        if identity_map is not None:
+            assignment = identity_map.get(cls, assignment_id)
+            if assignment is not None:
+                return assignment
+        
+        query = f"""
+        SELECT {cls.COLUMNS} FROM asignaciones_atletas 
         WHERE id_asignacion = %s
         """
         data = DatabaseManager.execute_query(query, (assignment_id,), fetch_one=True)
         
         if data:
-            return cls(
-                assignment_id=data['id_asignacion'],
-                workout_id=data['id_entrenamiento'],
-                athlete_id=data['id_atleta'],
-                assignment_date=data['fecha_asignacion'],
-                status=data['estado'],
-                completion_date=data['fecha_completado'],
-                feedback=data['feedback'],
-                rating=data['calificacion']
-            )
+            assignment = cls.from_row(data)
+            return identity_map.add(assignment) if identity_map is not None else assignment
         return None
     
-    def update_status(self, new_status: str) -> bool:
-        """Actualiza el estado de la asignación"""
+    @classmethod
+    def _assignments_from_rows(cls, rows: RowSet) -> List['WorkoutAssignment']:
+        """Asignaciones de un RowSet que trae también las columnas de su entrenamiento"""
+        assignments = cls.from_rows(rows)
+        for assignment, workout in zip(assignments, Workout.from_rows(rows)):
+            assignment.workout = workout
+        return assignments
+    
+    def update_status(self, new_status: str, identity_map: Optional[IdentityMap] = None) -> bool:
+        """Actualiza el estado de la asignación (y la descarta del identity map si se indica)"""
         query = """
         UPDATE asignaciones_atletas 
         SET estado = %s
@@ -532,13 +1422,20 @@ class WorkoutAssignment:
                 commit=True
             )
             self.status = new_status
+            if identity_map is not None:
+                identity_map.discard(WorkoutAssignment, self.id)
             return True
         except Exception as e:
             logger.error(f"Error updating assignment status: {e}")
             return False
     
-    def complete(self, feedback: Optional[str] = None, rating: Optional[int] = None) -> bool:
-        """Marca la asignación como completada"""
+    def complete(
+        self,
+        feedback: Optional[str] = None,
+        rating: Optional[int] = None,
+        identity_map: Optional[IdentityMap] = None
+    ) -> bool:
+        """Marca la asignación como completada (y la descarta del identity map si se indica)"""
         query = """
         UPDATE asignaciones_atletas 
         SET estado = 'completado', 
@@ -557,7 +1454,230 @@ class WorkoutAssignment:
             self.completion_date = datetime.now()
             self.feedback = feedback
             self.rating = rating
+            if identity_map is not None:
+                identity_map.discard(WorkoutAssignment, self.id)
             return True
         except Exception as e:
             logger.error(f"Error completing workout assignment: {e}")
-            return False
\ No newline at end of file
+            return False
+
+def _prefixed(rows: RowSet, prefix: str) -> RowSet:
+    """Vista de un RowSet con solo las columnas `prefix*` y el prefijo quitado"""
+    columns = tuple(
+        column[len(prefix):] if column.startswith(prefix) else f"-{column}"
+        for column in rows.columns
+    )
+    return RowSet(rows, columns)
+
+
+class AthleteDashboardData:
+    """
+    Datos del dashboard del atleta en un único viaje a la base de datos
+
+    Una consulta trae el perfil, el nombre de su entrenador y la primera
+    página de asignaciones (tabla derivada con LIMIT) con sus entrenamientos;
+    el perfil se repite en cada fila de asignación.
+    """
+    __slots__ = ("profile", "coach_name", "assignments", "next_cursor")
+
+    # Prefijos a_ (perfil) y w_ (asignación + entrenamiento) porque ambas
+    # partes tienen columnas con el mismo nombre (id_atleta, id_entrenador)
+    QUERY = """
+        SELECT 
+            pa.id_atleta AS a_id_atleta,
+            pa.id_usuario AS a_id_usuario,
+            pa.nombre_completo AS a_nombre_completo,
+            pa.fecha_nacimiento AS a_fecha_nacimiento,
+            pa.altura AS a_altura,
+            pa.peso AS a_peso,
+            pa.deporte AS a_deporte,
+            pa.frecuencia_cardiaca_maxima AS a_frecuencia_cardiaca_maxima,
+            pa.frecuencia_cardiaca_minima AS a_frecuencia_cardiaca_minima,
+            pa.id_entrenador AS a_id_entrenador,
+            pc.nombre_completo AS nombre_entrenador_perfil,
+            w.id_asignacion AS w_id_asignacion,
+            w.id_entrenamiento AS w_id_entrenamiento,
+            w.id_atleta AS w_id_atleta,
+            w.fecha_asignacion AS w_fecha_asignacion,
+            w.fecha_completado AS w_fecha_completado,
+            w.estado AS w_estado,
+            w.calificacion AS w_calificacion,
+            w.id_entrenador AS w_id_entrenador,
+            w.titulo AS w_titulo,
+            w.duracion_estimada AS w_duracion_estimada,
+            w.nivel_dificultad AS w_nivel_dificultad,
+            w.fecha_creacion AS w_fecha_creacion,
+            w.nombre_entrenador AS w_nombre_entrenador
+        FROM 
+            perfiles_atletas pa
+        LEFT JOIN 
+            perfiles_entrenadores pc ON pc.id_entrenador = pa.id_entrenador
+        LEFT JOIN (
+            SELECT 
+                aa.id_asignacion,
+                aa.id_entrenamiento,
+                aa.id_atleta,
+                aa.fecha_asignacion,
+                aa.fecha_completado,
+                aa.estado,
+                aa.calificacion,
+                e.id_entrenador,
+                e.titulo,
+                e.duracion_estimada,
+                e.nivel_dificultad,
+                e.fecha_creacion,
+                pe.nombre_completo AS nombre_entrenador
+            FROM 
+                asignaciones_atletas aa
+            JOIN 
+                entrenamientos e ON aa.id_entrenamiento = e.id_entrenamiento
+            JOIN 
+                perfiles_entrenadores pe ON e.id_entrenador = pe.id_entrenador
+            WHERE 
+                aa.id_atleta = (SELECT id_atleta FROM perfiles_atletas WHERE id_usuario = %s)
+            ORDER BY 
+                aa.fecha_asignacion DESC, aa.id_asignacion DESC
+            LIMIT %s
+        ) w ON w.id_atleta = pa.id_atleta
+        WHERE 
+            pa.id_usuario = %s
+        ORDER BY 
+            w.fecha_asignacion DESC, w.id_asignacion DESC
+        """
+
+    def __init__(
+        self,
+        profile: AthleteProfile,
+        coach_name: Optional[str],
+        assignments: List[WorkoutAssignment],
+        next_cursor: Optional[str] = None
+    ):
+        self.profile = profile
+        self.coach_name = coach_name
+        self.assignments = assignments
+        self.next_cursor = next_cursor
+
+    @classmethod
+    def load(
+        cls,
+        user_id: int,
+        limit: int = PAGE_SIZE,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['AthleteDashboardData']:
+        """
+        Carga el dashboard del usuario atleta con una sola consulta
+
+        Si el perfil ya está en el identity map se conserva ese objeto (con
+        las escrituras de la sesión) en lugar del leído.
+
+        Returns:
+            AthleteDashboardData o None si el usuario no tiene perfil de atleta
+        """
+        rows = DatabaseManager.fetch_rows(
+            cls.QUERY, (user_id, limit + 1, user_id), cache_ttl=CACHE_TTL, prepared=True
+        )
+        if not rows:
+            return None
+
+        profile = identity_map.get(AthleteProfile, ('user', user_id)) if identity_map is not None else None
+        if profile is None:
+            profile = AthleteProfile.from_rows(_prefixed(RowSet(rows[:1], rows.columns), "a_"))[0]
+            if identity_map is not None:
+                identity_map.add(profile, ('user', user_id))
+        coach_name = rows[0][rows.columns.index("nombre_entrenador_perfil")]
+
+        # Sin asignaciones el LEFT JOIN deja una única fila con w_* a NULL
+        assignment_id = rows.columns.index("w_id_asignacion")
+        assignment_rows = _prefixed(RowSet([r for r in rows if r[assignment_id] is not None], rows.columns), "w_")
+        assignments, next_cursor = _split_page(
+            WorkoutAssignment._assignments_from_rows(assignment_rows),
+            limit,
+            lambda a: (a.assignment_date, a.id)
+        )
+        return cls(profile, coach_name, assignments, next_cursor)
+
+
+class CoachDashboardData:
+    """
+    Datos del dashboard del entrenador en un único viaje a la base de datos
+
+    Perfil, primera página de atletas, primera página de entrenamientos (con
+    el contador de asignaciones) y los ejercicios de esos entrenamientos se
+    piden juntos con DatabaseManager.fetch_row_sets. Las sentencias localizan
+    al entrenador por id_usuario para no depender de una consulta previa.
+    """
+    __slots__ = ("profile", "athletes", "athletes_cursor", "workouts", "workouts_cursor")
+
+    _COACH = "(SELECT id_entrenador FROM perfiles_entrenadores WHERE id_usuario = %s)"
+    _PROFILE_QUERY = f"SELECT {CoachProfile.COLUMNS} FROM perfiles_entrenadores WHERE id_usuario = %s"
+    _ATHLETES_QUERY = CoachProfile._ATHLETES_QUERY.format(coach=_COACH, filters="", limit="LIMIT %s")
+    _WORKOUTS_QUERY = CoachProfile._CREATED_WORKOUTS_QUERY.format(coach=_COACH, filters="", limit="LIMIT %s")
+    # MySQL no admite LIMIT directamente en un IN (subconsulta): se envuelve
+    # en una tabla derivada
+    _EXERCISES_QUERY = Workout._EXERCISES_QUERY.format(ids=f"""
+            SELECT p.id_entrenamiento FROM (
+                SELECT e.id_entrenamiento FROM entrenamientos e
+                WHERE e.id_entrenador = {_COACH}
+                ORDER BY e.fecha_creacion DESC, e.id_entrenamiento DESC
+                LIMIT %s
+            ) p
+        """)
+
+    def __init__(
+        self,
+        profile: CoachProfile,
+        athletes: List[AthleteProfile],
+        workouts: List[Workout],
+        athletes_cursor: Optional[str] = None,
+        workouts_cursor: Optional[str] = None
+    ):
+        self.profile = profile
+        self.athletes = athletes
+        self.athletes_cursor = athletes_cursor
+        self.workouts = workouts
+        self.workouts_cursor = workouts_cursor
+
+    @classmethod
+    def load(
+        cls,
+        user_id: int,
+        limit: int = PAGE_SIZE,
+        identity_map: Optional[IdentityMap] = None
+    ) -> Optional['CoachDashboardData']:
+        """
+        Carga el dashboard del usuario entrenador con un solo viaje
+
+        Si el perfil ya está en el identity map se usa ese objeto y no se
+        consulta.
+
+        Returns:
+            CoachDashboardData o None si el usuario no tiene perfil de entrenador
+        """
+        # El perfil cargado en el login (identity map) no se vuelve a pedir
+        profile = identity_map.get(CoachProfile, ('user', user_id)) if identity_map is not None else None
+        statements = [
+            (cls._ATHLETES_QUERY, (user_id, limit + 1)),
+            (cls._WORKOUTS_QUERY, (user_id, limit + 1)),
+            (cls._EXERCISES_QUERY, (user_id, limit)),
+        ]
+        if profile is None:
+            statements.insert(0, (cls._PROFILE_QUERY, (user_id,)))
+        results = DatabaseManager.fetch_row_sets(statements)
+        athlete_rows, workout_rows, exercise_rows = results[-3:]
+
+        if profile is None:
+            if not results[0]:
+                return None
+            profile = CoachProfile.from_rows(results[0])[0]
+            if identity_map is not None:
+                identity_map.add(profile, ('user', user_id))
+
+        athletes, athletes_cursor = _split_page(
+            AthleteProfile.from_rows(athlete_rows), limit, lambda a: (a.id,)
+        )
+        workouts, workouts_cursor = _split_page(
+            Workout.from_rows(workout_rows), limit, lambda w: (w.creation_date, w.id)
+        )
+        columns = exercise_rows.columns
+        Workout._group_exercises(workouts, [dict(zip(columns, row)) for row in exercise_rows])
+        return cls(profile, athletes, workouts, athletes_cursor, workouts_cursor)
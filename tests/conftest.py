@@ -0,0 +1,30 @@
+import os
+import sys
+
+# Las pruebas usan el backend SQLite (fichero temporal en WAL) y bcrypt barato en el hilo
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("BCRYPT_WORKERS", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db():
+    """Base de datos SQLite nueva para cada prueba"""
+    DatabaseManager.initialize_pool()
+    yield DatabaseManager
+    DatabaseManager.close_pool()
+
+
+def statement_count() -> int:
+    """Sentencias ejecutadas desde el último reset_query_stats"""
+    return sum(entry["calls"] for entry in DatabaseManager.get_query_stats(None))
+
+
+def create_exercise(name: str) -> int:
+    """Inserta un ejercicio del catálogo y devuelve su id"""
+    with DatabaseManager.transaction() as tx:
+        return tx.insert("INSERT INTO ejercicios (nombre, tipo) VALUES (%s, %s)", (name, "fuerza"))
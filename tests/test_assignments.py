@@ -0,0 +1,72 @@
+from conftest import statement_count
+from models import User, CoachProfile, AthleteProfile
+
+
+def _coach_and_athletes(count):
+    coach = CoachProfile.get_by_user_id(User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01", "specialty": "running", "experience": ""
+    }))
+    athlete_ids = [
+        AthleteProfile.get_by_user_id(User.register(f"athlete{i}@example.com", "password1", "atleta", {
+            "full_name": f"Athlete {i}", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+            "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": None
+        })).id
+        for i in range(count)
+    ]
+    return coach, athlete_ids
+
+
+def _statuses(db, workout_id):
+    rows = db.execute_query(
+        "SELECT id_atleta, estado FROM asignaciones_atletas WHERE id_entrenamiento = %s ORDER BY id_atleta",
+        (workout_id,)
+    )
+    return {row["id_atleta"]: row["estado"] for row in rows}
+
+
+def test_reports_inserted_and_existing_athletes(db):
+    coach, athlete_ids = _coach_and_athletes(4)
+    workout = coach.create_workout("Intervals", "", 45, "avanzado")
+    workout.assign_to_athlete(athlete_ids[1])
+
+    result = workout.assign_to_athletes(athlete_ids + [athlete_ids[0]], chunk_size=3)
+
+    assert result == {"inserted": [athlete_ids[0], athlete_ids[2], athlete_ids[3]], "existing": [athlete_ids[1]]}
+    assert workout.assign_to_athletes(athlete_ids) == {"inserted": [], "existing": athlete_ids}
+    assert sorted(_statuses(db, workout.id)) == athlete_ids
+    assert workout.assignment_count == 4
+
+
+def test_reassigning_resets_status_to_pending(db):
+    coach, athlete_ids = _coach_and_athletes(2)
+    workout = coach.create_workout("Intervals", "", 45, "avanzado")
+    workout.assign_to_athletes(athlete_ids)
+    db.execute_query(
+        "UPDATE asignaciones_atletas SET estado = 'completado' WHERE id_atleta = %s",
+        (athlete_ids[0],), commit=True
+    )
+
+    workout.assign_to_athletes(athlete_ids[:1])
+
+    assert _statuses(db, workout.id) == {athlete_ids[0]: "pendiente", athlete_ids[1]: "pendiente"}
+
+
+def test_batch_is_a_fixed_number_of_statements(db):
+    coach, athlete_ids = _coach_and_athletes(6)
+    workout = coach.create_workout("Intervals", "", 45, "avanzado")
+    db.reset_query_stats()
+
+    workout.assign_to_athletes(athlete_ids[:1])
+    single = statement_count()
+    db.reset_query_stats()
+    workout.assign_to_athletes(athlete_ids[1:])
+
+    assert statement_count() == single
+
+
+def test_empty_list_assigns_nothing(db):
+    coach, _ = _coach_and_athletes(0)
+    workout = coach.create_workout("Intervals", "", 45, "avanzado")
+
+    assert workout.assign_to_athletes([]) == {"inserted": [], "existing": []}
+    assert workout.assignment_count == 0
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from async_models import AsyncAthleteDashboardData, AsyncCoachProfile, load_deferred
+from models import User
+
+
+def _register(coach_experience="10 years"):
+    coach_user = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01",
+        "specialty": "running", "experience": coach_experience
+    })
+    athlete_user = User.register("athlete@example.com", "password1", "atleta", {
+        "full_name": "Athlete", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+        "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": None
+    })
+    return coach_user, athlete_user
+
+
+def test_deferred_columns_are_loaded_in_the_executor(db):
+    coach_user, _ = _register()
+
+    async def scenario():
+        profile = await AsyncCoachProfile.get_by_user_id(coach_user)
+        with pytest.raises(AttributeError, match="await obj.load"):
+            profile.experience
+        assert await profile.load("experience") == "10 years"
+        assert profile.experience == "10 years"
+
+    asyncio.run(scenario())
+
+
+def test_page_and_dashboard_wrappers(db):
+    coach_user, athlete_user = _register()
+
+    async def scenario():
+        coach = await AsyncCoachProfile.get_by_user_id(coach_user)
+        for i in range(3):
+            await coach.create_workout(f"Workout {i}", "Long description", 30, "intermedio")
+        workouts, cursor = await coach.get_created_workouts_page(limit=2)
+        assert [w.title for w in workouts] == ["Workout 2", "Workout 1"]
+        rest, cursor = await coach.get_created_workouts_page(limit=2, cursor=cursor)
+        assert [w.title for w in rest] == ["Workout 0"] and cursor is None
+
+        await load_deferred(workouts)
+        assert workouts[0].description == "Long description"
+
+        athletes, cursor = await coach.get_assigned_athletes_page()
+        assert athletes == [] and cursor is None
+
+        data = await AsyncAthleteDashboardData.load(athlete_user)
+        assert data.profile.user_id == athlete_user
+        assert data.assignments == []
+
+    asyncio.run(scenario())
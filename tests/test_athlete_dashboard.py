@@ -0,0 +1,61 @@
+import pytest
+from conftest import statement_count
+from models import User, CoachProfile, AthleteDashboardData, PAGE_SIZE
+
+
+def _register_coach():
+    user_id = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01",
+        "specialty": "running", "experience": "10 years"
+    })
+    return CoachProfile.get_by_user_id(user_id)
+
+
+def _register_athlete(coach_id=None):
+    return User.register("athlete@example.com", "password1", "atleta", {
+        "full_name": "Athlete", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+        "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": coach_id
+    })
+
+
+def test_dashboard_without_assignments_is_one_statement(db):
+    user_id = _register_athlete()
+
+    db.reset_query_stats()
+    data = AthleteDashboardData.load(user_id)
+
+    assert statement_count() == 1
+    assert data.profile.user_id == user_id
+    assert data.coach_name is None
+    assert data.assignments == []
+    assert data.next_cursor is None
+
+
+@pytest.mark.parametrize("limit", [3, PAGE_SIZE])
+def test_dashboard_with_more_than_a_page_is_one_statement(db, limit):
+    coach = _register_coach()
+    user_id = _register_athlete(coach.id)
+    athlete_id = db.execute_query(
+        "SELECT id_atleta FROM perfiles_atletas WHERE id_usuario = %s", (user_id,), fetch_one=True
+    )["id_atleta"]
+    for i in range(limit + 2):
+        coach.create_workout(f"Workout {i}", "", 30, "intermedio").assign_to_athlete(athlete_id)
+
+    db.reset_query_stats()
+    data = AthleteDashboardData.load(user_id, limit=limit)
+
+    assert statement_count() == 1
+    assert data.coach_name == "Coach"
+    assert len(data.assignments) == limit
+    assert data.assignments[0].workout.title == f"Workout {limit + 1}"
+    assert data.next_cursor is not None
+
+    rest, next_cursor = data.profile.get_workouts_page(limit=limit, cursor=data.next_cursor)
+    assert [a.workout.title for a in rest] == ["Workout 1", "Workout 0"]
+    assert next_cursor is None
+
+
+def test_dashboard_for_non_athlete_is_none(db):
+    coach = _register_coach()
+
+    assert AthleteDashboardData.load(coach.user_id) is None
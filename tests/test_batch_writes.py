@@ -0,0 +1,38 @@
+import pytest
+from mysql.connector.errors import IntegrityError
+
+from conftest import statement_count
+
+INSERT_EXERCISE = "INSERT INTO ejercicios (nombre, tipo) VALUES (%s, %s)"
+INSERT_USER = "INSERT INTO usuarios (email, contrasena_hash, tipo) VALUES (%s, %s, %s)"
+
+
+def _count(db, table):
+    return db.execute_query(f"SELECT COUNT(*) AS n FROM {table}", fetch_one=True)["n"]
+
+
+def test_rows_are_sent_in_chunks_with_one_commit(db):
+    rows = [(f"Exercise {i}", "fuerza") for i in range(7)]
+
+    db.reset_query_stats()
+    result = db.execute_many(INSERT_EXERCISE, rows, chunk_size=3)
+
+    assert result == {"rows": 7, "affected": 7, "chunks": [3, 3, 1]}
+    assert statement_count() == 1
+    assert _count(db, "ejercicios") == 7
+
+
+def test_empty_batch_does_nothing(db):
+    db.reset_query_stats()
+    assert db.execute_many(INSERT_EXERCISE, []) == {"rows": 0, "affected": 0, "chunks": []}
+    assert statement_count() == 0
+
+
+def test_failing_chunk_rolls_back_the_whole_batch(db):
+    rows = [("a@example.com", "x", "atleta"), ("b@example.com", "x", "atleta"), ("a@example.com", "x", "atleta")]
+
+    with pytest.raises(IntegrityError):
+        db.execute_many(INSERT_USER, rows, chunk_size=2)
+
+    assert _count(db, "usuarios") == 0
+    assert db.get_pool_stats()["checked_out"] == 0
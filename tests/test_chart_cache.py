@@ -0,0 +1,36 @@
+import base64
+import os
+
+from utils import ChartCache
+
+IMAGE = base64.b64encode(b"\x89PNG fake").decode("utf-8")
+
+
+def test_memory_and_disk_levels(tmp_path):
+    cache = ChartCache(str(tmp_path), max_entries=1)
+    key, other = ChartCache.key("hr_zones", 1, 50), ChartCache.key("hr_zones", 1, 60)
+
+    assert cache.get(key) is None
+    cache.put(key, IMAGE)
+    cache.put(other, IMAGE)  # desaloja `key` de la memoria
+    assert cache.get(other) == IMAGE
+    assert cache.get(key) == IMAGE
+
+    # Otro proceso (caché nueva) lo encuentra en disco
+    assert ChartCache(str(tmp_path)).get(key) == IMAGE
+    assert cache.stats() == {"hits": 1, "disk_hits": 1, "misses": 1, "size": 1}
+    assert sorted(os.listdir(tmp_path)) == sorted([f"{key}.png", f"{other}.png"])
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    cache = ChartCache(str(tmp_path))
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    cache.put(ChartCache.key("a"), IMAGE)
+    cache.put(ChartCache.key("b"), "not base64!")
+
+    assert os.listdir(tmp_path) == []
+    assert cache.get(ChartCache.key("a")) == IMAGE  # sigue en memoria
@@ -0,0 +1,81 @@
+import migrations
+from conftest import create_exercise, statement_count
+from models import User, CoachProfile, AthleteProfile, CoachDashboardData, IdentityMap, Workout
+
+
+def _coach():
+    user_id = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01", "specialty": "running", "experience": ""
+    })
+    return CoachProfile.get_by_user_id(user_id)
+
+
+def _athletes(coach_id, count):
+    return [
+        AthleteProfile.get_by_user_id(User.register(f"athlete{i}@example.com", "password1", "atleta", {
+            "full_name": f"Athlete {i}", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+            "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": coach_id
+        })).id
+        for i in range(count)
+    ]
+
+
+def test_assignment_counter_counts_new_assignments_only(db):
+    coach = _coach()
+    athlete_ids = _athletes(coach.id, 3)
+    workout = coach.create_workout("Intervals", "", 45, "avanzado")
+
+    workout.assign_to_athlete(athlete_ids[0])
+    workout.assign_to_athletes(athlete_ids)
+    workout.assign_to_athlete(athlete_ids[1])
+
+    assert workout.assignment_count == 3
+    assert Workout.get_by_id(workout.id).assignment_count == 3
+
+
+def test_backfill_migration_recomputes_the_counter(db):
+    coach = _coach()
+    athlete_ids = _athletes(coach.id, 2)
+    workout = coach.create_workout("Intervals", "", 45, "avanzado")
+    workout.assign_to_athletes(athlete_ids)
+    db.execute_query("UPDATE entrenamientos SET asignaciones = 0", commit=True)
+
+    migrations.migrate()
+
+    assert Workout.get_by_id(workout.id).assignment_count == 2
+
+
+def test_dashboard_loads_profile_pages_and_exercises_together(db):
+    coach = _coach()
+    athlete_ids = _athletes(coach.id, 3)
+    workouts = [coach.create_workout(f"Workout {i}", "", 30, "intermedio") for i in range(3)]
+    workouts[2].set_exercises([{"exercise_id": create_exercise("Squat"), "sets": 3}])
+    workouts[2].assign_to_athletes(athlete_ids[:2])
+
+    db.reset_query_stats()
+    data = CoachDashboardData.load(coach.user_id, limit=2)
+
+    assert statement_count() == 1
+    assert data.profile.id == coach.id
+    assert [a.id for a in data.athletes] == athlete_ids[:2]
+    assert data.athletes_cursor is not None
+    assert [w.title for w in data.workouts] == ["Workout 2", "Workout 1"]
+    assert [w.assignment_count for w in data.workouts] == [2, 0]
+    assert [e["nombre_ejercicio"] for e in data.workouts[0].exercises] == ["Squat"]
+    assert data.workouts_cursor is not None
+
+    identity_map = IdentityMap()
+    identity_map.add(data.profile, ("user", coach.user_id))
+    db.reset_query_stats()
+    assert CoachDashboardData.load(coach.user_id, limit=2, identity_map=identity_map).profile is data.profile
+    assert statement_count() == 1
+
+
+def test_dashboard_for_non_coach_is_none(db):
+    coach = _coach()
+    user_id = User.register("athlete@example.com", "password1", "atleta", {
+        "full_name": "Athlete", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+        "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": coach.id
+    })
+
+    assert CoachDashboardData.load(user_id) is None
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+from mysql.connector.errors import PoolError
+
+from backends import SQLiteBackend
+from database import ElasticConnectionPool
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend()
+    yield backend
+    backend.close()
+
+
+def test_grows_to_max_size_then_times_out(backend):
+    pool = ElasticConnectionPool(min_size=1, max_size=2, timeout=0.05, backend=backend)
+    assert pool.stats()["size"] == 1
+
+    first, second = pool.get_connection(), pool.get_connection()
+    assert pool.stats()["size"] == 2 and pool.stats()["checked_out"] == 2
+    with pytest.raises(PoolError):
+        pool.get_connection()
+    assert pool.stats()["timeouts"] == 1
+
+    first.close()
+    second.close()
+    assert pool.stats()["idle"] == 2 and pool.stats()["checked_out"] == 0
+    pool.close_all()
+
+
+def test_waiter_gets_the_released_connection(backend):
+    pool = ElasticConnectionPool(min_size=0, max_size=1, timeout=5, backend=backend)
+    held = pool.get_connection()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.get_connection()))
+    waiter.start()
+    while pool.stats()["waiting"] == 0:
+        time.sleep(0.001)
+
+    held.close()
+    waiter.join()
+    assert len(got) == 1 and pool.stats()["size"] == 1
+    got[0].close()
+    pool.close_all()
+
+
+def test_idle_connections_shrink_back_to_min_size(backend):
+    pool = ElasticConnectionPool(min_size=1, max_size=3, max_idle_time=0, backend=backend)
+    connections = [pool.get_connection() for _ in range(3)]
+    for connection in connections:
+        connection.close()
+    assert pool.stats()["size"] == 1 and pool.stats()["idle"] == 1
+    pool.close_all()
+
+
+def test_stale_connection_is_replaced(backend):
+    pool = ElasticConnectionPool(min_size=1, max_size=1, validate_after=0, backend=backend)
+    stale, _ = pool._idle[0]
+    stale._cnx.close()
+
+    connection = pool.get_connection()
+    assert connection.is_connected()
+    assert pool.stats()["size"] == 1
+    connection.close()
+    pool.close_all()
+
+
+def test_closed_pool_and_invalid_bounds(backend):
+    with pytest.raises(ValueError):
+        ElasticConnectionPool(min_size=3, max_size=2, backend=backend)
+    pool = ElasticConnectionPool(min_size=0, max_size=1, backend=backend)
+    pool.close_all()
+    with pytest.raises(PoolError):
+        pool.get_connection()
+
+
+def test_manager_reports_pool_stats(db):
+    with db.get_connection():
+        assert db.get_pool_stats()["checked_out"] == 1
+    assert db.get_pool_stats()["checked_out"] == 0
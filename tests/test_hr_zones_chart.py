@@ -0,0 +1,30 @@
+import pytest
+
+ft = pytest.importorskip("flet")
+
+from utils import calculate_hr_zones
+from views.athlete import _create_hr_zones_chart
+
+
+def test_native_chart_marks_resting_hr_on_every_zone():
+    zones = calculate_hr_zones(190, 50)
+
+    chart = _create_hr_zones_chart(zones, 50, width=600)
+
+    rows = chart.controls[1:6]
+    assert [row.controls[0].value for row in rows] == list(zones)[:-1]
+    for row in rows:
+        background, band, marker = row.controls[1].controls
+        assert marker.left == 0 and marker.bgcolor == "gray"
+        assert band.left > marker.left
+    assert chart.controls[-2].controls[1].value == "50 bpm"
+    assert chart.controls[-1].controls[-1].value == "Resting HR (50 bpm)"
+
+
+def test_marker_stays_inside_the_bar():
+    zones = calculate_hr_zones(190, 50)
+
+    chart = _create_hr_zones_chart(zones, 250, width=600)
+
+    for row in chart.controls[1:6]:
+        assert row.controls[1].controls[-1].left == row.controls[1].width - 2
@@ -0,0 +1,97 @@
+from conftest import create_exercise
+from models import User, CoachProfile, IdentityMap, Workout, WorkoutAssignment
+
+
+def _coach_and_athlete():
+    coach_user = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01",
+        "specialty": "running", "experience": "10 years"
+    })
+    coach = CoachProfile.get_by_user_id(coach_user)
+    athlete_user = User.register("athlete@example.com", "password1", "atleta", {
+        "full_name": "Athlete", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+        "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": coach.id
+    })
+    return coach, athlete_user
+
+
+def _athlete_id(db, user_id):
+    return db.execute_query(
+        "SELECT id_atleta FROM perfiles_atletas WHERE id_usuario = %s", (user_id,), fetch_one=True
+    )["id_atleta"]
+
+
+def test_workout_writes_discard_the_cached_workout(db):
+    coach, athlete_user = _coach_and_athlete()
+    workout_id = coach.create_workout("Intervals", "", 30, "intermedio").id
+    identity_map = IdentityMap()
+    cached = Workout.get_by_id(workout_id, identity_map)
+
+    # Otra copia del mismo entrenamiento, como la de una página de resultados
+    other = Workout.get_by_id(workout_id)
+    assert other.assign_to_athlete(_athlete_id(db, athlete_user), identity_map)
+    assert identity_map.get(Workout, workout_id) is None
+
+    reloaded = Workout.get_by_id(workout_id, identity_map)
+    assert reloaded is not cached
+    assert reloaded.assignment_count == 1
+
+    assert other.set_exercises([], identity_map=identity_map) is not None
+    assert identity_map.get(Workout, workout_id) is None
+
+
+def test_assignment_writes_discard_the_cached_assignment(db):
+    coach, athlete_user = _coach_and_athlete()
+    workout = coach.create_workout("Intervals", "", 30, "intermedio")
+    workout.assign_to_athlete(_athlete_id(db, athlete_user))
+    assignment_id = db.execute_query(
+        "SELECT id_asignacion FROM asignaciones_atletas WHERE id_entrenamiento = %s",
+        (workout.id,), fetch_one=True
+    )["id_asignacion"]
+    identity_map = IdentityMap()
+    WorkoutAssignment.get_by_id(assignment_id, identity_map)
+
+    assert WorkoutAssignment.get_by_id(assignment_id).update_status("completado", identity_map)
+    assert identity_map.get(WorkoutAssignment, assignment_id) is None
+    assert WorkoutAssignment.get_by_id(assignment_id, identity_map).status == "completado"
+
+    assert WorkoutAssignment.get_by_id(assignment_id).complete("Good", 5, identity_map)
+    assert identity_map.get(WorkoutAssignment, assignment_id) is None
+    assert WorkoutAssignment.get_by_id(assignment_id, identity_map).rating == 5
+
+
+def test_workouts_loaded_without_exercises_stay_out_of_the_map(db):
+    coach, _ = _coach_and_athlete()
+    workout = coach.create_workout("Intervals", "", 30, "intermedio")
+    exercise_id = create_exercise("Sprint")
+    workout.set_exercises([{"exercise_id": exercise_id, "sets": 4}])
+    identity_map = IdentityMap()
+
+    headers = Workout.get_many([workout.id], with_exercises=False, identity_map=identity_map)
+    assert headers[0].exercises == []
+    assert identity_map.get(Workout, workout.id) is None
+
+    full = Workout.get_by_id(workout.id, identity_map)
+    assert [e["id_ejercicio"] for e in full.exercises] == [exercise_id]
+    assert Workout.get_many([workout.id], with_exercises=False, identity_map=identity_map)[0] is full
+
+
+def test_workout_update_discards_the_cached_workout_and_cache_entries(db):
+    coach, _ = _coach_and_athlete()
+    workout_id = coach.create_workout("Intervals", "", 30, "intermedio").id
+    identity_map = IdentityMap()
+    db.enable_cache(16)
+    try:
+        title_query = "SELECT titulo FROM entrenamientos WHERE id_entrenamiento = %s"
+        db.execute_query(title_query, (workout_id,), fetch_one=True, cache_ttl=60)
+        cached = Workout.get_by_id(workout_id, identity_map)
+
+        assert Workout.get_by_id(workout_id).update(title="Tempo", identity_map=identity_map)
+
+        assert identity_map.get(Workout, workout_id) is None
+        reloaded = Workout.get_by_id(workout_id, identity_map)
+        assert reloaded is not cached
+        assert (reloaded.title, reloaded.estimated_duration, reloaded.difficulty) == ("Tempo", 30, "intermedio")
+        assert db.execute_query(title_query, (workout_id,), fetch_one=True, cache_ttl=60)["titulo"] == "Tempo"
+    finally:
+        db.disable_cache()
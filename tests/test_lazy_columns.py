@@ -0,0 +1,41 @@
+from conftest import statement_count
+from database import DatabaseManager
+from models import Exercise
+
+
+def _create_exercises(count):
+    with DatabaseManager.transaction() as tx:
+        for i in range(count):
+            tx.insert(
+                "INSERT INTO ejercicios (nombre, descripcion, tipo, instrucciones) VALUES (%s, %s, %s, %s)",
+                (f"Exercise {i}", f"Description {i}", "fuerza", f"Instructions {i}")
+            )
+
+
+def test_listing_defers_text_columns_and_loads_them_in_one_query(db):
+    _create_exercises(5)
+    db.reset_query_stats()
+
+    exercises = Exercise.get_all()
+    assert statement_count() == 1
+
+    assert exercises[2].description == "Description 2"
+    assert statement_count() == 2
+    assert [e.instructions for e in exercises] == [f"Instructions {i}" for i in range(5)]
+    assert statement_count() == 2
+
+
+def test_single_object_and_assigned_value_need_no_extra_query(db):
+    _create_exercises(1)
+    exercise = Exercise.get_all()[0]
+    exercise.description = "Edited"
+    db.reset_query_stats()
+
+    assert exercise.description == "Edited"
+    assert statement_count() == 0
+
+    single = Exercise.get_by_id(exercise.id)
+    Exercise.load_deferred([single])
+    db.reset_query_stats()
+    assert (single.description, single.instructions) == ("Description 0", "Instructions 0")
+    assert statement_count() == 0
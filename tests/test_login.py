@@ -0,0 +1,56 @@
+from conftest import statement_count
+from models import User, AthleteProfile, CoachProfile, IdentityMap
+
+
+def _register():
+    coach_user = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01", "specialty": "running", "experience": ""
+    })
+    athlete_user = User.register("athlete@example.com", "password1", "atleta", {
+        "full_name": "Athlete", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+        "sport": "running", "max_hr": 190, "resting_hr": 50,
+        "coach_id": CoachProfile.get_by_user_id(coach_user).id
+    })
+    return coach_user, athlete_user
+
+
+def test_login_loads_user_and_profile_in_one_statement(db):
+    coach_user, athlete_user = _register()
+    db.reset_query_stats()
+
+    user, profile = User.login("athlete@example.com", "password1")
+    assert statement_count() == 1
+    assert user.id == athlete_user
+    assert isinstance(profile, AthleteProfile) and profile.user_id == athlete_user
+
+    user, profile = User.login("coach@example.com", "password1")
+    assert isinstance(profile, CoachProfile) and profile.user_id == coach_user
+
+
+def test_invalid_credentials_return_none(db):
+    _register()
+
+    assert User.login("athlete@example.com", "wrong") is None
+    assert User.login("nobody@example.com", "password1") is None
+
+
+def test_login_fills_the_identity_map(db):
+    _, athlete_user = _register()
+    identity_map = IdentityMap()
+
+    user, profile = User.login("athlete@example.com", "password1", identity_map=identity_map)
+
+    assert User.get_by_id(athlete_user, identity_map=identity_map) is user
+    assert AthleteProfile.get_by_user_id(athlete_user, identity_map=identity_map) is profile
+
+
+def test_last_login_is_written_behind(db, monkeypatch):
+    # Sin vaciado periódico durante la prueba
+    monkeypatch.setenv("DB_WRITE_BEHIND_INTERVAL", "60")
+    _, athlete_user = _register()
+
+    user, _ = User.login("athlete@example.com", "password1")
+    assert User.get_by_id(athlete_user).last_login is None
+
+    assert db.flush_writes() == 1
+    assert str(User.get_by_id(athlete_user).last_login).startswith(str(user.last_login)[:19])
@@ -0,0 +1,13 @@
+import migrations
+
+
+def test_migrate_is_resumable_and_idempotent(db):
+    assert migrations.migrate(target=1) == [1]
+    assert migrations.migrate() == [2, 3]
+    assert migrations.migrate() == []
+    assert migrations.applied_versions() == [1, 2, 3]
+
+
+def test_hot_queries_use_indexes(db):
+    migrations.migrate()
+    assert migrations.check_query_plans() == {}
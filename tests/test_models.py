@@ -0,0 +1,32 @@
+import pytest
+from database import RowSet
+from models import Exercise, User, WorkoutAssignment, _lazy_values
+
+
+def test_models_are_slotted():
+    user = User(1, "a@example.com", "atleta", None, None, True)
+    assert not hasattr(user, "__dict__")
+    with pytest.raises(AttributeError):
+        user.nickname = "x"
+
+
+def test_from_rows_matches_columns_by_name():
+    rows = RowSet(
+        [("http://video", "Squat", 7, "fuerza"), (None, "Lunge", 8, "fuerza")],
+        ("video_url", "nombre", "id_ejercicio", "tipo")
+    )
+    exercises = Exercise.from_rows(rows)
+
+    assert [(e.id, e.name, e.type, e.video_url) for e in exercises] == [
+        (7, "Squat", "fuerza", "http://video"), (8, "Lunge", "fuerza", None)
+    ]
+    assert exercises[0].from_row(dict(zip(rows.columns, rows[0]))).name == "Squat"
+
+
+def test_missing_columns_are_none_or_deferred():
+    rows = RowSet([(3, 4, 5, "pendiente")], ("id_asignacion", "id_atleta", "id_entrenamiento", "estado"))
+    assignment = WorkoutAssignment.from_rows(rows)[0]
+
+    assert assignment.rating is None
+    assert assignment.workout is None
+    assert "feedback" not in _lazy_values(assignment)
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+
+import pytest
+from models import User, CoachProfile, AthleteProfile, encode_page_cursor, decode_page_cursor
+
+
+def _coach():
+    user_id = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01", "specialty": "running", "experience": ""
+    })
+    return CoachProfile.get_by_user_id(user_id)
+
+
+def _athlete(i, coach_id):
+    user_id = User.register(f"athlete{i}@example.com", "password1", "atleta", {
+        "full_name": f"Athlete {i}", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+        "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": coach_id
+    })
+    return AthleteProfile.get_by_user_id(user_id)
+
+
+def _walk(fetch_page, limit):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = fetch_page(limit=limit, cursor=cursor)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip_and_invalid_token():
+    key = (datetime(2024, 5, 1, 8, 30), date(2024, 5, 1), 42)
+    assert decode_page_cursor(encode_page_cursor(*key)) == list(key)
+    with pytest.raises(ValueError):
+        decode_page_cursor("not a cursor")
+
+
+def test_workouts_page_walks_ties_without_gaps(db):
+    coach = _coach()
+    athlete = _athlete(0, coach.id)
+    workouts = [coach.create_workout(f"Workout {i}", "", 30, "intermedio") for i in range(7)]
+    # Asignadas en el mismo segundo: el id desempata la clave
+    workouts[0].assign_to_athletes([athlete.id])
+    for workout in workouts[1:]:
+        workout.assign_to_athlete(athlete.id)
+
+    pages = _walk(athlete.get_workouts_page, 3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    titles = [a.workout.title for page in pages for a in page]
+    assert titles == [f"Workout {i}" for i in reversed(range(7))]
+
+
+def test_workouts_page_with_status_filter(db):
+    coach = _coach()
+    athlete = _athlete(0, coach.id)
+    for i in range(4):
+        coach.create_workout(f"Workout {i}", "", 30, "intermedio").assign_to_athlete(athlete.id)
+    first, _ = athlete.get_workouts_page(limit=4)
+    first[0].update_status("completado")
+
+    pending, cursor = athlete.get_workouts_page(limit=2, status="pendiente")
+    rest, last = athlete.get_workouts_page(limit=2, cursor=cursor, status="pendiente")
+    assert [a.workout.title for a in pending + rest] == ["Workout 2", "Workout 1", "Workout 0"]
+    assert last is None
+
+
+def test_roster_and_created_workouts_pages(db):
+    coach = _coach()
+    athletes = [_athlete(i, coach.id) for i in range(5)]
+    _athlete(99, None)
+    for i in range(3):
+        coach.create_workout(f"Workout {i}", "", 30, "intermedio")
+
+    roster = _walk(coach.get_assigned_athletes_page, 2)
+    assert [[a.id for a in page] for page in roster] == [
+        [athletes[0].id, athletes[1].id], [athletes[2].id, athletes[3].id], [athletes[4].id]
+    ]
+    created = _walk(coach.get_created_workouts_page, 2)
+    assert [[w.title for w in page] for page in created] == [["Workout 2", "Workout 1"], ["Workout 0"]]
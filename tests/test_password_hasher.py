@@ -0,0 +1,14 @@
+from database import DatabaseManager, PasswordHasher
+
+
+def test_hashing_pool_does_not_fork_and_stops_on_close_pool(db, monkeypatch):
+    hasher = PasswordHasher(rounds=4, workers=1)
+    monkeypatch.setattr(DatabaseManager, "_password_hasher", hasher)
+
+    hashed = DatabaseManager.hash_password("secret")
+    assert DatabaseManager.verify_password(hashed, "secret")
+    assert not DatabaseManager.verify_password(hashed, "other")
+    assert hasher._executor._mp_context.get_start_method() != "fork"
+
+    DatabaseManager.close_pool()
+    assert hasher._executor is None
@@ -0,0 +1,59 @@
+import pytest
+from mysql.connector.errors import Error
+
+from backends import SQLiteBackend
+from database import DatabaseManager, PreparedStatementCache
+
+
+class CountingConnection:
+    """Conexión SQLite que cuenta los cursores preparados creados"""
+
+    def __init__(self, cnx):
+        self._cnx = cnx
+        self.prepared = 0
+
+    def cursor(self, prepared=None, dictionary=None):
+        self.prepared += bool(prepared)
+        return self._cnx.cursor(prepared=prepared, dictionary=dictionary)
+
+
+@pytest.fixture
+def connection():
+    backend = SQLiteBackend()
+    cnx = backend.connect()
+    yield CountingConnection(cnx)
+    cnx.close()
+    backend.close()
+
+
+def test_cursor_is_reused_and_evicted_lru(connection):
+    statements = PreparedStatementCache(connection, max_size=2)
+
+    for value in (1, 2, 3):
+        assert statements.execute("SELECT %s AS v", (value,)).fetchall() == [{"v": value}]
+    assert connection.prepared == 1
+
+    statements.execute("SELECT %s + 1 AS v", (1,)).fetchall()
+    statements.execute("SELECT %s + 2 AS v", (1,)).fetchall()  # expulsa "SELECT %s AS v"
+    assert len(statements) == 2
+    statements.execute("SELECT %s AS v", (1,)).fetchall()
+    assert connection.prepared == 4
+
+
+def test_failing_statement_is_evicted(connection):
+    statements = PreparedStatementCache(connection)
+    with pytest.raises(Error):
+        statements.execute("SELECT * FROM missing_table")
+    assert len(statements) == 0
+
+
+def test_manager_keeps_statements_across_borrows(monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "_prepared_statements", True)
+    DatabaseManager.initialize_pool(min_size=1, max_size=1)
+    try:
+        query = "SELECT COUNT(*) AS n FROM usuarios WHERE activo = %s"
+        for _ in range(3):
+            assert DatabaseManager.execute_query(query, (1,), fetch_one=True, prepared=True) == {"n": 0}
+        assert DatabaseManager.get_pool_stats()["prepared_statements"] == 1
+    finally:
+        DatabaseManager.close_pool()
@@ -0,0 +1,54 @@
+import pytest
+from models import User
+
+EMAIL_QUERY = "SELECT email FROM usuarios WHERE id_usuario = %s"
+
+
+@pytest.fixture
+def cache(db):
+    db.enable_cache(16)
+    yield db
+    db.disable_cache()
+
+
+def _register():
+    return User.register("athlete@example.com", "password1", "atleta", {
+        "full_name": "Athlete", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+        "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": None
+    })
+
+
+def _email(db, user_id):
+    return db.execute_query(EMAIL_QUERY, (user_id,), fetch_one=True, cache_ttl=60)["email"]
+
+
+def test_hit_miss_and_invalidation_on_write(cache):
+    user_id = _register()
+
+    assert _email(cache, user_id) == "athlete@example.com"
+    assert _email(cache, user_id) == "athlete@example.com"
+    assert cache.get_cache_stats()["misses"] == 1
+    assert cache.get_cache_stats()["hits"] == 1
+
+    cache.execute_query(
+        "UPDATE usuarios SET email = %s WHERE id_usuario = %s", ("new@example.com", user_id), commit=True
+    )
+    assert cache.get_cache_stats()["invalidations"] == 1
+    assert _email(cache, user_id) == "new@example.com"
+
+
+def test_transaction_write_invalidates_on_commit(cache):
+    user_id = _register()
+    _email(cache, user_id)
+
+    conn = cache.start_transaction()
+    cache.execute_query(
+        "UPDATE usuarios SET email = %s WHERE id_usuario = %s", ("new@example.com", user_id), conn=conn
+    )
+    # Sin commit la entrada sigue siendo válida: no se invalida todavía
+    assert cache.get_cache_stats()["invalidations"] == 0
+    assert _email(cache, user_id) == "athlete@example.com"
+
+    cache.commit_transaction(conn)
+    assert cache.get_cache_stats()["invalidations"] == 1
+    assert _email(cache, user_id) == "new@example.com"
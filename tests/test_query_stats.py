@@ -0,0 +1,45 @@
+import logging
+
+from database import QueryStats
+
+
+def test_literals_share_a_fingerprint():
+    first, normalized = QueryStats.fingerprint("SELECT * FROM usuarios WHERE id_usuario = 1 AND email = 'a'")
+    second, _ = QueryStats.fingerprint("SELECT *  FROM usuarios\n WHERE id_usuario = 22 AND email = 'b'")
+    assert first == second
+    assert normalized == "SELECT * FROM usuarios WHERE id_usuario = ? AND email = ?"
+
+
+def test_records_calls_rows_and_histogram():
+    stats = QueryStats(slow_query_ms=10_000)
+    stats.record("SELECT 1", 0.002, rows=3, wait=0.001)
+    stats.record("SELECT 2", 0.030, rows=1)
+
+    (entry,) = stats.snapshot()
+    assert entry["calls"] == 2 and entry["rows"] == 4
+    assert entry["max_ms"] == 30.0
+    assert entry["avg_ms"] == 16.0
+    assert entry["wait_ms"] == 1.0
+    assert entry["histogram"]["<=5ms"] == 1 and entry["histogram"]["<=50ms"] == 1
+
+
+def test_slow_queries_are_logged_without_parameter_values(caplog):
+    stats = QueryStats(slow_query_ms=100)
+    with caplog.at_level(logging.WARNING, logger="database.slow"):
+        stats.record("SELECT * FROM usuarios WHERE email = %s", 0.05, params=("fast@example.com",))
+        stats.record("SELECT * FROM usuarios WHERE email = %s", 0.25, params=("secret@example.com",))
+
+    (record,) = caplog.records
+    assert "250.0 ms" in record.getMessage()
+    assert "params=(str)" in record.getMessage()
+    assert "secret@example.com" not in record.getMessage()
+
+
+def test_manager_records_each_statement(db):
+    db.reset_query_stats()
+    for user_id in (1, 2, 3):
+        db.execute_query("SELECT * FROM usuarios WHERE id_usuario = %s", (user_id,), fetch_one=True)
+
+    (entry,) = db.get_query_stats()
+    assert entry["calls"] == 3
+    assert entry["query"] == "SELECT * FROM usuarios WHERE id_usuario = %s"
@@ -0,0 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _in_session(db, session_key, func):
+    with db.session_scope(session_key):
+        return func()
+
+
+def test_session_does_not_leak_to_the_next_handler_on_the_thread(db, monkeypatch):
+    # _mark_write solo registra escrituras si hay réplicas configuradas
+    monkeypatch.setattr(db, "_replica_pools", [object()])
+    monkeypatch.setattr(db, "_last_write", {})
+
+    # Un solo hilo, como el pool de manejadores de Flet compartido entre sesiones
+    with ThreadPoolExecutor(max_workers=1) as handlers:
+        handlers.submit(_in_session, db, "A", db._mark_write).result()
+
+        assert not handlers.submit(db._recently_wrote).result()
+        assert handlers.submit(db._current_session).result() != "A"
+        assert not handlers.submit(_in_session, db, "B", db._recently_wrote).result()
+        assert handlers.submit(_in_session, db, "A", db._recently_wrote).result()
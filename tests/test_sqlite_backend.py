@@ -0,0 +1,59 @@
+import threading
+
+from backends import translate_to_sqlite
+from models import User, CoachProfile
+
+
+def test_translation_skips_string_literals():
+    query = (
+        "SELECT * FROM t WHERE a LIKE '%s%' AND b = %s AND c <> 'NOW()' "
+        "AND d = \"VALUES(x)\" AND e < NOW()"
+    )
+    assert translate_to_sqlite(query) == (
+        "SELECT * FROM t WHERE a LIKE '%s%' AND b = ? AND c <> 'NOW()' "
+        "AND d = \"VALUES(x)\" AND e < datetime('now', 'localtime')"
+    )
+    assert translate_to_sqlite("SELECT 'it''s %s', %s") == "SELECT 'it''s %s', ?"
+
+
+def test_literal_with_placeholder_pattern_reaches_sqlite(db):
+    db.execute_query(
+        "INSERT INTO ejercicios (nombre, tipo) VALUES (%s, %s)", ("100%s sprint", "carrera"), commit=True
+    )
+    rows = db.execute_query("SELECT nombre FROM ejercicios WHERE nombre LIKE '%s%' AND tipo = %s", ("carrera",))
+    assert rows == [{"nombre": "100%s sprint"}]
+
+
+def test_concurrent_writers_wait_for_the_lock(db):
+    coach_user = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01", "specialty": "running", "experience": ""
+    })
+    workout = CoachProfile.get_by_user_id(coach_user).create_workout("W", "", 30, "intermedio")
+    threads, per_thread, errors = 8, 25, []
+
+    def writer():
+        try:
+            for _ in range(per_thread):
+                # Lee y luego escribe en la misma transacción
+                with db.transaction() as tx:
+                    row = tx.fetch(
+                        "SELECT asignaciones FROM entrenamientos WHERE id_entrenamiento = %s FOR UPDATE",
+                        (workout.id,), one=True
+                    )
+                    tx.execute(
+                        "UPDATE entrenamientos SET asignaciones = %s WHERE id_entrenamiento = %s",
+                        (row["asignaciones"] + 1, workout.id)
+                    )
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=writer) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    assert db.execute_query(
+        "SELECT asignaciones FROM entrenamientos WHERE id_entrenamiento = %s", (workout.id,), fetch_one=True
+    )["asignaciones"] == threads * per_thread
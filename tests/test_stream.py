@@ -0,0 +1,40 @@
+from contextlib import closing
+
+QUERY = "SELECT id_ejercicio, nombre FROM ejercicios ORDER BY id_ejercicio"
+
+
+def _seed(db, count):
+    db.execute_many("INSERT INTO ejercicios (nombre, tipo) VALUES (%s, %s)", [(f"E{i}", "fuerza") for i in range(count)])
+
+
+def test_streams_every_row_and_returns_the_connection(db):
+    _seed(db, 25)
+
+    rows = list(db.stream(QUERY, batch_size=10))
+
+    assert [row["nombre"] for row in rows] == [f"E{i}" for i in range(25)]
+    assert db.get_pool_stats()["checked_out"] == 0
+
+
+def test_batches_as_tuples(db):
+    _seed(db, 25)
+
+    batches = list(db.stream(QUERY, batch_size=10, dictionary=False, batches=True))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert batches[0][0][1] == "E0"
+
+
+def test_early_close_frees_the_pool_slot(db):
+    _seed(db, 25)
+    size = db.get_pool_stats()["size"]
+
+    with closing(db.stream(QUERY, batch_size=10)) as rows:
+        assert next(rows)["nombre"] == "E0"
+        assert db.get_pool_stats()["checked_out"] == 1
+
+    # La conexión con filas pendientes se descarta y deja libre su hueco
+    stats = db.get_pool_stats()
+    assert stats["checked_out"] == 0
+    assert stats["size"] == size - 1
+    assert db.execute_query("SELECT COUNT(*) AS n FROM ejercicios", fetch_one=True)["n"] == 25
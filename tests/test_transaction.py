@@ -0,0 +1,45 @@
+import pytest
+from mysql.connector.errors import IntegrityError
+
+INSERT_USER = "INSERT INTO usuarios (email, contrasena_hash, tipo) VALUES (%s, %s, %s)"
+
+
+def _emails(db):
+    return [row["email"] for row in db.execute_query("SELECT email FROM usuarios ORDER BY id_usuario")]
+
+
+def test_commits_on_one_connection(db):
+    with db.transaction() as tx:
+        user_id = tx.insert(INSERT_USER, ("a@example.com", "x", "atleta"))
+        row = tx.fetch("SELECT email FROM usuarios WHERE id_usuario = %s", (user_id,), one=True)
+        assert row == {"email": "a@example.com"}
+        assert tx.execute("UPDATE usuarios SET activo = 0 WHERE id_usuario = %s", (user_id,)) == 1
+        assert db.get_pool_stats()["checked_out"] == 1
+
+    assert _emails(db) == ["a@example.com"]
+    assert tx.written_tables == {"usuarios"}
+    assert db.get_pool_stats()["checked_out"] == 0
+
+
+def test_rolls_back_on_error(db):
+    with pytest.raises(IntegrityError):
+        with db.transaction() as tx:
+            tx.insert(INSERT_USER, ("a@example.com", "x", "atleta"))
+            tx.insert(INSERT_USER, ("a@example.com", "x", "atleta"))
+
+    assert _emails(db) == []
+    assert db.get_pool_stats()["checked_out"] == 0
+
+
+def test_commit_invalidates_the_cache_once(db):
+    db.enable_cache(16)
+    try:
+        query = "SELECT COUNT(*) AS n FROM usuarios"
+        assert db.execute_query(query, fetch_one=True, cache_ttl=60)["n"] == 0
+        with db.transaction() as tx:
+            tx.execute_many(INSERT_USER, [(f"{i}@example.com", "x", "atleta") for i in range(3)])
+            # Antes del commit la entrada cacheada sigue siendo válida
+            assert db.get_cache_stats()["invalidations"] == 0
+        assert db.execute_query(query, fetch_one=True, cache_ttl=60)["n"] == 3
+    finally:
+        db.disable_cache()
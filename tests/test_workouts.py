@@ -0,0 +1,66 @@
+from conftest import create_exercise, statement_count
+from models import User, CoachProfile, Workout
+
+
+def _coach():
+    user_id = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01",
+        "specialty": "running", "experience": "10 years"
+    })
+    return CoachProfile.get_by_user_id(user_id)
+
+
+def test_loader_batches_workouts_and_exercises(db):
+    coach = _coach()
+    workouts = [coach.create_workout(f"Workout {i}", "", 30, "intermedio") for i in range(3)]
+    exercise_ids = [create_exercise("Squat"), create_exercise("Lunge")]
+    workouts[0].set_exercises([{"exercise_id": exercise_ids[0]}, {"exercise_id": exercise_ids[1]}])
+    workouts[2].set_exercises([{"exercise_id": exercise_ids[1]}])
+
+    loader = Workout.loader().prime([w.id for w in workouts])
+    db.reset_query_stats()
+    loaded = [loader.load(w.id) for w in reversed(workouts)]
+
+    # Una consulta para las cabeceras y otra para todos los ejercicios
+    assert statement_count() == 2
+    assert [w.title for w in loaded] == ["Workout 2", "Workout 1", "Workout 0"]
+    assert [len(w.exercises) for w in loaded] == [1, 0, 2]
+    assert loader.load(-1) is None
+
+
+def test_set_exercises_writes_only_the_difference(db):
+    workout = _coach().create_workout("Strength", "", 60, "intermedio")
+    squat, lunge, plank = create_exercise("Squat"), create_exercise("Lunge"), create_exercise("Plank")
+
+    assert workout.set_exercises([
+        {"exercise_id": squat, "sets": 3}, {"exercise_id": lunge, "sets": 3}, {"exercise_id": plank}
+    ]) == {"inserted": 3, "updated": 0, "deleted": 0}
+    assert workout.set_exercises([
+        {"exercise_id": plank}, {"exercise_id": lunge, "sets": 3}
+    ]) == {"inserted": 0, "updated": 1, "deleted": 1}
+
+    exercises = Workout.get_by_id(workout.id).exercises
+    assert [(e["id_ejercicio"], e["orden"]) for e in exercises] == [(plank, 1), (lunge, 2)]
+    assert workout.exercises == exercises
+
+
+def test_set_exercises_merge_keeps_current_positions(db):
+    workout = _coach().create_workout("Strength", "", 60, "intermedio")
+    squat, lunge, plank = create_exercise("Squat"), create_exercise("Lunge"), create_exercise("Plank")
+    workout.set_exercises([{"exercise_id": squat, "sets": 3}, {"exercise_id": lunge, "sets": 3}])
+
+    result = workout.set_exercises(
+        [{"exercise_id": plank, "duration": 60}, {"exercise_id": squat, "sets": 5}], merge=True
+    )
+
+    assert result == {"inserted": 1, "updated": 1, "deleted": 0}
+    assert [(e["id_ejercicio"], e["series"]) for e in workout.exercises] == [(squat, 5), (lunge, 3), (plank, None)]
+
+
+def test_set_exercises_rolls_back_on_error(db):
+    workout = _coach().create_workout("Strength", "", 60, "intermedio")
+    squat = create_exercise("Squat")
+    workout.set_exercises([{"exercise_id": squat, "sets": 3}])
+
+    assert workout.set_exercises([{"exercise_id": squat, "sets": 4}, {"sets": 3}]) is None
+    assert [e["series"] for e in Workout.get_by_id(workout.id).exercises] == [3]
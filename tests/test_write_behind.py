@@ -0,0 +1,60 @@
+import atexit
+from datetime import datetime
+
+from conftest import statement_count
+from database import DatabaseManager
+from models import User, CoachProfile
+
+
+def _register_users(count):
+    return [
+        User.register(f"athlete{i}@example.com", "password1", "atleta", {
+            "full_name": f"Athlete {i}", "birth_date": "2000-05-01", "height": 180, "weight": 70,
+            "sport": "running", "max_hr": 190, "resting_hr": 50, "coach_id": None
+        })
+        for i in range(count)
+    ]
+
+
+def test_flush_sends_one_statement_per_shape(db):
+    user_ids = _register_users(3)
+    coach_user = User.register("coach@example.com", "password1", "entrenador", {
+        "full_name": "Coach", "birth_date": "1980-01-01", "specialty": "running", "experience": ""
+    })
+    workout = CoachProfile.get_by_user_id(coach_user).create_workout("W", "", 30, "intermedio")
+    login_times = {user_id: datetime(2024, 1, i + 1, 8, 0) for i, user_id in enumerate(user_ids)}
+
+    for user_id, login_time in login_times.items():
+        db.queue_update("usuarios", "id_usuario", user_id, values={"ultimo_login": datetime(2000, 1, 1)})
+        db.queue_update("usuarios", "id_usuario", user_id, values={"ultimo_login": login_time})
+    db.queue_update("entrenamientos", "id_entrenamiento", workout.id, increments={"asignaciones": 2})
+    db.queue_update("entrenamientos", "id_entrenamiento", workout.id, increments={"asignaciones": 3})
+
+    db.reset_query_stats()
+    assert db.flush_writes() == 4
+    assert statement_count() == 2
+
+    for user_id, login_time in login_times.items():
+        assert str(User.get_by_id(user_id).last_login).startswith(str(login_time))
+    assert db.execute_query(
+        "SELECT asignaciones FROM entrenamientos WHERE id_entrenamiento = %s", (workout.id,), fetch_one=True
+    )["asignaciones"] == 5
+    assert db.get_write_behind_stats()["batches"] == 2
+
+
+def test_close_pool_flushes_and_disarms_the_queue(db, monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    unregistered = []
+    monkeypatch.setattr(atexit, "unregister", unregistered.append)
+    user_id = _register_users(1)[0]
+
+    db.queue_update("usuarios", "id_usuario", user_id, values={"ultimo_login": datetime(2024, 1, 1)})
+    queue = DatabaseManager._write_behind
+    DatabaseManager.close_pool()
+
+    assert queue.stats()["written"] == 1
+    assert registered == [queue.flush] and unregistered == [queue.flush]
+    # El flush de atexit ya no reabre el backend tras close_pool
+    assert queue.flush() == 0
+    assert DatabaseManager._backend is None and DatabaseManager._connection_pool is None
@@ -1,11 +1,111 @@
-import matplotlib.pyplot as plt
 from io import BytesIO
+from collections import OrderedDict
 import base64
-from typing import Dict
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Cambiar al modificar el aspecto del gráfico: invalida las imágenes guardadas
+HR_CHART_STYLE_VERSION = 1
+
+# Colores de las zonas 1-5, compartidos por el gráfico nativo y el PNG
+HR_ZONE_COLORS = ["#FF6B6B", "#FFA500", "#FFD700", "#90EE90", "#4682B4"]
+
+
+class ChartCache:
+    """
+    Caché de gráficos en dos niveles: LRU en memoria y PNG en disco
+
+    El disco sobrevive a los reinicios; cada fichero se escribe en uno
+    temporal y se renombra para que otro proceso nunca lea uno a medias.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 256):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Clave estable (nombre de fichero) para los valores de entrada del gráfico"""
+        return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key: str) -> Optional[str]:
+        """Imagen en base64 o None si no está en ninguno de los niveles"""
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return image
+        try:
+            with open(self._path(key), "rb") as f:
+                image = base64.b64encode(f.read()).decode("utf-8")
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._disk_hits += 1
+        self._remember(key, image)
+        return image
+
+    def put(self, key: str, image: str) -> None:
+        """Guarda una imagen en base64 en memoria y en disco"""
+        self._remember(key, image)
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(base64.b64decode(image))
+            os.replace(tmp_path, self._path(key))
+            tmp_path = None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not write chart cache file: {e}")
+        finally:
+            # Sin el rename el temporal quedaría para siempre en el directorio
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _remember(self, key: str, image: str) -> None:
+        with self._lock:
+            self._entries[key] = image
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Devuelve aciertos en memoria y en disco, fallos y tamaño en memoria"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "size": len(self._entries),
+            }
+
+
+hr_chart_cache = ChartCache(
+    os.getenv("HR_CHART_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sportpro_hr_charts")),
+    int(os.getenv("HR_CHART_CACHE_SIZE", "256"))
+)
+
 def calculate_hr_zones(max_hr: int, resting_hr: int) -> Dict[str, int]:
     """
     Calcula las zonas de frecuencia cardiaca basadas en la fórmula de Karvonen
@@ -29,7 +129,11 @@ def calculate_hr_zones(max_hr: int, resting_hr: int) -> Dict[str, int]:
 
 def create_hr_zones_chart(zones: Dict[str, int], resting_hr: int) -> str:
     """
-    Crea un gráfico de las zonas de frecuencia cardiaca
+    Crea un gráfico PNG de las zonas de frecuencia cardiaca para exportar
+    (en pantalla se usa el gráfico nativo de views/athlete.py)
+    
+    La imagen depende solo de las zonas, la FC en reposo y el estilo, así
+    que se sirve desde hr_chart_cache siempre que es posible.
     
     Args:
         zones: Diccionario con las zonas de entrenamiento
@@ -38,7 +142,20 @@ def create_hr_zones_chart(zones: Dict[str, int], resting_hr: int) -> str:
     Returns:
         Imagen del gráfico en base64
     """
+    key = ChartCache.key("hr_zones", HR_CHART_STYLE_VERSION, tuple(zones.items()), resting_hr)
+    image = hr_chart_cache.get(key)
+    if image is None:
+        image = _render_hr_zones_chart(zones, resting_hr)
+        if image:
+            hr_chart_cache.put(key, image)
+    return image
+
+def _render_hr_zones_chart(zones: Dict[str, int], resting_hr: int) -> str:
+    """Dibuja el gráfico de zonas con matplotlib y lo devuelve como PNG en base64"""
     try:
+        # Solo las exportaciones usan matplotlib: se importa al primer uso
+        import matplotlib.pyplot as plt
+        
         fig, ax = plt.subplots(figsize=(10, 5))
         
         zone_names = list(zones.keys())
@@ -60,7 +177,7 @@ def create_hr_zones_chart(zones: Dict[str, int], resting_hr: int) -> str:
                   linewidth=1.5)
         
         # Colores para las zonas
-        zone_colors = ["#FF6B6B", "#FFA500", "#FFD700", "#90EE90", "#4682B4"]
+        zone_colors = HR_ZONE_COLORS
         
         # Áreas coloreadas para cada zona
         for i in range(len(zone_values)-1):
@@ -101,4 +218,4 @@ def create_hr_zones_chart(zones: Dict[str, int], resting_hr: int) -> str:
         return base64.b64encode(buf.read()).decode('utf-8')
     except Exception as e:
         logger.error(f"Error creating HR zones chart: {e}")
-        return ""
\ No newline at end of file
+        return ""
@@ -1,19 +1,20 @@
 import flet as ft
 from flet import icons
 from datetime import date
-from models import AthleteProfile, WorkoutAssignment
+from typing import Optional
+from models import AthleteProfile, AthleteDashboardData, Workout, WorkoutAssignment, DataLoader
 from views.shared import (
     create_app_bar, create_card, show_alert, COLORS,
-    show_loading, hide_loading, create_button
+    show_loading, hide_loading, create_button, create_load_more,
+    get_identity_map, get_session_db, create_exercise_list,
+    with_page_session
 )
-import matplotlib.pyplot as plt
-from io import BytesIO
-from database import DatabaseManager
-import base64
+from utils import calculate_hr_zones, HR_ZONE_COLORS
 import logging
 
 logger = logging.getLogger(__name__)
 
+@with_page_session
 def show_athlete_dashboard(page: ft.Page, db):
     # Mostrar loading
     if not page.session.get("user_id"):
@@ -23,22 +24,25 @@ def show_athlete_dashboard(page: ft.Page, db):
     
     try:
         user_id = page.session.get("user_id")
-        profile = AthleteProfile.get_by_user_id(user_id)
+        # Perfil, entrenador y primera página de entrenamientos en una consulta
+        data = AthleteDashboardData.load(user_id, identity_map=get_identity_map(page))
         
-        if not profile:
+        if not data:
             show_alert(page, "Athlete profile not found", "error")
             return
+        profile = data.profile
         
         # Calcular zonas de frecuencia cardiaca si existen los datos necesarios
         hr_zones = {}
-        chart_img = None
         
         if profile.max_hr and profile.resting_hr:
             hr_zones = calculate_hr_zones(profile.max_hr, profile.resting_hr)
-            chart_img = create_hr_zones_chart(hr_zones, profile.resting_hr)
         
-        # Obtener entrenamientos asignados
-        workouts = profile.get_workouts()
+        workouts, workouts_cursor = data.assignments, data.next_cursor
+        # Los detalles (con ejercicios) de todos los entrenamientos listados se
+        # cargan en un único lote la primera vez que se abre cualquiera
+        workout_loader = Workout.loader(identity_map=get_identity_map(page))
+        workout_loader.prime([w.workout_id for w in workouts])
         
         # Construir UI
         page.clean()
@@ -61,11 +65,11 @@ def show_athlete_dashboard(page: ft.Page, db):
             ft.Container(
                 content=ft.Column(
                     controls=[
-                        _create_profile_section(page, profile),
-                        _create_hr_zones_section(hr_zones, chart_img, profile) 
+                        _create_profile_section(page, profile, data.coach_name),
+                        _create_hr_zones_section(hr_zones, profile) 
                         if profile.max_hr and profile.resting_hr 
                         else ft.Container(),
-                        _create_workouts_section(page, workouts)
+                        _create_workouts_section(page, workouts, profile, workouts_cursor, workout_loader)
                     ],
                     spacing=20,
                     scroll=ft.ScrollMode.AUTO,
@@ -82,24 +86,13 @@ def show_athlete_dashboard(page: ft.Page, db):
     finally:
         hide_loading(page, loading)
 
-def _create_profile_section(page: ft.Page, profile: AthleteProfile) -> ft.Container:
+def _create_profile_section(
+    page: ft.Page,
+    profile: AthleteProfile,
+    coach_name: Optional[str] = None
+) -> ft.Container:
     """Crea la sección de perfil del atleta con un diseño mejorado, incluyendo el nombre del entrenador"""
-    coach_name = "No asignado"
-    
-    # Obtener el nombre del entrenador desde la base de datos
-    if profile.coach_id:
-        try:
-            query = """
-            SELECT nombre_completo 
-            FROM perfiles_entrenadores 
-            WHERE id_entrenador = %s
-            """
-            result = DatabaseManager.fetch_one(query, (profile.coach_id,))
-            if result:
-                coach_name = result['nombre_completo']
-        except Exception as e:
-            logger.error(f"Error fetching coach name: {e}")
-            coach_name = "Error al obtener el nombre"
+    coach_name = coach_name or "No asignado"
 
     return ft.Container(
         content=ft.Column(
@@ -230,6 +223,7 @@ def show_edit_profile(page: ft.Page, profile: AthleteProfile):
     )
     error_text = ft.Text("", color="red")
 
+    @with_page_session
     def save_changes(e):
         """Guarda los cambios del perfil"""
         error_text.value = ""  # Limpia el mensaje de error
@@ -259,30 +253,19 @@ def show_edit_profile(page: ft.Page, profile: AthleteProfile):
             new_resting_hr = int(resting_hr_field.value) if resting_hr_field.value else None
             new_max_hr = int(max_hr_field.value) if max_hr_field.value else None
 
+            # El perfil es el del identity map de la sesión: el dashboard
+            # verá los cambios sin volver a leerlo
             success = profile.update_profile(
                 height=new_height,
                 weight=new_weight,
                 sport=new_sport,
-                resting_hr=new_resting_hr
+                resting_hr=new_resting_hr,
+                max_hr=new_max_hr
             )
 
-            # Actualizar frecuencia cardiaca máxima si es diferente
-            if new_max_hr != profile.max_hr:
-                query = """
-                UPDATE perfiles_atletas 
-                SET frecuencia_cardiaca_maxima = %s
-                WHERE id_atleta = %s
-                """
-                DatabaseManager.execute_query(
-                    query,
-                    (new_max_hr, profile.id),
-                    commit=True
-                )
-                profile.max_hr = new_max_hr
-
             if success:
                 show_alert(page, "Perfil actualizado correctamente", "success")
-                show_athlete_dashboard(page, DatabaseManager())  # Redirigir al dashboard
+                show_athlete_dashboard(page, get_session_db(page))  # Redirigir al dashboard
             else:
                 error_text.value = "Error al actualizar el perfil"
                 page.update()
@@ -294,7 +277,7 @@ def show_edit_profile(page: ft.Page, profile: AthleteProfile):
 
     def cancel_changes(e):
         """Cancela la edición y regresa al dashboard"""
-        show_athlete_dashboard(page, DatabaseManager())
+        show_athlete_dashboard(page, get_session_db(page))
 
     # Construir la interfaz de edición
     page.clean()
@@ -349,7 +332,81 @@ def show_edit_profile(page: ft.Page, profile: AthleteProfile):
             expand=True
         )
     )
-def _create_hr_zones_section(zones: dict, chart_img: str, profile: AthleteProfile) -> ft.Container:
+def _create_hr_zones_chart(zones: dict, resting_hr: int, width: int = 600) -> ft.Control:
+    """
+    Gráfico de zonas con controles nativos de Flet
+
+    Cada zona es una banda sobre una escala común desde la FC en reposo
+    hasta la FC máxima, con una línea gris en la FC en reposo como la del
+    gráfico de matplotlib. Lo dibuja el cliente, así que solo viajan unos pocos controles
+    en lugar de un PNG en base64, y se ve nítido a cualquier densidad.
+    """
+    names = list(zones)[:-1]
+    values = list(zones.values())
+    low, high = min(values[0], resting_hr), values[-1]
+    span = max(high - low, 1)
+    label_width = 190
+    bar_width = width - label_width
+    bar_height = 22
+    resting_left = min(max((resting_hr - low) / span * bar_width, 0), bar_width - 2)
+
+    rows = []
+    for i, name in enumerate(names):
+        start, end = values[i], values[i + 1]
+        rows.append(ft.Row(
+            controls=[
+                ft.Text(name, width=label_width, size=12),
+                ft.Stack(
+                    controls=[
+                        ft.Container(width=bar_width, height=bar_height, bgcolor="#EEEEEE", border_radius=4),
+                        ft.Container(
+                            content=ft.Text(f"{start}-{end}", size=11),
+                            left=(start - low) / span * bar_width,
+                            width=max((end - start) / span * bar_width, 2),
+                            height=bar_height,
+                            bgcolor=HR_ZONE_COLORS[i % len(HR_ZONE_COLORS)],
+                            border_radius=4,
+                            alignment=ft.alignment.center
+                        ),
+                        # Marca de la FC en reposo: los tramos de cada fila forman una línea discontinua
+                        ft.Container(left=resting_left, width=2, height=bar_height, bgcolor="gray")
+                    ],
+                    width=bar_width,
+                    height=bar_height
+                )
+            ],
+            spacing=0
+        ))
+
+    return ft.Column(
+        controls=[
+            ft.Text("Heart Rate Training Zones", size=14, weight=ft.FontWeight.BOLD),
+            *rows,
+            ft.Row(
+                controls=[
+                    ft.Container(width=label_width),
+                    ft.Text(f"{low} bpm", size=11, color="gray"),
+                    ft.Text(f"{high} bpm (Max HR)", size=11, color="gray")
+                ],
+                width=width,
+                spacing=0,
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN
+            ),
+            ft.Row(
+                controls=[
+                    ft.Container(width=label_width),
+                    ft.Container(width=12, height=2, bgcolor="gray"),
+                    ft.Text(f"Resting HR ({resting_hr} bpm)", size=11, color="gray")
+                ],
+                spacing=6,
+                vertical_alignment=ft.CrossAxisAlignment.CENTER
+            )
+        ],
+        width=width,
+        spacing=6
+    )
+
+def _create_hr_zones_section(zones: dict, profile: AthleteProfile) -> ft.Container:
     """Crea la sección de zonas de frecuencia cardiaca con un diseño mejorado"""
     return ft.Container(
         content=ft.Column(
@@ -396,7 +453,7 @@ def _create_hr_zones_section(zones: dict, chart_img: str, profile: AthleteProfil
                     
                     border=ft.border.all(1, COLORS["primary"]),
                 ),ft.Container(
-                    content=ft.Image(src_base64=chart_img, width=600, height=300),
+                    content=_create_hr_zones_chart(zones, profile.resting_hr),
                     alignment=ft.alignment.center,
                     padding=10
                 )
@@ -410,63 +467,40 @@ def _create_hr_zones_section(zones: dict, chart_img: str, profile: AthleteProfil
         padding=15,
         bgcolor="#F9F9F9"
     )
-def _create_workouts_section(page: ft.Page, workouts: list) -> ft.Container:
+def _create_workouts_section(
+    page: ft.Page,
+    workouts: list,
+    profile: AthleteProfile,
+    next_cursor: Optional[str] = None,
+    workout_loader: Optional[DataLoader] = None
+) -> ft.Container:
     """Crea la sección de entrenamientos asignados con un diseño mejorado"""
     # Lista de entrenamientos
     workout_list = ft.Column(
-        controls=[
-            ft.Container(
-                content=ft.Row(
-                    controls=[
-                        ft.Icon(icons.FITNESS_CENTER, color=COLORS["primary"]),
-                        ft.Column(
-                            controls=[
-                                ft.Text(w['titulo'], weight=ft.FontWeight.BOLD),
-                                ft.Text(
-                                    f"Status: {w['estado'].replace('_', ' ').title()} | "
-                                    f"Duration: {w['duracion_estimada']} min | "
-                                    f"Difficulty: {w['nivel_dificultad'].capitalize()}",
-                                    size=12,
-                                    italic=True
-                                )
-                            ],
-                            spacing=5
-                        ),
-                        ft.PopupMenuButton(
-                            icon=icons.MORE_VERT,
-                            items=[
-                                ft.PopupMenuItem(
-                                    text="View Details",
-                                    on_click=lambda e, w=w: show_workout_details(page, w)
-                                ),
-                                ft.PopupMenuItem(
-                                    text="Mark as Completed",
-                                    on_click=lambda e, w=w: show_mark_workout_completed(page, w),
-                                    disabled=w['estado'] == 'completado'
-                                )
-                            ]
-                        )
-                    ],
-                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                    spacing=10
-                ),
-                padding=10,
-                border=ft.border.all(1, COLORS["primary"]),
-                border_radius=8,
-                bgcolor="#F9F9F9"
-            )
-            for w in workouts
-        ],
+        controls=[_create_workout_card(page, w, workout_loader) for w in workouts],
         spacing=10
     )
 
+    def fetch_page(cursor: str):
+        assignments, next_page = profile.get_workouts_page(cursor=cursor)
+        if workout_loader is not None:
+            workout_loader.prime([w.workout_id for w in assignments])
+        return assignments, next_page
+
     # Contenedor principal
     return ft.Container(
         content=ft.Column(
             controls=[
                 ft.Text("My Workouts", size=20, weight=ft.FontWeight.BOLD, color=COLORS["primary"]),
                 ft.Divider(),
-                workout_list if workouts else ft.Text("No workouts assigned yet.", italic=True, size=14)
+                workout_list if workouts else ft.Text("No workouts assigned yet.", italic=True, size=14),
+                create_load_more(
+                    page,
+                    workout_list,
+                    fetch_page,
+                    lambda w: _create_workout_card(page, w, workout_loader),
+                    next_cursor
+                )
             ],
             spacing=15
         ),
@@ -475,8 +509,66 @@ def _create_workouts_section(page: ft.Page, workouts: list) -> ft.Container:
         padding=15,
         bgcolor="#F9F9F9"
     )
-def show_workout_details(page: ft.Page, workout: dict):
+
+def _create_workout_card(
+    page: ft.Page,
+    w: WorkoutAssignment,
+    workout_loader: Optional[DataLoader] = None
+) -> ft.Container:
+    """Crea la tarjeta de un entrenamiento asignado"""
+    return ft.Container(
+        content=ft.Row(
+            controls=[
+                ft.Icon(icons.FITNESS_CENTER, color=COLORS["primary"]),
+                ft.Column(
+                    controls=[
+                        ft.Text(w.workout.title, weight=ft.FontWeight.BOLD),
+                        ft.Text(
+                            f"Status: {w.status.replace('_', ' ').title()} | "
+                            f"Duration: {w.workout.estimated_duration} min | "
+                            f"Difficulty: {w.workout.difficulty.capitalize()}",
+                            size=12,
+                            italic=True
+                        )
+                    ],
+                    spacing=5
+                ),
+                ft.PopupMenuButton(
+                    icon=icons.MORE_VERT,
+                    items=[
+                        ft.PopupMenuItem(
+                            text="View Details",
+                            on_click=lambda e, w=w: show_workout_details(page, w, workout_loader)
+                        ),
+                        ft.PopupMenuItem(
+                            text="Mark as Completed",
+                            on_click=lambda e, w=w: show_mark_workout_completed(page, w),
+                            disabled=w.status == 'completado'
+                        )
+                    ]
+                )
+            ],
+            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+            spacing=10
+        ),
+        padding=10,
+        border=ft.border.all(1, COLORS["primary"]),
+        border_radius=8,
+        bgcolor="#F9F9F9"
+    )
+@with_page_session
+def show_workout_details(
+    page: ft.Page,
+    workout: WorkoutAssignment,
+    workout_loader: Optional[DataLoader] = None
+):
     """Redirige a una vista con los detalles del entrenamiento"""
+    if workout_loader is not None:
+        details = workout_loader.load(workout.workout_id)
+    else:
+        details = Workout.get_by_id(workout.workout_id, get_identity_map(page))
+    exercises = details.exercises if details else []
+
     page.clean()
     page.add(
         ft.Container(
@@ -485,23 +577,25 @@ def show_workout_details(page: ft.Page, workout: dict):
                     create_app_bar("Detalles del Entrenamiento", actions=[
                         ft.IconButton(
                             icon=icons.ARROW_BACK,
-                            on_click=lambda e: show_athlete_dashboard(page, DatabaseManager()),
+                            on_click=lambda e: show_athlete_dashboard(page, get_session_db(page)),
                             tooltip="Volver"
                         )
                     ]),
                     ft.Text("Detalles del Entrenamiento", size=24, weight=ft.FontWeight.BOLD, color=COLORS["primary"]),
                     ft.Divider(),
                     ft.Text(f"Título:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(workout['titulo'], size=16),
+                    ft.Text(workout.workout.title, size=16),
                     ft.Text(f"Duración Estimada:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(f"{workout['duracion_estimada']} minutos", size=16),
+                    ft.Text(f"{workout.workout.estimated_duration} minutos", size=16),
                     ft.Text(f"Dificultad:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(workout['nivel_dificultad'].capitalize(), size=16),
+                    ft.Text(workout.workout.difficulty.capitalize(), size=16),
                     ft.Text(f"Estado:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(workout['estado'].replace("_", " ").capitalize(), size=16),
+                    ft.Text(workout.status.replace("_", " ").capitalize(), size=16),
+                    ft.Text("Ejercicios:", size=18, weight=ft.FontWeight.BOLD),
+                    create_exercise_list(exercises),
                     ft.ElevatedButton(
                         "Volver",
-                        on_click=lambda e: show_athlete_dashboard(page, DatabaseManager()),
+                        on_click=lambda e: show_athlete_dashboard(page, get_session_db(page)),
                         style=ft.ButtonStyle(bgcolor=COLORS["primary"], color="white")
                     )
                 ],
@@ -511,19 +605,16 @@ def show_workout_details(page: ft.Page, workout: dict):
         )
     )
 
-def show_mark_workout_completed(page: ft.Page, workout: dict):
+def show_mark_workout_completed(page: ft.Page, workout: WorkoutAssignment):
     """Redirige a una vista para marcar un entrenamiento como completado"""
+    @with_page_session
     def confirm_completion(e):
         """Marca el entrenamiento como completado en la base de datos"""
         try:
-            query = """
-            UPDATE asignaciones_atletas
-            SET estado = 'completado'
-            WHERE id_asignacion = %s
-            """
-            DatabaseManager.execute_query(query, (workout['id_asignacion'],), commit=True)
+            if not workout.update_status('completado', get_identity_map(page)):
+                raise RuntimeError(f"Assignment {workout.id} not updated")
             show_alert(page, "Entrenamiento marcado como completado.", "success")
-            show_athlete_dashboard(page, DatabaseManager())  # Redirige al dashboard
+            show_athlete_dashboard(page, get_session_db(page))  # Redirige al dashboard
         except Exception as ex:
             logger.error(f"Error marking workout as completed: {ex}")
             show_alert(page, "Error al marcar el entrenamiento como completado.", "error")
@@ -536,13 +627,13 @@ def show_mark_workout_completed(page: ft.Page, workout: dict):
                     create_app_bar("Marcar como Completado", actions=[
                         ft.IconButton(
                             icon=icons.ARROW_BACK,
-                            on_click=lambda e: show_athlete_dashboard(page, DatabaseManager()),
+                            on_click=lambda e: show_athlete_dashboard(page, get_session_db(page)),
                             tooltip="Volver"
                         )
                     ]),
                     ft.Text("¿Estás seguro de que deseas marcar este entrenamiento como completado?", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(f"Título: {workout['titulo']}", size=16),
-                    ft.Text(f"Duración: {workout['duracion_estimada']} minutos", size=16),
+                    ft.Text(f"Título: {workout.workout.title}", size=16),
+                    ft.Text(f"Duración: {workout.workout.estimated_duration} minutos", size=16),
                     ft.Row(
                         controls=[
                             ft.ElevatedButton(
@@ -552,7 +643,7 @@ def show_mark_workout_completed(page: ft.Page, workout: dict):
                             ),
                             ft.ElevatedButton(
                                 "Cancelar",
-                                on_click=lambda e: show_athlete_dashboard(page, DatabaseManager()),
+                                on_click=lambda e: show_athlete_dashboard(page, get_session_db(page)),
                                 style=ft.ButtonStyle(bgcolor="gray", color="white")
                             )
                         ],
@@ -566,85 +657,6 @@ def show_mark_workout_completed(page: ft.Page, workout: dict):
     )
     
 
-def calculate_hr_zones(max_hr: int, resting_hr: int) -> dict:
-    """Calcula las zonas de frecuencia cardiaca"""
-    hr_range = max_hr - resting_hr
-    return {
-        "Zone 1 (Recovery)": int(resting_hr + 0.5 * hr_range),
-        "Zone 2 (Light Aerobic)": int(resting_hr + 0.6 * hr_range),
-        "Zone 3 (Aerobic)": int(resting_hr + 0.7 * hr_range),
-        "Zone 4 (Anaerobic Threshold)": int(resting_hr + 0.8 * hr_range),
-        "Zone 5 (Maximum Effort)": int(resting_hr + 0.9 * hr_range),
-        "Max HR": max_hr
-    }
-
-def create_hr_zones_chart(zones: dict, resting_hr: int) -> str:
-    """Crea un gráfico de las zonas de frecuencia cardiaca"""
-    try:
-        fig, ax = plt.subplots(figsize=(10, 5))
-        
-        zone_names = list(zones.keys())
-        zone_values = list(zones.values())
-        
-        # Gráfico de líneas con puntos
-        ax.plot(zone_names, zone_values, 
-                marker='o', 
-                linestyle='-', 
-                color='#FF7F2A', 
-                markersize=8,
-                linewidth=2)
-        
-        # Línea de frecuencia cardiaca en reposo
-        ax.axhline(y=resting_hr, 
-                  color='gray', 
-                  linestyle='--', 
-                  label='Resting HR',
-                  linewidth=1.5)
-        
-        # Colores para las zonas
-        zone_colors = ["#FF6B6B", "#FFA500", "#FFD700", "#90EE90", "#4682B4"]
-        
-        # Áreas coloreadas para cada zona
-        for i in range(len(zone_values)-1):
-            ax.axhspan(zone_values[i], 
-                      zone_values[i+1], 
-                      facecolor=zone_colors[i], 
-                      alpha=0.2)
-        
-        # Configuración del gráfico
-        ax.set_title("Heart Rate Training Zones", 
-                    pad=20, 
-                    fontsize=14, 
-                    fontweight='bold')
-        ax.set_ylabel("Beats per minute (bpm)", fontsize=12)
-        ax.grid(True, linestyle='--', alpha=0.5)
-        
-        # Rotar etiquetas del eje X para mejor legibilidad
-        plt.xticks(rotation=45, ha='right', fontsize=10)
-        plt.yticks(fontsize=10)
-        
-        # Leyenda
-        plt.legend(fontsize=10)
-        
-        # Ajustar layout
-        plt.tight_layout()
-        
-        # Guardar en buffer
-        buf = BytesIO()
-        plt.savefig(buf, 
-                   format='png', 
-                   dpi=100, 
-                   bbox_inches='tight',
-                   transparent=False)
-        plt.close(fig)
-        buf.seek(0)
-        
-        # Convertir a base64
-        return base64.b64encode(buf.read()).decode('utf-8')
-    except Exception as e:
-        logger.error(f"Error creating HR zones chart: {e}")
-        return ""
-
 def logout(page: ft.Page, db):
     """Cierra la sesión y redirige al login"""
     try:
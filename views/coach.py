@@ -1,31 +1,35 @@
 import flet as ft
 from flet import icons
-from models import CoachProfile, Workout, Exercise
+from models import AthleteProfile, CoachProfile, CoachDashboardData, Workout, Exercise
 from views.shared import (
     create_app_bar, create_card, show_alert, COLORS,
-    show_loading, hide_loading, create_button
+    show_loading, hide_loading, create_button, create_load_more,
+    get_identity_map, get_session_db, create_exercise_list,
+    with_page_session
 )
 import logging
-from database import DatabaseManager
 from datetime import date, datetime
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+@with_page_session
 def show_coach_dashboard(page: ft.Page, db):
     # Mostrar loading
     loading = show_loading(page)
     
     try:
         user_id = page.session.get("user_id")
-        profile = CoachProfile.get_by_user_id(user_id)
+        # Perfil y primera página de atletas y entrenamientos en un solo viaje
+        data = CoachDashboardData.load(user_id, identity_map=get_identity_map(page))
         
-        if not profile:
+        if not data:
             show_alert(page, "Coach profile not found", "error")
             return
         
-        # Obtener datos del entrenador
-        athletes = profile.get_assigned_athletes()
-        workouts = profile.get_created_workouts()
+        profile = data.profile
+        athletes, athletes_cursor = data.athletes, data.athletes_cursor
+        workouts, workouts_cursor = data.workouts, data.workouts_cursor
         
         # Construir UI
         page.clean()
@@ -48,12 +52,12 @@ def show_coach_dashboard(page: ft.Page, db):
                             ft.Tab(
                                 text="My Athletes",
                                 icon=icons.PEOPLE_OUTLINE,
-                                content=_create_athletes_tab(page, athletes,profile)
+                                content=_create_athletes_tab(page, athletes, profile, athletes_cursor)
                             ),
                             ft.Tab(
                                 text="My Workouts",
                                 icon=icons.FITNESS_CENTER,
-                                content=_create_workouts_tab(page, workouts, profile)
+                                content=_create_workouts_tab(page, workouts, profile, workouts_cursor)
                             ),
                             ft.Tab(
                                 text="Create Workout",
@@ -74,7 +78,12 @@ def show_coach_dashboard(page: ft.Page, db):
     finally:
         hide_loading(page, loading)
 
-def _create_athletes_tab(page: ft.Page, athletes: list, profile: CoachProfile) -> ft.Container:
+def _create_athletes_tab(
+    page: ft.Page,
+    athletes: list,
+    profile: CoachProfile,
+    next_cursor: Optional[str] = None
+) -> ft.Container:
     """Crea la pestaña de atletas asignados"""
     if not athletes:
         return ft.Container(
@@ -91,41 +100,54 @@ def _create_athletes_tab(page: ft.Page, athletes: list, profile: CoachProfile) -
         )
     
     athlete_list = ft.ListView(
-        controls=[
-            ft.ListTile(
-                title=ft.Text(a['nombre_completo']),
-                subtitle=ft.Text(
-                    f"Sport: {a['deporte']} | "
-                    f"Age: {calculate_age(a['fecha_nacimiento'])} | "
-                    f"HR: {a['frecuencia_cardiaca_maxima']}/{a['frecuencia_cardiaca_minima']}"
-                ),
-                leading=ft.Icon(icons.PERSON_OUTLINE),
-                trailing=ft.PopupMenuButton(
-                    icon=icons.MORE_VERT,
-                    items=[
-                        ft.PopupMenuItem(
-                            text="View Profile",
-                            on_click=lambda e, a=a: show_athlete_profile(page, a)
-                        ),
-                        ft.PopupMenuItem(
-                            text="Assign Workout",
-                            on_click=lambda e, a=a: show_assign_workout_to_athlete(page, a, profile)  # Pasa el argumento `profile`
-                        )
-                    ]
-                ),
-                on_click=lambda e, a=a: _view_athlete_profile(page, a)
-            )
-            for a in athletes
-        ],
+        controls=[_create_athlete_tile(page, a, profile) for a in athletes],
         expand=True
     )
     
     return ft.Container(
-        content=athlete_list,
+        content=ft.Column(
+            controls=[
+                athlete_list,
+                create_load_more(
+                    page,
+                    athlete_list,
+                    lambda cursor: profile.get_assigned_athletes_page(cursor=cursor),
+                    lambda a: _create_athlete_tile(page, a, profile),
+                    next_cursor
+                )
+            ],
+            expand=True
+        ),
         padding=20,
         expand=True
     )
 
+def _create_athlete_tile(page: ft.Page, a: AthleteProfile, profile: CoachProfile) -> ft.ListTile:
+    """Crea la fila de un atleta en la lista del entrenador"""
+    return ft.ListTile(
+        title=ft.Text(a.full_name),
+        subtitle=ft.Text(
+            f"Sport: {a.sport} | "
+            f"Age: {calculate_age(a.birth_date)} | "
+            f"HR: {a.max_hr}/{a.resting_hr}"
+        ),
+        leading=ft.Icon(icons.PERSON_OUTLINE),
+        trailing=ft.PopupMenuButton(
+            icon=icons.MORE_VERT,
+            items=[
+                ft.PopupMenuItem(
+                    text="View Profile",
+                    on_click=lambda e, a=a: show_athlete_profile(page, a)
+                ),
+                ft.PopupMenuItem(
+                    text="Assign Workout",
+                    on_click=lambda e, a=a: show_assign_workout_to_athlete(page, a, profile)  # Pasa el argumento `profile`
+                )
+            ]
+        ),
+        on_click=lambda e, a=a: _view_athlete_profile(page, a)
+    )
+
 
 
 def calculate_age(birth_date: str) -> int:
@@ -144,14 +166,14 @@ def calculate_age(birth_date: str) -> int:
         return 0  # Retorna 0 si hay un error
     
 
-def _view_athlete_profile(page: ft.Page, athlete: dict):
+def _view_athlete_profile(page: ft.Page, athlete: AthleteProfile):
     """Muestra el perfil detallado de un atleta"""
     details = (
-        f"Nombre: {athlete['nombre_completo']}\n"
-        f"Deporte: {athlete['deporte']}\n"
-        f"Edad: {calculate_age(athlete['fecha_nacimiento'])} años\n"
-        f"Frecuencia Cardiaca Máxima: {athlete['frecuencia_cardiaca_maxima']} bpm\n"
-        f"Frecuencia Cardiaca Mínima: {athlete['frecuencia_cardiaca_minima']} bpm"
+        f"Nombre: {athlete.full_name}\n"
+        f"Deporte: {athlete.sport}\n"
+        f"Edad: {calculate_age(athlete.birth_date)} años\n"
+        f"Frecuencia Cardiaca Máxima: {athlete.max_hr} bpm\n"
+        f"Frecuencia Cardiaca Mínima: {athlete.resting_hr} bpm"
     )
     page.dialog = ft.AlertDialog(
         title=ft.Text("Athlete Profile"),
@@ -166,14 +188,14 @@ def _view_athlete_profile(page: ft.Page, athlete: dict):
 
 
 
-def _view_workout_details(page: ft.Page, workout: dict):
+def _view_workout_details(page: ft.Page, workout: Workout):
     """Muestra los detalles de un entrenamiento"""
     logger.debug(f"View Details called with workout: {workout}")
     details = (
-        f"Título: {workout['titulo']}\n"
-        f"Duración Estimada: {workout['duracion_estimada']} minutos\n"
-        f"Dificultad: {workout['nivel_dificultad'].capitalize()}\n"
-        f"Asignaciones: {workout['asignaciones']}"
+        f"Título: {workout.title}\n"
+        f"Duración Estimada: {workout.estimated_duration} minutos\n"
+        f"Dificultad: {workout.difficulty.capitalize()}\n"
+        f"Asignaciones: {workout.assignment_count}"
     )
     page.dialog = ft.AlertDialog(
         title=ft.Text("Detalles del Entrenamiento"),
@@ -187,24 +209,12 @@ def _view_workout_details(page: ft.Page, workout: dict):
     page.update()
 
 
-
-
-def _assign_workout_to_athletes(athlete_id: int, workout_id: int) -> bool:
-    """Asigna un entrenamiento a un atleta en la base de datos"""
-    try:
-        logger.debug(f"Assigning workout {workout_id} to athlete {athlete_id}")
-        query = """
-        INSERT INTO asignaciones_atletas (id_atleta, id_entrenamiento, fecha_asignacion, estado)
-        VALUES (%s, %s, NOW(), 'pendiente')
-        """
-        DatabaseManager.execute_query(query, (athlete_id, workout_id), commit=True)
-        return True
-    except Exception as e:
-        logger.error(f"Error assigning workout to athlete: {e}")
-        return False
-
-
-def _create_workouts_tab(page: ft.Page, workouts: list, profile: CoachProfile) -> ft.Container:
+def _create_workouts_tab(
+    page: ft.Page,
+    workouts: list,
+    profile: CoachProfile,
+    next_cursor: Optional[str] = None
+) -> ft.Container:
     """Crea la pestaña de entrenamientos creados"""
     logger.debug(f"Workouts data: {workouts}")
     if not workouts:
@@ -222,45 +232,64 @@ def _create_workouts_tab(page: ft.Page, workouts: list, profile: CoachProfile) -
         )
     
     workout_list = ft.ListView(
-        controls=[
-            ft.ListTile(
-                title=ft.Text(w['titulo']),
-                subtitle=ft.Text(
-                    f"Duration: {w['duracion_estimada']} min | "
-                    f"Difficulty: {w['nivel_dificultad']} | "
-                    f"Assignments: {w['asignaciones']}"
-                ),
-                leading=ft.Icon(icons.FITNESS_CENTER),
-                trailing=ft.PopupMenuButton(
-                    icon=icons.MORE_VERT,
-                    items=[
-                        ft.PopupMenuItem(
-                            text="View Details",
-                            on_click=lambda e, w=w: show_workout_details(page, w)
-                        ),
-                        ft.PopupMenuItem(
-                            text="Edit",
-                            on_click=lambda e, w=w: show_edit_workout(page, w)
-                        ),
-                        ft.PopupMenuItem(
-                            text="Assign to Athletes",
-                            on_click=lambda e, w=w: show_assign_workout(page, w, profile)
-                        )
-                    ]
-                ),
-                on_click=lambda e, w=w: _view_workout_details(page, w)
-            )
-            for w in workouts
-        ],
+        controls=[_create_workout_tile(page, w, profile) for w in workouts],
         expand=True
     )
     
     return ft.Container(
-        content=workout_list,
+        content=ft.Column(
+            controls=[
+                workout_list,
+                create_load_more(
+                    page,
+                    workout_list,
+                    lambda cursor: _created_workouts_page(profile, cursor),
+                    lambda w: _create_workout_tile(page, w, profile),
+                    next_cursor
+                )
+            ],
+            expand=True
+        ),
         padding=20,
         expand=True
     )
 
+def _created_workouts_page(profile: CoachProfile, cursor: Optional[str] = None):
+    """Página de entrenamientos creados con los ejercicios de todos ellos (una consulta más)"""
+    workouts, next_cursor = profile.get_created_workouts_page(cursor=cursor)
+    return Workout.attach_exercises(workouts), next_cursor
+
+def _create_workout_tile(page: ft.Page, w: Workout, profile: CoachProfile) -> ft.ListTile:
+    """Crea la fila de un entrenamiento en la lista del entrenador"""
+    return ft.ListTile(
+        title=ft.Text(w.title),
+        subtitle=ft.Text(
+            f"Duration: {w.estimated_duration} min | "
+            f"Difficulty: {w.difficulty} | "
+            f"Exercises: {len(w.exercises)} | "
+            f"Assignments: {w.assignment_count}"
+        ),
+        leading=ft.Icon(icons.FITNESS_CENTER),
+        trailing=ft.PopupMenuButton(
+            icon=icons.MORE_VERT,
+            items=[
+                ft.PopupMenuItem(
+                    text="View Details",
+                    on_click=lambda e, w=w: show_workout_details(page, w)
+                ),
+                ft.PopupMenuItem(
+                    text="Edit",
+                    on_click=lambda e, w=w: show_edit_workout(page, w)
+                ),
+                ft.PopupMenuItem(
+                    text="Assign to Athletes",
+                    on_click=lambda e, w=w: show_assign_workout(page, w, profile)
+                )
+            ]
+        ),
+        on_click=lambda e, w=w: _view_workout_details(page, w)
+    )
+
 def logout(page: ft.Page, db):
     """Cierra la sesión y redirige al login"""
     try:
@@ -297,6 +326,7 @@ def _create_new_workout_tab(page: ft.Page, profile: CoachProfile) -> ft.Containe
     )
     error_text = ft.Text("", color="red")
 
+    @with_page_session
     def create_workout(e):
         """Crea un nuevo entrenamiento"""
         if not titulo_field.value or not duracion_field.value or not dificultad_dropdown.value:
@@ -311,17 +341,16 @@ def _create_new_workout_tab(page: ft.Page, profile: CoachProfile) -> ft.Containe
             return
 
         try:
-            query = """
-            INSERT INTO entrenamientos (id_entrenador, titulo, descripcion, duracion_estimada, nivel_dificultad)
-            VALUES (%s, %s, %s, %s, %s)
-            """
-            DatabaseManager.execute_query(
-                query,
-                (profile.id, titulo_field.value, descripcion_field.value, int(duracion_field.value), dificultad_dropdown.value),
-                commit=True
+            workout = profile.create_workout(
+                titulo_field.value,
+                descripcion_field.value,
+                int(duracion_field.value),
+                dificultad_dropdown.value
             )
+            if not workout:
+                raise Exception("Workout.create returned no workout")
             show_alert(page, "Entrenamiento creado correctamente.", "success")
-            show_coach_dashboard(page, DatabaseManager())
+            show_coach_dashboard(page, get_session_db(page))
         except Exception as ex:
             logger.error(f"Error creating workout: {ex}")
             error_text.value = "Error al crear el entrenamiento."
@@ -351,7 +380,7 @@ def _create_new_workout_tab(page: ft.Page, profile: CoachProfile) -> ft.Containe
                         ft.ElevatedButton(
                             "Cancelar",
                             icon=icons.CANCEL,
-                            on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                            on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                             style=ft.ButtonStyle(
                                 bgcolor="gray",
                                 color="white"
@@ -369,7 +398,7 @@ def _create_new_workout_tab(page: ft.Page, profile: CoachProfile) -> ft.Containe
         expand=True
     )
 
-def show_workout_details(page: ft.Page, workout: dict):
+def show_workout_details(page: ft.Page, workout: Workout):
     """Redirige a una vista con los detalles del entrenamiento"""
     page.clean()
     page.add(
@@ -379,23 +408,25 @@ def show_workout_details(page: ft.Page, workout: dict):
                     create_app_bar("Detalles del Entrenamiento", actions=[
                         ft.IconButton(
                             icon=icons.ARROW_BACK,
-                            on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                            on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                             tooltip="Volver"
                         )
                     ]),
                     ft.Text("Detalles del Entrenamiento", size=24, weight=ft.FontWeight.BOLD, color=COLORS["primary"]),
                     ft.Divider(),
                     ft.Text(f"Título:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(workout['titulo'], size=16),
+                    ft.Text(workout.title, size=16),
                     ft.Text(f"Duración Estimada:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(f"{workout['duracion_estimada']} minutos", size=16),
+                    ft.Text(f"{workout.estimated_duration} minutos", size=16),
                     ft.Text(f"Dificultad:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(workout['nivel_dificultad'].capitalize(), size=16),
+                    ft.Text(workout.difficulty.capitalize(), size=16),
                     ft.Text(f"Asignaciones:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(workout['asignaciones'], size=16),
+                    ft.Text(workout.assignment_count, size=16),
+                    ft.Text("Ejercicios:", size=18, weight=ft.FontWeight.BOLD),
+                    create_exercise_list(workout.exercises),
                     ft.ElevatedButton(
                         "Volver",
-                        on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                        on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                         style=ft.ButtonStyle(bgcolor=COLORS["primary"], color="white")
                     )
                 ],
@@ -404,10 +435,10 @@ def show_workout_details(page: ft.Page, workout: dict):
             padding=20
         )
     )
-def show_edit_workout(page: ft.Page, workout: dict):
+def show_edit_workout(page: ft.Page, workout: Workout):
     """Redirige a una vista para editar un entrenamiento"""
-    titulo_field = ft.TextField(label="Título", value=workout['titulo'], width=400)
-    duracion_field = ft.TextField(label="Duración (min)", value=str(workout['duracion_estimada']), keyboard_type=ft.KeyboardType.NUMBER, width=400)
+    titulo_field = ft.TextField(label="Título", value=workout.title, width=400)
+    duracion_field = ft.TextField(label="Duración (min)", value=str(workout.estimated_duration), keyboard_type=ft.KeyboardType.NUMBER, width=400)
     dificultad_dropdown = ft.Dropdown(
         label="Dificultad",
         options=[
@@ -415,10 +446,11 @@ def show_edit_workout(page: ft.Page, workout: dict):
             ft.DropdownOption("intermedio"),
             ft.DropdownOption("avanzado")
         ],
-        value=workout['nivel_dificultad'],
+        value=workout.difficulty,
         width=400
     )
 
+    @with_page_session
     def save_changes(e):
         """Guarda los cambios realizados al entrenamiento"""
         if not titulo_field.value or not duracion_field.value or not dificultad_dropdown.value:
@@ -426,18 +458,16 @@ def show_edit_workout(page: ft.Page, workout: dict):
             return
 
         try:
-            query = """
-            UPDATE entrenamientos
-            SET titulo = %s, duracion_estimada = %s, nivel_dificultad = %s
-            WHERE id_entrenamiento = %s
-            """
-            DatabaseManager.execute_query(
-                query,
-                (titulo_field.value, int(duracion_field.value), dificultad_dropdown.value, workout['id_entrenamiento']),
-                commit=True
+            updated = workout.update(
+                title=titulo_field.value,
+                estimated_duration=int(duracion_field.value),
+                difficulty=dificultad_dropdown.value,
+                identity_map=get_identity_map(page)
             )
+            if not updated:
+                raise RuntimeError(f"Workout {workout.id} not updated")
             show_alert(page, "Entrenamiento actualizado correctamente.", "success")
-            show_coach_dashboard(page, DatabaseManager())  # Redirige al dashboard
+            show_coach_dashboard(page, get_session_db(page))  # Redirige al dashboard
         except Exception as ex:
             logger.error(f"Error updating workout: {ex}")
             show_alert(page, "Error al actualizar el entrenamiento.", "error")
@@ -450,7 +480,7 @@ def show_edit_workout(page: ft.Page, workout: dict):
                     create_app_bar("Editar Entrenamiento", actions=[
                         ft.IconButton(
                             icon=icons.ARROW_BACK,
-                            on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                            on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                             tooltip="Volver"
                         )
                     ]),
@@ -468,7 +498,7 @@ def show_edit_workout(page: ft.Page, workout: dict):
                             ),
                             ft.ElevatedButton(
                                 "Cancelar",
-                                on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                                on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                                 style=ft.ButtonStyle(bgcolor="gray", color="white")
                             )
                         ],
@@ -481,7 +511,8 @@ def show_edit_workout(page: ft.Page, workout: dict):
         )
     )
 
-def show_assign_workout(page: ft.Page, workout: dict, profile: CoachProfile):
+@with_page_session
+def show_assign_workout(page: ft.Page, workout: Workout, profile: CoachProfile):
     """Redirige a una vista para asignar un entrenamiento a atletas"""
     athletes = profile.get_assigned_athletes()
 
@@ -490,10 +521,11 @@ def show_assign_workout(page: ft.Page, workout: dict, profile: CoachProfile):
         return
 
     athlete_checkboxes = [
-        ft.Checkbox(label=a['nombre_completo'], value=False, data=a['id_atleta'])
+        ft.Checkbox(label=a.full_name, value=False, data=a.id)
         for a in athletes
     ]
 
+    @with_page_session
     def assign_workout(e):
         """Asigna el entrenamiento a los atletas seleccionados"""
         selected_athletes = [cb.data for cb in athlete_checkboxes if cb.value]
@@ -501,14 +533,13 @@ def show_assign_workout(page: ft.Page, workout: dict, profile: CoachProfile):
             show_alert(page, "Selecciona al menos un atleta.", "error")
             return
 
-        for athlete_id in selected_athletes:
-            success = _assign_workout_to_athletes(athlete_id, workout['id_entrenamiento'])
-            if not success:
-                show_alert(page, f"Error al asignar el entrenamiento al atleta ID {athlete_id}.", "error")
-                return
+        # Una transacción para todo el lote: o se asignan todos o ninguno
+        if workout.assign_to_athletes(selected_athletes, identity_map=get_identity_map(page)) is None:
+            show_alert(page, "Error al asignar el entrenamiento a los atletas seleccionados.", "error")
+            return
 
         show_alert(page, "Entrenamiento asignado correctamente a los atletas seleccionados.", "success")
-        show_coach_dashboard(page, DatabaseManager())  # Redirige al dashboard
+        show_coach_dashboard(page, get_session_db(page))  # Redirige al dashboard
 
     page.clean()
     page.add(
@@ -518,7 +549,7 @@ def show_assign_workout(page: ft.Page, workout: dict, profile: CoachProfile):
                     create_app_bar("Asignar Entrenamiento", actions=[
                         ft.IconButton(
                             icon=icons.ARROW_BACK,
-                            on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                            on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                             tooltip="Volver"
                         )
                     ]),
@@ -534,7 +565,7 @@ def show_assign_workout(page: ft.Page, workout: dict, profile: CoachProfile):
                             ),
                             ft.ElevatedButton(
                                 "Cancelar",
-                                on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                                on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                                 style=ft.ButtonStyle(bgcolor="gray", color="white")
                             )
                         ],
@@ -547,7 +578,7 @@ def show_assign_workout(page: ft.Page, workout: dict, profile: CoachProfile):
         )
     )
 
-def show_athlete_profile(page: ft.Page, athlete: dict):
+def show_athlete_profile(page: ft.Page, athlete: AthleteProfile):
     """Redirige a una vista con los detalles del perfil del atleta"""
     page.clean()
     page.add(
@@ -557,25 +588,25 @@ def show_athlete_profile(page: ft.Page, athlete: dict):
                     create_app_bar("Perfil del Atleta", actions=[
                         ft.IconButton(
                             icon=icons.ARROW_BACK,
-                            on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                            on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                             tooltip="Volver"
                         )
                     ]),
                     ft.Text("Perfil del Atleta", size=24, weight=ft.FontWeight.BOLD, color=COLORS["primary"]),
                     ft.Divider(),
                     ft.Text(f"Nombre:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(athlete['nombre_completo'], size=16),
+                    ft.Text(athlete.full_name, size=16),
                     ft.Text(f"Deporte:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(athlete['deporte'], size=16),
+                    ft.Text(athlete.sport, size=16),
                     ft.Text(f"Edad:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(f"{calculate_age(athlete['fecha_nacimiento'])} años", size=16),
+                    ft.Text(f"{calculate_age(athlete.birth_date)} años", size=16),
                     ft.Text(f"Frecuencia Cardiaca Máxima:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(f"{athlete['frecuencia_cardiaca_maxima']} bpm", size=16),
+                    ft.Text(f"{athlete.max_hr} bpm", size=16),
                     ft.Text(f"Frecuencia Cardiaca Mínima:", size=18, weight=ft.FontWeight.BOLD),
-                    ft.Text(f"{athlete['frecuencia_cardiaca_minima']} bpm", size=16),
+                    ft.Text(f"{athlete.resting_hr} bpm", size=16),
                     ft.ElevatedButton(
                         "Volver",
-                        on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                        on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                         style=ft.ButtonStyle(bgcolor=COLORS["primary"], color="white")
                     )
                 ],
@@ -584,7 +615,8 @@ def show_athlete_profile(page: ft.Page, athlete: dict):
             padding=20
         )
     )
-def show_assign_workout_to_athlete(page: ft.Page, athlete: dict, profile: CoachProfile):
+@with_page_session
+def show_assign_workout_to_athlete(page: ft.Page, athlete: AthleteProfile, profile: CoachProfile):
     """Redirige a una vista para asignar un entrenamiento a un atleta específico"""
     workouts = profile.get_created_workouts()
 
@@ -595,11 +627,12 @@ def show_assign_workout_to_athlete(page: ft.Page, athlete: dict, profile: CoachP
     workout_dropdown = ft.Dropdown(
         label="Selecciona un entrenamiento",
         options=[
-            ft.DropdownOption(text=w['titulo'], key=w['id_entrenamiento']) for w in workouts
+            ft.DropdownOption(text=w.title, key=w.id) for w in workouts
         ],
         width=400
     )
 
+    @with_page_session
     def assign_workout(e):
         """Asigna el entrenamiento seleccionado al atleta"""
         selected_workout = workout_dropdown.value
@@ -607,10 +640,11 @@ def show_assign_workout_to_athlete(page: ft.Page, athlete: dict, profile: CoachP
             show_alert(page, "Por favor selecciona un entrenamiento.", "error")
             return
 
-        success = _assign_workout_to_athletes(athlete['id_atleta'], selected_workout)
+        workout = next(w for w in workouts if str(w.id) == str(selected_workout))
+        success = workout.assign_to_athlete(athlete.id, get_identity_map(page))
         if success:
             show_alert(page, "Entrenamiento asignado correctamente.", "success")
-            show_coach_dashboard(page, DatabaseManager())  # Redirige al dashboard
+            show_coach_dashboard(page, get_session_db(page))  # Redirige al dashboard
         else:
             show_alert(page, "Error al asignar el entrenamiento.", "error")
 
@@ -622,13 +656,13 @@ def show_assign_workout_to_athlete(page: ft.Page, athlete: dict, profile: CoachP
                     create_app_bar("Asignar Entrenamiento", actions=[
                         ft.IconButton(
                             icon=icons.ARROW_BACK,
-                            on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                            on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                             tooltip="Volver"
                         )
                     ]),
                     ft.Text("Asignar Entrenamiento", size=24, weight=ft.FontWeight.BOLD, color=COLORS["primary"]),
                     ft.Divider(),
-                    ft.Text(f"Atleta: {athlete['nombre_completo']}", size=18, weight=ft.FontWeight.BOLD),
+                    ft.Text(f"Atleta: {athlete.full_name}", size=18, weight=ft.FontWeight.BOLD),
                     workout_dropdown,
                     ft.Row(
                         controls=[
@@ -639,7 +673,7 @@ def show_assign_workout_to_athlete(page: ft.Page, athlete: dict, profile: CoachP
                             ),
                             ft.ElevatedButton(
                                 "Cancelar",
-                                on_click=lambda e: show_coach_dashboard(page, DatabaseManager()),
+                                on_click=lambda e: show_coach_dashboard(page, get_session_db(page)),
                                 style=ft.ButtonStyle(bgcolor="gray", color="white")
                             )
                         ],
@@ -1,13 +1,14 @@
 import flet as ft
 from flet import icons
-from typing import Optional, Callable, Union, List, Dict, Any
+from typing import Optional, Callable, Union, List, Dict, Any, Tuple
+import functools
 import logging
 import requests
 import re
 import threading
 import time
 from datetime import datetime
-from models import User, AthleteProfile, CoachProfile
+from models import User, AthleteProfile, CoachProfile, IdentityMap
 from database import DatabaseManager
 from utils import calculate_hr_zones, create_hr_zones_chart
 
@@ -27,6 +28,39 @@ COLORS = {
     "info": "#1976D2"
 }
 
+def get_identity_map(page: ft.Page) -> IdentityMap:
+    """Identity map de la sesión: los modelos cargados se reutilizan entre pantallas"""
+    identity_map = page.session.get("identity_map")
+    if identity_map is None:
+        identity_map = IdentityMap()
+        page.session.set("identity_map", identity_map)
+    return identity_map
+
+def get_session_db(page: ft.Page) -> DatabaseManager:
+    """DatabaseManager compartido por las pantallas de la sesión"""
+    db = page.session.get("db")
+    if db is None:
+        db = DatabaseManager()
+        page.session.set("db", db)
+    return db
+
+def with_page_session(func: Callable) -> Callable:
+    """
+    Ejecuta una vista o un manejador de Flet en la sesión de su página
+
+    El primer argumento es la página o el evento (se usa e.page). Flet
+    ejecuta los manejadores síncronos en un pool de hilos compartido entre
+    sesiones: la ventana read-your-writes se liga a page.session_id con
+    session_scope y se restaura al salir, así que el siguiente manejador
+    que caiga en el mismo hilo no hereda la sesión.
+    """
+    @functools.wraps(func)
+    def wrapper(target, *args, **kwargs):
+        page = target if isinstance(target, ft.Page) else target.page
+        with DatabaseManager.session_scope(page.session_id):
+            return func(target, *args, **kwargs)
+    return wrapper
+
 def create_app_bar(
     title: str, 
     actions: Optional[List[ft.Control]] = None,
@@ -205,6 +239,61 @@ def hide_loading(page: ft.Page, loading_control: ft.Container) -> None:
     page.overlay.remove(loading_control)
     page.update()
 
+def create_load_more(
+    page: ft.Page,
+    target: ft.Control,
+    fetch_page: Callable[[str], Tuple[List[Any], Optional[str]]],
+    build_control: Callable[[Any], ft.Control],
+    cursor: Optional[str]
+) -> ft.Container:
+    """
+    Crea un botón 'Load more' que añade la siguiente página a target.controls
+
+    Args:
+        target: Control con lista de controles (Column, ListView...)
+        fetch_page: Recibe el token y devuelve (filas, token siguiente)
+        build_control: Construye el control de una fila
+        cursor: Token de la primera página siguiente (None oculta el botón)
+    """
+    state = {"cursor": cursor}
+    container = ft.Container(alignment=ft.alignment.center, visible=cursor is not None)
+
+    @with_page_session
+    def load_more(e):
+        try:
+            rows, state["cursor"] = fetch_page(state["cursor"])
+            target.controls.extend(build_control(row) for row in rows)
+            container.visible = state["cursor"] is not None
+        except Exception as ex:
+            logger.error(f"Error loading next page: {ex}")
+            show_alert(page, "Error loading more results", "error")
+        page.update()
+
+    container.content = ft.TextButton(
+        "Load more",
+        icon=icons.EXPAND_MORE,
+        on_click=load_more,
+        style=ft.ButtonStyle(color=COLORS["primary"])
+    )
+    return container
+
+def create_exercise_list(exercises: List[Dict[str, Any]]) -> ft.Column:
+    """Lista los ejercicios de un entrenamiento (filas de Workout.exercises)"""
+    if not exercises:
+        return ft.Column([ft.Text("Sin ejercicios asignados.", italic=True, size=14)])
+    return ft.Column(
+        controls=[
+            ft.Text(
+                f"{ex['orden']}. {ex['nombre_ejercicio']}"
+                + (f" | {ex['series']}x{ex['repeticiones']}" if ex['series'] and ex['repeticiones'] else "")
+                + (f" | {ex['duracion']} min" if ex['duracion'] else ""),
+                size=16
+            )
+            for ex in exercises
+        ],
+        spacing=5
+    )
+
 def fetch_wger_exercises(limit: int = 5) -> Dict[str, Any]:
     """Obtiene ejercicios de la API de Wger"""
     try:
@@ -270,6 +359,7 @@ def show_register(page: ft.Page, db: DatabaseManager):
         
         page.update()
 
+    @with_page_session
     def on_register(e):
         """Maneja el evento de registro"""
         # Validaciones básicasa
@@ -307,35 +397,12 @@ def show_register(page: ft.Page, db: DatabaseManager):
                 return
         
         loading = show_loading(page, "Creating account...")
-        conn = None
         
         try:
-            conn = db.get_connection()  # Obtener conexión de la base de datos
-            db.start_transaction(conn)  # Iniciar transacción
-
-            # Registrar usuario principal
-            hashed_pw = DatabaseManager.hash_password(password)
-            user_query = """
-            INSERT INTO usuarios (email, contrasena_hash, tipo, activo) 
-            VALUES (%s, %s, %s, 1)
-            """
-            db.execute_query(user_query, (email, hashed_pw, user_type), conn=conn)
-
-            # Obtener ID del usuario recién creado
-            result = db.execute_query("SELECT LAST_INSERT_ID() AS id", fetch_one=True, conn=conn)
-            if not result:
-                raise Exception("No se pudo obtener el ID del nuevo usuario")
-            user_id = result["id"]
-            
-            # Registrar perfil específico
+            # Datos del perfil específico
+            profile_data = {}
             if user_type == "atleta":
-                full_name = additional_fields.controls[0].value
                 birth_date = additional_fields.controls[1].value
-                height = float(additional_fields.controls[2].value)
-                weight = float(additional_fields.controls[3].value)
-                sport = additional_fields.controls[4].value
-                resting_hr = int(additional_fields.controls[5].value)
-                coach_id = additional_fields.controls[6].value or None
                 
                 # Calcular frecuencia cardiaca máxima
                 from datetime import datetime
@@ -344,39 +411,28 @@ def show_register(page: ft.Page, db: DatabaseManager):
                 age = today.year - birth_date_obj.year - (
                     (today.month, today.day) < (birth_date_obj.month, birth_date_obj.day)
                 )
-                max_hr = 220 - age
                 
-                athlete_query = """
-                INSERT INTO perfiles_atletas 
-                (id_usuario, nombre_completo, fecha_nacimiento, altura, peso, deporte, 
-                frecuencia_cardiaca_maxima, frecuencia_cardiaca_minima, id_entrenador) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                db.execute_query(
-                    athlete_query,
-                    (user_id, full_name, birth_date, height, weight, sport, max_hr, resting_hr, coach_id),
-                    conn=conn
-                )
+                profile_data = {
+                    "full_name": additional_fields.controls[0].value,
+                    "birth_date": birth_date,
+                    "height": float(additional_fields.controls[2].value),
+                    "weight": float(additional_fields.controls[3].value),
+                    "sport": additional_fields.controls[4].value,
+                    "resting_hr": int(additional_fields.controls[5].value),
+                    "max_hr": 220 - age,
+                    "coach_id": additional_fields.controls[6].value or None
+                }
 
             elif user_type == "entrenador":
-                full_name = additional_fields.controls[0].value
-                birth_date = additional_fields.controls[1].value
-                specialty = additional_fields.controls[2].value
-                experience = additional_fields.controls[3].value
-                
-                coach_query = """
-                INSERT INTO perfiles_entrenadores 
-                (id_usuario, nombre_completo, fecha_nacimiento, especialidad, experiencia) 
-                VALUES (%s, %s, %s, %s, %s)
-                """
-                db.execute_query(
-                    coach_query,
-                    (user_id, full_name, birth_date, specialty, experience),
-                    conn=conn
-                )
+                profile_data = {
+                    "full_name": additional_fields.controls[0].value,
+                    "birth_date": additional_fields.controls[1].value,
+                    "specialty": additional_fields.controls[2].value,
+                    "experience": additional_fields.controls[3].value
+                }
             
-            # Confirmar transacción si todo salió bien
-            db.commit_transaction(conn)
+            # Usuario y perfil en una sola transacción
+            User.register(email, password, user_type, profile_data)
             success_text.value = "Registration successful! You can now login."
             error_text.value = ""
             page.update()
@@ -395,14 +451,10 @@ def show_register(page: ft.Page, db: DatabaseManager):
             
         except Exception as e:
             logger.error(f"Error during registration: {e}", exc_info=True)
-            if conn:
-                db.rollback_transaction(conn)
             error_text.value = f"An error occurred: {str(e)}"
             page.update()
         finally:
             hide_loading(page, loading)
-            if conn:
-                db.close_connection(conn)
 
         # Configurar el event handler para el dropdown
     user_type_dropdown.on_change = update_additional_fields
@@ -486,6 +538,7 @@ def show_login(page: ft.Page, db: DatabaseManager):
     password_field = create_text_field("Password", password=True)
     error_text = ft.Text("", color=COLORS["error"])
     
+    @with_page_session
     def on_login(e):
         """Maneja el evento de login"""
         email = email_field.value.strip()
@@ -499,12 +552,16 @@ def show_login(page: ft.Page, db: DatabaseManager):
         loading = show_loading(page, "Signing in...")
         
         try:
-            user = User.authenticate(email, password)
+            # Identity map nuevo por inicio de sesión: el login deja en él
+            # el usuario y su perfil para el dashboard
+            identity_map = IdentityMap()
+            result = User.login(email, password, identity_map)
             
-            if user:
-                user.update_last_login()
+            if result:
+                user, _ = result
                 page.session.set("user_id", user.id)
                 page.session.set("user_type", user.type)
+                page.session.set("identity_map", identity_map)
                 
                 # Redirigir según el tipo de usuario
                 if user.type == "administrador":
@@ -889,7 +946,7 @@ def logout(page: ft.Page):
         page.appbar = None
 
         from views.shared import show_login
-        show_login(page, DatabaseManager())
+        show_login(page, get_session_db(page))
 
         page.update()
     except Exception as e: